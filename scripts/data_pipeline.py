@@ -14,28 +14,48 @@ is provided.
 from __future__ import annotations
 
 import argparse
+import codecs
 import hashlib
+import html.parser
 import json
 import logging
+import mmap
 import os
+import queue
+import random
 import re
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
 import time
-from dataclasses import dataclass
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from functools import partial
 from io import BytesIO
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Hashable, Iterable, Iterator, Optional, TypeVar, Union
 from urllib.parse import parse_qsl, quote_plus, urlencode, urljoin, urlparse, urlunparse
 
 import requests
 from bs4 import BeautifulSoup
 
 BRITANNICA_BASE = "https://www.britannica.com"
+# Preferred BeautifulSoup tree builders, fastest first.
+HTML_PARSER_BACKENDS = ("lxml", "html.parser")
 USER_AGENT = "PexEduDataCollector/1.0 (+https://example.com)"
 TEXT_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
 
 SIZE_KEYWORDS = ("size", "length", "height", "weight", "wingspan", "mass")
 LIFE_KEYWORDS = ("life span", "lifespan", "life expectancy", "longevity", "years old")
 HABITAT_KEYWORDS = ("habitat", "native", "found", "range", "distributed", "lives in")
+FUN_FACT_KEYWORDS = ("only", "largest", "smallest", "fastest", "unique", "unlike", "known for", "able to")
 
 TIMEOUT = 20
 EXCLUDED_PHRASES = (
@@ -49,11 +69,115 @@ EXCLUDED_PHRASES = (
     'britannica quiz'
 )
 
-RETRY_DELAY = 3
+RETRY_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_AFTER_LIMIT = 120.0
 MAX_RETRIES = 3
+# Anything else >= 400 (404, 410, 403, ...) is treated as permanent and fails fast.
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+DEAD_STATUSES = frozenset({404, 410})
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 60.0
+
+# Token-bucket budget applied independently to every host (www, cdn, ...).
+DEFAULT_HOST_RATE = 2.0
+DEFAULT_HOST_BURST = 2
+
+DEFAULT_CACHE_DIR = Path(".cache/britannica")
+# Cached responses younger than this are served without touching the network;
+# older ones are revalidated with a conditional GET.
+HTTP_CACHE_FRESH_FOR = 24 * 3600
+# Entries not used for this long are evicted, as are the least recently used
+# entries once the cache grows past HTTP_CACHE_MAX_BYTES.
+HTTP_CACHE_TTL = 30 * 24 * 3600
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+HTTP_CACHE_STORED_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "date", "x-pexedu-truncated")
+COMPRESSIBLE_CONTENT_TYPES = ("text/", "json", "xml", "javascript", "svg")
+HTTP_CACHE_MAX_ENTRY_BYTES = 16 * 1024 * 1024
+
+MIN_IMAGE_WIDTH = 320
+MIN_IMAGE_HEIGHT = 240
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+# Give up on early dimension sniffing when the header has not shown up by
+# then (e.g. JPEGs with very large EXIF blocks); the validator still decodes.
+IMAGE_SNIFF_LIMIT = 256 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+# Longest side of the image the validator's pixel checks run on: the overlay
+# check always thumbnails to it, and low-memory validation decodes straight
+# to it (JPEG draft mode) and shares that copy with every check.
+VALIDATION_WORKING_SIZE = 512
+# dHash over a (DHASH_SIZE + 1) x DHASH_SIZE thumbnail gives a 64-bit hash;
+# accepted images within PERCEPTUAL_DUPLICATE_DISTANCE bits of each other are
+# treated as re-encoded or resized copies of the same photo.
+DHASH_SIZE = 8
+PERCEPTUAL_DUPLICATE_DISTANCE = 6
+
+# CLIP verdict: the best "living animal" prompt must reach CLIP_POSITIVE_THRESHOLD
+# and beat the best negative prompt by CLIP_MARGIN. Below CLIP_OVERRIDE_FLOOR a
+# rejection cannot be overridden by the vision model.
+CLIP_POSITIVE_THRESHOLD = 0.35
+CLIP_MARGIN = 0.1
+CLIP_OVERRIDE_FLOOR = 0.05
+CLIP_MAX_BATCH_SIZE = 8
+CLIP_MODEL_NAME = "openai/clip-vit-base-patch32"
+CLIP_PROMPTS = (
+    "a photo of a living animal in the wild",
+    "a photo of a living animal in its natural habitat",
+    "a drawing or illustration of an animal",
+    "an image of an animal statue or toy",
+    "an image with text over a picture of an animal",
+)
+CLIP_POSITIVE_INDICES = frozenset({0, 1})
+VISION_MODEL_NAME = "torchvision/resnet50/IMAGENET1K_V2"
+# ResNet50 IMAGENET1K_V2 preprocessing (see ImageTensors).
+VISION_RESIZE = 232
+VISION_CROP = 224
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+# CLIPImageProcessor settings for openai/clip-vit-base-patch32.
+CLIP_IMAGE_SIZE = 224
+CLIP_MEAN = (0.48145466, 0.4578275, 0.40821073)
+CLIP_STD = (0.26862954, 0.26130258, 0.27577711)
+INFERENCE_BACKENDS = ("torch", "onnx")
+DEFAULT_ONNX_DIR = Path(".cache/models/onnx")
+DEFAULT_BLOB_DIR = Path(".cache/assets")
+ONNX_OPSET = 17
+# Largest accepted difference between a backend's CLIP prompt probabilities and
+# the torch fp32 reference (checked by --benchmark-inference).
+INFERENCE_TOLERANCE = 0.02
+# Bump whenever ImageValidator's decision logic changes; cached verdicts are
+# keyed by it (see validator_fingerprint).
+VALIDATOR_VERSION = 2
+# Cached verdicts not read or written for this long are pruned when the cache opens.
+VERDICT_MAX_AGE = 90 * 24 * 3600
+# How long the batcher waits for concurrent workers to join a CLIP batch.
+CLIP_BATCH_WINDOW = 0.02
+# Candidate probing: bytes requested per ranged GET and how many of the
+# best-scored candidates are probed before falling back to blind order.
+IMAGE_PROBE_BYTES = 32 * 1024
+IMAGE_PROBE_CANDIDATES = 12
+# Probing stops early once this many distinct variants are known to be at
+# least twice the minimum size in both dimensions.
+IMAGE_PROBE_ENOUGH = 3
+# Resolution beyond this does not improve a card image, it only costs bytes.
+IMAGE_RANK_MAX_WIDTH = 2400
+IMAGE_RANK_MAX_HEIGHT = 1800
+IMAGE_FORMAT_BONUS = {"jpeg": 200, "webp": 100, "png": 0, "gif": -1000}
+
+# Set on cached article responses whose body stops where the article does.
+TRUNCATED_HEADER = "X-PexEdu-Truncated"
+# Its value names the stopping rule; prefixes cut by an older rule are refetched.
+TRUNCATED_RULE = "article-close"
 
 logger = logging.getLogger(__name__)
 
+# Read once at import, while no other thread can be creating files.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+T = TypeVar("T")
+
 RESIZE_QUERY_KEYS = {
     "width",
     "w",
@@ -306,6 +430,68 @@ POSITIVE_ALT_KEYWORDS = (
 ) + ANIMAL_LABEL_KEYWORDS
 
 
+PLACEHOLDER_URL_TOKENS = ('thistle', 'social-image', 'placeholder', 'default', 'thumbnail')
+
+
+# Matches a whole keyword table in one regex search. The pattern is built from
+# a trie of the keywords (e.g. "b(?:ear|ird|oa(?:r)?)") so the engine follows
+# at most one branch per character instead of trying every keyword in turn.
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+        pattern = self._trie_pattern(self.keywords)
+        self._search = re.compile(pattern).search
+        self._finditer = re.compile(f"(?=({pattern}))").finditer
+        # A keyword that is a prefix of a longer one at the same position is
+        # shadowed by the longest match, so matches also report their substrings.
+        self._implied = {
+            keyword: tuple(other for other in self.keywords if other != keyword and other in keyword)
+            for keyword in self.keywords
+        }
+
+    @staticmethod
+    def _trie_pattern(keywords: Iterable[str]) -> str:
+        trie: dict[str, dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def build(node: dict[str, dict]) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = "|".join(branches)
+            if "" in node:
+                return f"(?:{body})?"
+            return body if len(branches) == 1 else f"(?:{body})"
+
+        return build(trie) or "(?!)"
+
+    def search(self, text: str) -> bool:
+        return bool(text) and self._search(text) is not None
+
+    def find_all(self, text: str) -> list[str]:
+        found: dict[str, None] = {}
+        if not text:
+            return []
+        for match in self._finditer(text):
+            keyword = match.group(1)
+            found[keyword] = None
+            for implied in self._implied[keyword]:
+                found[implied] = None
+        return list(found)
+
+
+NEGATIVE_ALT_MATCHER = KeywordMatcher(NEGATIVE_ALT_KEYWORDS)
+NEGATIVE_URL_MATCHER = KeywordMatcher(NEGATIVE_URL_KEYWORDS)
+ANIMAL_LABEL_MATCHER = KeywordMatcher(ANIMAL_LABEL_KEYWORDS)
+POSITIVE_ALT_MATCHER = KeywordMatcher(POSITIVE_ALT_KEYWORDS)
+PLACEHOLDER_URL_MATCHER = KeywordMatcher(PLACEHOLDER_URL_TOKENS)
+EXCLUDED_PHRASE_MATCHER = KeywordMatcher(EXCLUDED_PHRASES)
+
+
 @dataclass
 class ImageCandidate:
     urls: list[str]
@@ -313,17 +499,18 @@ class ImageCandidate:
     width: Optional[int]
     height: Optional[int]
     score: int
+    alt_score: int = 0
 
 def is_placeholder_image(url: str) -> bool:
     lowered = url.lower()
-    return any(token in lowered for token in ('thistle', 'social-image', 'placeholder', 'default', 'thumbnail'))
+    return PLACEHOLDER_URL_MATCHER.search(lowered)
 
 def sentence_is_informative(sentence: str) -> bool:
     cleaned = sentence.strip()
     if len(cleaned) < 40:
         return False
     lower = cleaned.lower()
-    if any(phrase in lower for phrase in EXCLUDED_PHRASES):
+    if EXCLUDED_PHRASE_MATCHER.search(lower):
         return False
     if cleaned.endswith(':'):
         return False
@@ -347,6 +534,79 @@ def _parse_dimension(value: object) -> Optional[int]:
         return None
 
 
+@dataclass
+class ImageHeader:
+    format: str
+    width: Optional[int]
+    height: Optional[int]
+
+    def is_undersized(self) -> bool:
+        if self.width is None or self.height is None:
+            return False
+        return self.width < MIN_IMAGE_WIDTH or self.height < MIN_IMAGE_HEIGHT
+
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _sniff_jpeg(data: bytes) -> ImageHeader:
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            offset += 1
+            continue
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            offset += 2
+            continue
+        (length,) = struct.unpack(">H", data[offset + 2:offset + 4])
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                break
+            height, width = struct.unpack(">HH", data[offset + 5:offset + 9])
+            return ImageHeader("jpeg", width, height)
+        offset += 2 + length
+    return ImageHeader("jpeg", None, None)
+
+
+def _sniff_webp(data: bytes) -> ImageHeader:
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30:
+        width, height = struct.unpack("<HH", data[26:30])
+        return ImageHeader("webp", width & 0x3FFF, height & 0x3FFF)
+    if chunk == b"VP8L" and len(data) >= 25:
+        bits = int.from_bytes(data[21:25], "little")
+        return ImageHeader("webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+    if chunk == b"VP8X" and len(data) >= 30:
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return ImageHeader("webp", width, height)
+    return ImageHeader("webp", None, None)
+
+
+def sniff_image_header(data: bytes) -> Optional[ImageHeader]:
+    # Returns None when the bytes do not start like any supported image format;
+    # width/height stay None while the dimensions are not in the buffer yet.
+    if data.startswith(b"\xff\xd8"):
+        return _sniff_jpeg(data)
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        if len(data) >= 24:
+            width, height = struct.unpack(">II", data[16:24])
+            return ImageHeader("png", width, height)
+        return ImageHeader("png", None, None)
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        if len(data) >= 10:
+            width, height = struct.unpack("<HH", data[6:10])
+            return ImageHeader("gif", width, height)
+        return ImageHeader("gif", None, None)
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return _sniff_webp(data)
+    return None
+
+
 def sanitize_image_variants(url: str) -> list[str]:
     parsed = urlparse(url)
     if not parsed.scheme:
@@ -368,6 +628,188 @@ def sanitize_image_variants(url: str) -> list[str]:
     return variants
 
 
+ARTICLE_BODY_CLASS = "m-article__body-content"
+ARTICLE_CHUNK_SIZE = 16 * 1024
+
+
+# Incremental scanner for streamed article HTML. It only tracks <section> and
+# <article> tags, which is enough to tell when the article holding the body
+# sections (the last part of the page the pipeline reads) has closed and the
+# rest can be skipped.
+class ArticleStreamScanner:
+    _TAG = re.compile(r"<(/?)(section|article)(?=[\s/>])([^>]*)>", re.IGNORECASE)
+    _CLASS = re.compile(r"""(?:^|\s)class\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+
+    def __init__(self) -> None:
+        self.done = False
+        self._pending = ""
+        self._article_depth = 0
+        self._loose_body = False
+
+    def feed(self, text: str) -> bool:
+        if self.done:
+            return True
+        buffer = self._pending + text
+        consumed = 0
+        for match in self._TAG.finditer(buffer):
+            consumed = match.end()
+            if self._handle(match.group(1) == "/", match.group(2).lower(), match.group(3)):
+                self.done = True
+                return True
+        # Keep an unterminated tag for the next chunk.
+        tail_start = buffer.rfind("<", consumed)
+        self._pending = buffer[tail_start:] if tail_start != -1 and ">" not in buffer[tail_start:] else ""
+        return False
+
+    def _handle(self, closing: bool, name: str, attributes: str) -> bool:
+        if name == "article":
+            self._article_depth = max(0, self._article_depth + (-1 if closing else 1))
+            # extract_sentences reads every body section, so the page is only
+            # complete once the article holding them has closed.
+            return closing and self._article_depth == 0 and not self._loose_body
+        if not closing and not self._article_depth and self._has_body_class(attributes):
+            # A body section outside any article has no closing container to
+            # wait for; read the whole page.
+            self._loose_body = True
+        return False
+
+    def _has_body_class(self, attributes: str) -> bool:
+        match = self._CLASS.search(attributes)
+        return match is not None and ARTICLE_BODY_CLASS in "".join(filter(None, match.groups())).split()
+
+
+def read_article_markup(response: requests.Response, *, early_stop: bool = True) -> tuple[str, bool]:
+    content_type = response.headers.get("content-type", "")
+    encoding = response.encoding if "charset" in content_type.lower() and response.encoding else "utf-8"
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    scanner = ArticleStreamScanner()
+    parts: list[str] = []
+    for chunk in response.iter_content(ARTICLE_CHUNK_SIZE):
+        if not chunk:
+            continue
+        text = decoder.decode(chunk)
+        parts.append(text)
+        if early_stop and scanner.feed(text):
+            return "".join(parts), True
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), False
+
+
+@dataclass
+class ArticleMetadata:
+    images: list[str]
+    image_alt: str = ""
+    title: str = ""
+    description: str = ""
+
+    def image_candidates(self, base_url: str) -> list[ImageCandidate]:
+        candidates: list[ImageCandidate] = []
+        seen: set[str] = set()
+        for raw_url in self.images:
+            absolute = urljoin(base_url, raw_url)
+            lowered = absolute.lower()
+            if is_placeholder_image(absolute) or NEGATIVE_URL_MATCHER.search(lowered):
+                continue
+            urls = [variant for variant in sanitize_image_variants(absolute) if variant not in seen]
+            if not urls:
+                continue
+            seen.update(urls)
+            candidates.append(ImageCandidate(urls=urls, alt_text=self.image_alt, width=None, height=None, score=0))
+        return candidates
+
+
+# Reads Open Graph / Twitter card tags and JSON-LD blocks from the document
+# head only; the head is a few KB, so this never touches the article tree.
+class HeadMetadataParser(html.parser.HTMLParser):
+    IMAGE_PROPERTIES = ("og:image", "og:image:secure_url", "og:image:url", "twitter:image", "twitter:image:src")
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.properties: dict[str, str] = {}
+        self.json_ld: list[object] = []
+        self._in_json_ld = False
+        self._json_buffer: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        attributes = {name.lower(): value or "" for name, value in attrs}
+        if tag == "meta":
+            name = (attributes.get("property") or attributes.get("name") or "").lower()
+            content = attributes.get("content", "").strip()
+            if name and content and name not in self.properties:
+                self.properties[name] = content
+        elif tag == "script" and attributes.get("type", "").lower() == "application/ld+json":
+            self._in_json_ld = True
+            self._json_buffer = []
+
+    def handle_data(self, data: str) -> None:
+        if self._in_json_ld:
+            self._json_buffer.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script" and self._in_json_ld:
+            self._in_json_ld = False
+            try:
+                self.json_ld.append(json.loads("".join(self._json_buffer)))
+            except ValueError:
+                pass
+
+
+def _json_ld_nodes(value: object) -> Iterable[dict]:
+    if isinstance(value, list):
+        for item in value:
+            yield from _json_ld_nodes(item)
+    elif isinstance(value, dict):
+        yield value
+        if "@graph" in value:
+            yield from _json_ld_nodes(value["@graph"])
+
+
+def _json_ld_image_urls(value: object) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        url = value.get("url") or value.get("contentUrl")
+        return [url] if isinstance(url, str) else []
+    if isinstance(value, list):
+        return [url for item in value for url in _json_ld_image_urls(item)]
+    return []
+
+
+def extract_head_metadata(markup: str) -> ArticleMetadata:
+    head_end = markup.lower().find("</head>")
+    parser = HeadMetadataParser()
+    parser.feed(markup[: head_end + 7] if head_end != -1 else markup[:64 * 1024])
+    properties = parser.properties
+
+    images = [properties[name] for name in HeadMetadataParser.IMAGE_PROPERTIES if name in properties]
+    description = properties.get("og:description") or properties.get("description") or ""
+    for node in _json_ld_nodes(parser.json_ld):
+        images.extend(_json_ld_image_urls(node.get("image")))
+        if not description and isinstance(node.get("description"), str):
+            description = node["description"].strip()
+    return ArticleMetadata(
+        images=list(dict.fromkeys(images)),
+        image_alt=properties.get("og:image:alt") or properties.get("twitter:image:alt") or "",
+        title=properties.get("og:title", ""),
+        description=description,
+    )
+
+
+@dataclass
+class ArticlePage:
+    url: str
+    soup: BeautifulSoup
+    metadata: ArticleMetadata
+
+
+# Containers ranked after <figure> when choosing which images to try first.
+IMAGE_CONTAINER_CLASSES = ("md-assembly", "assemblies")
+# A wide (>= 640 px) image whose alt text mentions animal context; once this
+# many are found the remaining, lower-priority images are not examined.
+STRONG_CANDIDATE_SCORE = 640 * 4 + 2500
+ENOUGH_STRONG_CANDIDATES = 8
+
+
 _SRCSET_DESCRIPTOR = re.compile(r"(?P<value>\d+)(?P<unit>[wx])")
 
 
@@ -389,17 +831,85 @@ def _parse_srcset(attr: str) -> list[tuple[str, Optional[int]]]:
     return entries
 
 
-def collect_image_candidates(soup: BeautifulSoup, base_url: str) -> list[ImageCandidate]:
+def resolve_html_parser(preferred: Optional[str] = None) -> str:
+    # BeautifulSoup tree builders all expose the same select() API, so the
+    # extraction code is backend-agnostic; lxml (C) is several times faster
+    # than the pure-Python html.parser and is used whenever it is installed.
+    if preferred in (None, "", "auto"):
+        candidates = HTML_PARSER_BACKENDS
+    else:
+        candidates = (preferred,)
+    for name in candidates:
+        if name == "html.parser":
+            return name
+        try:
+            __import__(name)
+        except ImportError:
+            continue
+        return name
+    logger.warning("HTML parser %s unavailable; falling back to html.parser", preferred)
+    return "html.parser"
+
+
+def make_soup(markup: str, parser: Optional[str] = None) -> BeautifulSoup:
+    return BeautifulSoup(markup, parser or resolve_html_parser())
+
+
+def score_search_results(soup: BeautifulSoup, term: str) -> list[tuple[int, str]]:
+    candidates = []
+    term_lower = term.lower()
+    # Primary search result list.
+    for anchor in soup.select("li.m-search-results__item a[href]"):
+        href = anchor.get("href")
+        if not href:
+            continue
+        text = anchor.get_text(" ", strip=True).lower()
+        href_lower = href.lower()
+        score = 0
+        if term_lower in text:
+            score += 3
+        if term_lower.replace(" ", "-") in href_lower:
+            score += 2
+        if "/animal/" in href_lower:
+            score += 1
+        candidates.append((score, href))
+
+    # Fallback to any anchor that mentions "/science/" topics.
+    if not candidates:
+        for anchor in soup.select("a[href]"):
+            href = anchor.get("href") or ""
+            if not href.startswith("/"):
+                continue
+            href_lower = href.lower()
+            if any(part in href_lower for part in ("/animal/", "/science/", "/plant/")):
+                candidates.append((0, href))
+
+    candidates.sort(key=lambda item: item[0], reverse=True)
+    return candidates
+
+
+def _image_container_priority(img: BeautifulSoup) -> int:
+    priority = len(IMAGE_CONTAINER_CLASSES) + 1
+    for parent in img.parents:
+        if parent.name == "figure":
+            return 0
+        classes = parent.get("class") or ()
+        for index, container_class in enumerate(IMAGE_CONTAINER_CLASSES, start=1):
+            if index < priority and container_class in classes:
+                priority = index
+    return priority
+
+
+def collect_image_candidates(
+    soup: BeautifulSoup,
+    base_url: str,
+    *,
+    enough_strong: Optional[int] = ENOUGH_STRONG_CANDIDATES,
+) -> list[ImageCandidate]:
     candidates: list[ImageCandidate] = []
-    seen_nodes: set[int] = set()
     seen_urls: set[str] = set()
 
     def consider(img: BeautifulSoup) -> None:
-        node_id = id(img)
-        if node_id in seen_nodes:
-            return
-        seen_nodes.add(node_id)
-
         classes = img.get('class', [])
         if isinstance(classes, str):
             classes = [classes]
@@ -440,7 +950,7 @@ def collect_image_candidates(soup: BeautifulSoup, base_url: str) -> list[ImageCa
             if is_placeholder_image(absolute):
                 continue
             lowered = absolute.lower()
-            if any(keyword in lowered for keyword in NEGATIVE_URL_KEYWORDS):
+            if NEGATIVE_URL_MATCHER.search(lowered):
                 continue
             for variant in sanitize_image_variants(absolute):
                 if variant in seen_urls:
@@ -457,12 +967,13 @@ def collect_image_candidates(soup: BeautifulSoup, base_url: str) -> list[ImageCa
         if not normalized_urls:
             return
 
-        score = (max_width or 0) * 4 + (direct_height or 0)
+        alt_score = 0
         if alt_lower:
-            if any(keyword in alt_lower for keyword in POSITIVE_ALT_KEYWORDS):
-                score += 2500
-            if any(keyword in alt_lower for keyword in NEGATIVE_ALT_KEYWORDS):
-                score -= 3000
+            if POSITIVE_ALT_MATCHER.search(alt_lower):
+                alt_score += 2500
+            if NEGATIVE_ALT_MATCHER.search(alt_lower):
+                alt_score -= 3000
+        score = (max_width or 0) * 4 + (direct_height or 0) + alt_score
 
         candidates.append(
             ImageCandidate(
@@ -471,12 +982,29 @@ def collect_image_candidates(soup: BeautifulSoup, base_url: str) -> list[ImageCa
                 width=max_width,
                 height=direct_height,
                 score=score,
+                alt_score=alt_score,
             )
         )
 
-    for selector in ('figure img', '.md-assembly img', '.assemblies img', 'img'):
-        for img in soup.select(selector):
+    # One walk over the document; each <img> is bucketed by its best container
+    # (figure, .md-assembly, .assemblies, anywhere else) and the buckets are
+    # scored in that order, which decides who keeps a URL shared by two nodes.
+    buckets: list[list[BeautifulSoup]] = [[] for _ in range(len(IMAGE_CONTAINER_CLASSES) + 2)]
+    for img in soup.find_all("img"):
+        buckets[_image_container_priority(img)].append(img)
+
+    strong = 0
+    for bucket in buckets:
+        for img in bucket:
+            before = len(candidates)
             consider(img)
+            if len(candidates) > before and candidates[-1].score >= STRONG_CANDIDATE_SCORE:
+                strong += 1
+            if enough_strong is not None and strong >= enough_strong:
+                break
+        else:
+            continue
+        break
 
     candidates.sort(key=lambda candidate: candidate.score, reverse=True)
     return candidates
@@ -508,519 +1036,3000 @@ class AnimalRecord:
     image: str
 
 
-class ImageValidator:
-    def __init__(self, *, debug: bool = False, log: Optional[logging.Logger] = None) -> None:
-        try:
-            from PIL import Image  # type: ignore
-        except ImportError:
-            self._image_module = None
-        else:
-            self._image_module = Image
+# Wall-clock seconds per named phase, summed across worker threads.
+class RunTimings:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._totals: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._totals[name] = self._totals.get(name, 0.0) + seconds
+            self._counts[name] = self._counts.get(name, 0) + 1
 
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
         try:
-            import numpy as np  # type: ignore
-        except ImportError:
-            self._np = None
-        else:
-            self._np = np
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
 
-        self._clip_model = None
-        self._clip_processor = None
-        self._clip_device = None
-        self._clip_initialised = False
-        self._torch = None
-        self._vision_model = None
-        self._vision_device = None
-        self._vision_transforms = None
-        self._vision_categories: Optional[list[str]] = None
-        self._last_clip_positive: Optional[float] = None
-        self._last_clip_negative: Optional[float] = None
-        self._debug = debug
-        self._log = log or logger
-        self._clip_prompts = [
-            "a photo of a living animal in the wild",
-            "a photo of a living animal in its natural habitat",
-            "a drawing or illustration of an animal",
-            "an image of an animal statue or toy",
-            "an image with text over a picture of an animal",
-        ]
-        self._clip_positive_indices = {0, 1}
+    def report(self) -> str:
+        with self._lock:
+            rows = [(name, self._totals[name], self._counts[name]) for name in self._totals]
+        lines = [f"{'total':>28}: {time.perf_counter() - self.started:8.2f} s"]
+        for name, seconds, count in rows:
+            suffix = f" ({count}x)" if count > 1 else ""
+            lines.append(f"{name:>28}: {seconds:8.2f} s{suffix}")
+        return "\n".join(lines)
 
-    def _debug_log(self, message: str) -> None:
-        if self._debug and self._log:
-            self._log.info(message)
 
-    def accepts(
-        self,
-        image_bytes: bytes,
-        *,
-        alt_text: str = "",
-        scientific_name: str = "",
-        common_name: str = "",
-        source_url: str = "",
-    ) -> bool:
-        descriptor = source_url or alt_text or scientific_name or "<unknown>"
-        self._debug_log(f"Validating image candidate {descriptor}")
-        if not image_bytes:
-            self._debug_log(f"Rejecting {descriptor}: empty payload")
-            return False
+def validator_fingerprint(backend: str = "torch", working_size: Optional[int] = None) -> str:
+    parts = {
+        "version": VALIDATOR_VERSION,
+        "backend": backend,
+        "working_size": working_size or 0,
+        "clip_model": CLIP_MODEL_NAME,
+        "clip_prompts": CLIP_PROMPTS,
+        "clip_positive": sorted(CLIP_POSITIVE_INDICES),
+        "clip_thresholds": [CLIP_POSITIVE_THRESHOLD, CLIP_MARGIN, CLIP_OVERRIDE_FLOOR],
+        "vision_model": VISION_MODEL_NAME,
+        "animal_labels": ANIMAL_LABEL_KEYWORDS,
+        "min_size": [MIN_IMAGE_WIDTH, MIN_IMAGE_HEIGHT],
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:16]
 
-        alt_lower = (alt_text or "").lower()
-        alt_support = self._alt_text_supports(alt_lower, scientific_name, common_name)
-        strong_alt_match = self._alt_text_matches_names(alt_lower, scientific_name, common_name)
-        if source_url and any(keyword in source_url.lower() for keyword in NEGATIVE_URL_KEYWORDS):
-            self._debug_log(f"Rejecting {descriptor}: URL keyword filter")
-            return False
-        if alt_lower and any(keyword in alt_lower for keyword in NEGATIVE_ALT_KEYWORDS):
-            self._debug_log(f"Rejecting {descriptor}: negative alt keyword match")
-            return False
 
-        image = self._load_image(image_bytes)
-        if image is None:
-            if strong_alt_match:
-                self._debug_log(f"Accepting {descriptor}: image decode unavailable but alt text supports animal")
-                return True
-            else:
-                self._debug_log(f"Rejecting {descriptor}: cannot decode image and alt text unsupported")
-                return False
-        try:
-            if image.width < 320 or image.height < 240:
-                self._debug_log(f"Rejecting {descriptor}: resolution {image.width}x{image.height} below threshold")
-                return False
+@dataclass
+class ValidationRequest:
+    image: Union[bytes, Path]
+    alt_text: str = ""
+    scientific_name: str = ""
+    common_name: str = ""
+    source_url: str = ""
+    # sha256 of the image bytes; enables the verdict cache when set.
+    content_hash: str = ""
 
-            if self._detect_text_overlay(image):
-                self._debug_log(f"Rejecting {descriptor}: detected text overlay")
-                return False
 
-            vision_result: Optional[bool] = None
-            passed_clip = self._clip_confirms(image)
-            clip_positive = self._last_clip_positive if self._last_clip_positive is not None else None
-            if (
-                passed_clip is False
-                and clip_positive is not None
-                and clip_positive < 0.05
-                and not strong_alt_match
-            ):
-                self._debug_log(
-                    f"Rejecting {descriptor}: CLIP confidence {clip_positive:.3f} too low for override"
-                )
-                return False
-            if passed_clip is False:
-                vision_result = self._vision_confirms(image)
-                if vision_result:
-                    self._debug_log(
-                        f"Overriding CLIP rejection for {descriptor}: vision model detected animal subject"
-                    )
-                    passed_clip = None
-                elif strong_alt_match:
-                    self._debug_log(
-                        f"Overriding CLIP rejection for {descriptor}: alt text strongly matches animal context"
-                    )
-                    passed_clip = None
-                else:
-                    self._debug_log(f"Rejecting {descriptor}: CLIP classifier flagged as non-natural photo")
-                    return False
+@dataclass
+class _ValidationContext:
+    descriptor: str
+    alt_lower: str
+    alt_support: bool
+    strong_alt_match: bool
+    # Identifies the alt text and names a cached verdict was reached with.
+    key: str
 
-            if passed_clip is None and not self._basic_variance_check(image):
-                self._debug_log(f"Rejecting {descriptor}: grayscale variance too low without CLIP confirmation")
-                return False
 
-            if alt_lower and not alt_support:
-                self._debug_log(f"Rejecting {descriptor}: alt text lacks animal context")
-                return False
+# Model and pixel measurements that depend only on the image bytes. None means
+# "not measured yet" (or the required library/model was unavailable).
+@dataclass
+class ImageSignals:
+    width: Optional[int] = None
+    height: Optional[int] = None
+    text_overlay: Optional[bool] = None
+    variance_ok: Optional[bool] = None
+    clip: Optional[tuple[float, float]] = None
+    vision_labels: Optional[list[str]] = None
 
-            if vision_result is None:
-                vision_result = self._vision_confirms(image)
-            if vision_result is False:
-                self._debug_log(f"Rejecting {descriptor}: vision model did not find an animal subject")
-                return False
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "width": self.width,
+                "height": self.height,
+                "text_overlay": self.text_overlay,
+                "variance_ok": self.variance_ok,
+                "clip": list(self.clip) if self.clip is not None else None,
+                "vision_labels": self.vision_labels,
+            }
+        )
 
-            self._debug_log(
-                f"Accepted {descriptor}: {image.width}x{image.height}, clip={'yes' if passed_clip else 'no'}"
+    @classmethod
+    def from_json(cls, payload: str) -> "ImageSignals":
+        data = json.loads(payload)
+        clip = data.get("clip")
+        return cls(
+            width=data.get("width"),
+            height=data.get("height"),
+            text_overlay=data.get("text_overlay"),
+            variance_ok=data.get("variance_ok"),
+            clip=(float(clip[0]), float(clip[1])) if clip else None,
+            vision_labels=data.get("vision_labels"),
+        )
+
+
+@dataclass
+class CachedVerdicts:
+    signals: ImageSignals
+    # context key -> (verdict, reason)
+    verdicts: dict[str, tuple[bool, str]]
+
+
+@dataclass
+class _ValidationItem:
+    request: ValidationRequest
+    context: _ValidationContext
+    signals: ImageSignals = field(default_factory=ImageSignals)
+    image: object = None
+    decode_failed: bool = False
+    # Signals are only persisted when they came from a successful decode.
+    cacheable: bool = False
+    # Grayscale pixels of ``image``, shared by the variance and overlay checks.
+    gray: object = None
+    tensors: Optional[ImageTensors] = None
+    verdict: Optional[bool] = None
+    reason: str = ""
+    # Set by the CLIP stage for the vision stage (see ImageValidator._stage_clip).
+    passed_clip: Optional[bool] = None
+    needs_animal_label: bool = False
+
+
+class _ImageUndecodable(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class ValidationStage:
+    name: str
+    # Relative cost; cheaper stages run first.
+    cost: float
+    check: Callable[["ImageValidator", _ValidationItem], Optional[str]]
+    # Inputs beyond the request text: "dims", "pixels", "clip" or "vision".
+    needs: tuple[str, ...] = ()
+    # Stages whose outcome this one reads, whatever their cost.
+    after: tuple[str, ...] = ()
+
+
+@dataclass
+class StageStats:
+    runs: int = 0
+    rejections: int = 0
+    seconds: float = 0.0
+
+
+def order_validation_stages(stages: Iterable[ValidationStage]) -> list[ValidationStage]:
+    # Cheapest-first, except that a stage never runs before those in its ``after``.
+    pending = sorted(stages, key=lambda stage: stage.cost)
+    names = {stage.name for stage in pending}
+    ordered: list[ValidationStage] = []
+    done: set[str] = set()
+    while pending:
+        for index, stage in enumerate(pending):
+            if all(name in done or name not in names for name in stage.after):
+                break
+        else:
+            raise ValueError("Validation stages have cyclic 'after' dependencies")
+        ordered.append(pending.pop(index))
+        done.add(stage.name)
+    return ordered
+
+
+# On-disk verdicts keyed by image content hash and the validator fingerprint.
+# Rows written under another fingerprint (different models, backends, decode
+# modes or thresholds) are not read but are kept, so switching modes back and
+# forth reuses each mode's verdicts; rows are pruned by age instead.
+class VerdictCache:
+    def __init__(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(directory / "verdicts.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS verdicts (
+                content_hash TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                signals TEXT NOT NULL,
+                verdicts TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, fingerprint)
             )
-            return True
-        finally:
-            try:
-                image.close()
-            except Exception:
-                pass
+            """
+        )
+        self._db.commit()
 
-    def _load_image(self, image_bytes: bytes):
-        image_module = self._image_module
-        if image_module is None:
-            return None
-        try:
-            with image_module.open(BytesIO(image_bytes)) as image:
-                return image.convert("RGB")
-        except Exception:
-            return None
+    def get(self, content_hash: str, fingerprint: str) -> Optional[CachedVerdicts]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT signals, verdicts FROM verdicts WHERE content_hash = ? AND fingerprint = ?",
+                (content_hash, fingerprint),
+            ).fetchone()
+            if row is None:
+                return None
+            # A hit keeps the entry alive; prune() only drops unused ones.
+            self._db.execute(
+                "UPDATE verdicts SET updated_at = ? WHERE content_hash = ? AND fingerprint = ?",
+                (time.time(), content_hash, fingerprint),
+            )
+            self._db.commit()
+        signals, verdicts = row
+        return CachedVerdicts(
+            signals=ImageSignals.from_json(signals),
+            verdicts={key: (bool(value[0]), str(value[1])) for key, value in json.loads(verdicts).items()},
+        )
 
-    def _basic_variance_check(self, image) -> bool:
-        if self._np is None:
-            return True
-        gray = image.convert("L")
-        try:
-            arr = self._np.asarray(gray)
-        finally:
-            try:
-                gray.close()
-            except Exception:
-                pass
-        return float(arr.std()) > 12.0
+    def store(
+        self,
+        content_hash: str,
+        fingerprint: str,
+        signals: ImageSignals,
+        context_key: str,
+        verdict: bool,
+        reason: str,
+    ) -> None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT verdicts FROM verdicts WHERE content_hash = ? AND fingerprint = ?",
+                (content_hash, fingerprint),
+            ).fetchone()
+            verdicts = json.loads(row[0]) if row is not None else {}
+            verdicts[context_key] = [verdict, reason]
+            self._db.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)",
+                (content_hash, fingerprint, signals.to_json(), json.dumps(verdicts), time.time()),
+            )
+            self._db.commit()
 
-    def _detect_text_overlay(self, image) -> bool:
-        if self._np is None:
-            return False
-        downscaled = image.copy()
-        try:
-            downscaled.thumbnail((512, 512))
-            arr = self._np.asarray(downscaled.convert("L"))
-            if arr.size == 0:
-                return False
-            high = (arr > 240).mean()
-            low = (arr < 15).mean()
-            return high > 0.55 and low > 0.15
-        finally:
-            try:
-                downscaled.close()
-            except Exception:
-                pass
+    def prune(self, max_age: float = VERDICT_MAX_AGE) -> int:
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM verdicts WHERE updated_at < ?", (time.time() - max_age,))
+            self._db.commit()
+        return cursor.rowcount
 
-    def _alt_text_supports(self, alt_lower: str, scientific_name: str, common_name: str) -> bool:
-        if not alt_lower:
-            return True
-        tokens: set[str] = set()
-        for name in (scientific_name, common_name):
-            for token in re.split(r"[^a-z0-9]+", name.lower()):
-                if len(token) >= 4:
-                    tokens.add(token)
-        if not tokens:
-            return False
-        return any(token in alt_lower for token in tokens)
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
 
-    def _alt_text_matches_names(self, alt_lower: str, scientific_name: str, common_name: str) -> bool:
-        if not alt_lower:
-            return False
-        names = [scientific_name.lower(), common_name.lower()]
-        return any(name and name in alt_lower for name in names)
 
-    def _label_is_animal(self, label: str) -> bool:
-        lower = label.lower()
-        return any(keyword in lower for keyword in ANIMAL_LABEL_KEYWORDS)
+# Model runtimes behind ImageValidator. Backends load lazily, report failures
+# through ``log`` and return plain Python lists, so the validator never
+# handles framework tensors.
+class InferenceBackend(ABC):
+    name = "none"
 
-    def _ensure_vision_model(self) -> bool:
-        if self._vision_model is not None:
-            return True
+    def __init__(self) -> None:
+        self.log: Callable[[str], None] = lambda message: None
+
+    @abstractmethod
+    def load_clip(self) -> bool: ...
+
+    @abstractmethod
+    def clip_probabilities(self, pixel_values) -> list[list[float]]:
+        # pixel_values: float32 (N, 3, 224, 224) from ImageTensors.clip_input;
+        # returns the softmax over CLIP_PROMPTS for each image.
+        ...
+
+    @abstractmethod
+    def load_vision(self) -> bool: ...
+
+    @abstractmethod
+    def vision_top_labels(self, pixel_values, k: int = 5) -> list[tuple[str, float]]:
+        # pixel_values: float32 (3, 224, 224) from ImageTensors.vision_input.
+        ...
+
+
+class TorchBackend(InferenceBackend):
+    name = "torch"
+
+    def __init__(self, *, cache_dir: Optional[Path] = None, device: Optional[str] = None) -> None:
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.device = device
+        self.vision_categories: list[str] = []
+        self._torch = None
+        self._clip_model = None
+        self._clip_processor = None
+        self._clip_device = None
+        self._clip_text_features = None
+        self._clip_logit_scale = None
+        self._vision_model = None
+        self._vision_device = None
+
+    def _device(self, torch):
+        if self.device is not None:
+            return torch.device(self.device)
+        return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    def load_clip(self) -> bool:
         try:
             import torch
-            from torchvision import models
+            from transformers import CLIPModel, CLIPProcessor  # type: ignore
         except ImportError:
-            self._debug_log("torch/torchvision unavailable; cannot run vision check")
+            self.log("CLIP dependencies missing; install torch and transformers for full validation")
             return False
 
         try:
-            weights_enum = getattr(models, "ResNet50_Weights", None)
-            if weights_enum is None:
+            model = CLIPModel.from_pretrained(CLIP_MODEL_NAME)
+            processor = CLIPProcessor.from_pretrained(CLIP_MODEL_NAME)
+        except Exception:
+            self.log("Failed to load CLIP model from Hugging Face; continuing without it")
+            return False
+
+        device = self._device(torch)
+        model.to(device)
+        model.eval()
+
+        with torch.no_grad():
+            self._clip_text_features = self._prompt_features(torch, model, processor).to(device)
+            self._clip_logit_scale = model.logit_scale.exp()
+        self._clip_model = model
+        self._clip_processor = processor
+        self._clip_device = device
+        self._torch = torch
+        self.log(f"CLIP model ready on device {device}")
+        return True
+
+    def clip_probabilities(self, pixel_values) -> list[list[float]]:
+        assert self._clip_model is not None and self._torch is not None
+        # Only the vision tower runs per image; the prompt side is the
+        # precomputed, normalised text features (same maths as logits_per_image).
+        with self._torch.no_grad():
+            logits = self._clip_image_logits(self._torch.from_numpy(pixel_values).to(self._clip_device))
+        return logits.softmax(dim=1).cpu().tolist()
+
+    def _clip_image_logits(self, pixel_values):
+        image_features = self._clip_model.get_image_features(pixel_values=pixel_values)
+        image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+        return self._clip_logit_scale * image_features @ self._clip_text_features.t()
+
+    def _prompt_features(self, torch, model, processor):
+        # Normalised text features for the fixed prompts, cached on disk per
+        # model and prompt list.
+        cache_path: Optional[Path] = None
+        if self.cache_dir is not None:
+            digest = hashlib.sha1("\n".join([CLIP_MODEL_NAME, *CLIP_PROMPTS]).encode("utf-8")).hexdigest()
+            cache_path = self.cache_dir / f"clip-text-{digest[:16]}.pt"
+            if cache_path.exists():
+                try:
+                    features = torch.load(cache_path, map_location="cpu", weights_only=True)
+                except Exception:
+                    self.log(f"Ignoring unreadable CLIP prompt cache {cache_path}")
+                else:
+                    if tuple(features.shape[:1]) == (len(CLIP_PROMPTS),):
+                        return features
+
+        inputs = processor(text=list(CLIP_PROMPTS), return_tensors="pt", padding=True)
+        features = model.get_text_features(**{key: tensor.to(model.device) for key, tensor in inputs.items()})
+        features = (features / features.norm(dim=-1, keepdim=True)).cpu()
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                torch.save(features, cache_path)
+            except OSError:
+                self.log(f"Could not write CLIP prompt cache {cache_path}")
+        return features
+
+    def load_vision(self) -> bool:
+        try:
+            import torch
+            from torchvision import models
+        except ImportError:
+            self.log("torch/torchvision unavailable; cannot run vision check")
+            return False
+
+        try:
+            weights_enum = getattr(models, "ResNet50_Weights", None)
+            if weights_enum is None:
                 raise RuntimeError("ResNet50 weights unavailable")
             weights = getattr(weights_enum, "IMAGENET1K_V2", getattr(weights_enum, "DEFAULT"))
             model = models.resnet50(weights=weights)
         except Exception:
-            self._debug_log("Failed to initialise ResNet50 vision model")
+            self.log("Failed to initialise ResNet50 vision model")
             return False
 
-        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        device = self._device(torch)
         model.to(device)
         model.eval()
 
-        self._vision_model = model
+        self.vision_categories = list(weights.meta.get("categories", []))
+        if not self.vision_categories:
+            self.log("ResNet50 weights carry no category names")
+            return False
         self._vision_device = device
-        self._vision_transforms = weights.transforms()
-        self._vision_categories = list(weights.meta.get("categories", []))
         self._torch = torch
-        self._debug_log(f"Vision model ready on device {device}")
+        self._vision_model = model
+        self.log(f"Vision model ready on device {device}")
         return True
 
-    def _vision_confirms(self, image) -> Optional[bool]:
-        if not self._ensure_vision_model():
-            return None
-        assert self._vision_model is not None and self._vision_transforms is not None
-        if not self._vision_categories:
-            return None
+    def vision_top_labels(self, pixel_values, k: int = 5) -> list[tuple[str, float]]:
+        assert self._vision_model is not None and self._torch is not None
         torch = self._torch
-        assert torch is not None
-        transforms = self._vision_transforms
-        tensor = transforms(image).unsqueeze(0).to(self._vision_device)
+        tensor = torch.from_numpy(pixel_values).unsqueeze(0).to(self._vision_device)
         with torch.no_grad():
             logits = self._vision_model(tensor)
             probs = torch.nn.functional.softmax(logits[0], dim=0)
-        top_probs, top_indices = probs.topk(5)
-        labels = [self._vision_categories[index] for index in top_indices.tolist()]
-        label_debug = ", ".join(f"{label}:{prob:.3f}" for label, prob in zip(labels, top_probs.tolist()))
-        self._debug_log(f"Vision labels: {label_debug}")
-        if any(self._label_is_animal(label) for label in labels):
-            return True
-        return False
+        top_probs, top_indices = probs.topk(k)
+        return [
+            (self.vision_categories[index], prob)
+            for index, prob in zip(top_indices.tolist(), top_probs.tolist())
+        ]
 
-    def _clip_confirms(self, image) -> Optional[bool]:
-        self._last_clip_positive = None
-        self._last_clip_negative = None
-        if not self._ensure_clip():
-            self._debug_log("Skipping CLIP evaluation: model unavailable")
+
+def _softmax_rows(np, logits):
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _resize_short_side(image, size: int, resample: int):
+    width, height = image.size
+    if width <= height:
+        target = (size, max(1, int(size * height / width)))
+    else:
+        target = (max(1, int(size * width / height)), size)
+    return image.resize(target, resample=resample)
+
+
+def _normalized_crop(np, pixels, size: int, mean: tuple[float, ...], std: tuple[float, ...]):
+    # Centre crop of an HWC uint8 array, scaled and normalised to CHW float32.
+    height, width = pixels.shape[:2]
+    top = int(round((height - size) / 2.0))
+    left = int(round((width - size) / 2.0))
+    crop = pixels[top : top + size, left : left + size].astype(np.float32) / 255.0
+    crop = (crop - np.asarray(mean, dtype=np.float32)) / np.asarray(std, dtype=np.float32)
+    return np.ascontiguousarray(crop.transpose(2, 0, 1))
+
+
+# Model inputs for one candidate image. The costly downscale from the decoded
+# image runs once, to ResNet's VISION_RESIZE short side (bilinear, as in
+# IMAGENET1K_V2.transforms()); CLIP's bicubic 224 px input is resampled from
+# that small uint8 copy, and each normalised input is computed at most once.
+class ImageTensors:
+    def __init__(self, image, np) -> None:
+        self._np = np
+        self._base = _resize_short_side(image, VISION_RESIZE, resample=2)  # PIL bilinear
+        self.pixels = np.asarray(self._base)
+        self._clip_input = None
+        self._vision_input = None
+
+    def clip_input(self):
+        if self._clip_input is None:
+            resized = _resize_short_side(self._base, CLIP_IMAGE_SIZE, resample=3)  # PIL bicubic
+            try:
+                pixels = self._np.asarray(resized)
+            finally:
+                resized.close()
+            self._clip_input = _normalized_crop(self._np, pixels, CLIP_IMAGE_SIZE, CLIP_MEAN, CLIP_STD)
+        return self._clip_input
+
+    def vision_input(self):
+        if self._vision_input is None:
+            self._vision_input = _normalized_crop(
+                self._np, self.pixels, VISION_CROP, IMAGENET_MEAN, IMAGENET_STD
+            )
+        return self._vision_input
+
+    def close(self) -> None:
+        self._base.close()
+
+
+# Runs the graphs written by export_onnx_models with ONNX Runtime on CPU. The
+# CLIP graph has the prompt embeddings folded in and returns logits directly.
+class OnnxBackend(InferenceBackend):
+    def __init__(self, model_dir: Path, *, quantized: bool = False, threads: Optional[int] = None) -> None:
+        super().__init__()
+        self.model_dir = model_dir
+        self.quantized = quantized
+        self.threads = threads
+        self.name = "onnx-int8" if quantized else "onnx"
+        self.vision_categories: list[str] = []
+        self._np = None
+        self._clip_session = None
+        self._vision_session = None
+
+    def _manifest(self) -> Optional[dict]:
+        path = self.model_dir / "manifest.json"
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.log(f"No ONNX export found at {path}; run with --export-onnx first")
             return None
-        assert self._clip_processor is not None and self._clip_model is not None and self._torch is not None
-        processor = self._clip_processor
-        torch = self._torch
-        inputs = processor(text=self._clip_prompts, images=image, return_tensors="pt", padding=True)
-        inputs = {key: tensor.to(self._clip_device) for key, tensor in inputs.items()}
-        with torch.no_grad():
-            outputs = self._clip_model(**inputs)
-        probs = outputs.logits_per_image.softmax(dim=1)[0]
-        positive = max(probs[index].item() for index in self._clip_positive_indices)
-        negative = max(
-            probs[index].item()
-            for index in range(len(self._clip_prompts))
-            if index not in self._clip_positive_indices
-        )
-        self._last_clip_positive = positive
-        self._last_clip_negative = negative
-        self._debug_log(
-            f"CLIP evaluation: positive={positive:.3f}, negative={negative:.3f}"
+        if manifest.get("clip_model") != CLIP_MODEL_NAME or manifest.get("clip_prompts") != list(CLIP_PROMPTS):
+            self.log(f"ONNX export in {self.model_dir} was built for other CLIP prompts; re-export it")
+            return None
+        return manifest
+
+    def _session(self, manifest: dict, model: str):
+        import onnxruntime  # type: ignore
+
+        variant = "int8" if self.quantized else "fp32"
+        filename = manifest.get("files", {}).get(model, {}).get(variant)
+        if not filename:
+            raise FileNotFoundError(f"ONNX export has no {variant} {model} model")
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        return onnxruntime.InferenceSession(
+            str(self.model_dir / filename), options, providers=["CPUExecutionProvider"]
         )
-        return positive >= 0.35 and positive >= negative + 0.1
 
-    def _ensure_clip(self) -> bool:
-        if self._clip_initialised:
-            return self._clip_model is not None
+    def load_clip(self) -> bool:
         try:
-            import torch
-            from transformers import CLIPModel, CLIPProcessor  # type: ignore
+            import numpy as np  # type: ignore
         except ImportError:
-            self._clip_initialised = True
-            self._debug_log("CLIP dependencies missing; install torch and transformers for full validation")
+            self.log("ONNX CLIP backend needs numpy and onnxruntime")
+            return False
+        manifest = self._manifest()
+        if manifest is None:
             return False
-
         try:
-            model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
-            processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
-        except Exception:
-            self._clip_initialised = True
-            self._debug_log("Failed to load CLIP model from Hugging Face; continuing without it")
+            self._clip_session = self._session(manifest, "clip")
+        except Exception as exc:
+            self.log(f"Failed to load ONNX CLIP model: {exc}")
             return False
+        self._np = np
+        self.log(f"CLIP model ready ({self.name})")
+        return True
 
-        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        model.to(device)
-        model.eval()
+    def clip_probabilities(self, pixel_values) -> list[list[float]]:
+        assert self._clip_session is not None and self._np is not None
+        np = self._np
+        (logits,) = self._clip_session.run(None, {"pixel_values": pixel_values})
+        return _softmax_rows(np, logits).tolist()
 
-        self._clip_model = model
-        self._clip_processor = processor
-        self._clip_device = device
-        self._torch = torch
-        self._clip_initialised = True
-        self._debug_log(f"CLIP model ready on device {device}")
+    def load_vision(self) -> bool:
+        try:
+            import numpy as np  # type: ignore
+        except ImportError:
+            self.log("ONNX vision backend needs numpy and onnxruntime")
+            return False
+        manifest = self._manifest()
+        if manifest is None:
+            return False
+        try:
+            self._vision_session = self._session(manifest, "vision")
+        except Exception as exc:
+            self.log(f"Failed to load ONNX vision model: {exc}")
+            return False
+        self.vision_categories = list(manifest.get("vision_categories", []))
+        if not self.vision_categories:
+            self.log("ONNX export carries no vision category names")
+            return False
+        self._np = np
+        self.log(f"Vision model ready ({self.name})")
         return True
-class BritannicaClient:
-    def __init__(self, *, refresh: bool = False) -> None:
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": USER_AGENT})
-        self.refresh = refresh
 
-    def fetch_article_url(self, scientific_name: str) -> str:
-        search_url = f"{BRITANNICA_BASE}/search?query={quote_plus(scientific_name)}"
-        response = self._request("GET", search_url)
-        soup = BeautifulSoup(response.text, "html.parser")
+    def vision_top_labels(self, pixel_values, k: int = 5) -> list[tuple[str, float]]:
+        assert self._vision_session is not None and self._np is not None
+        np = self._np
+        (logits,) = self._vision_session.run(None, {"input": pixel_values[None]})
+        probs = _softmax_rows(np, logits)[0]
+        top = np.argsort(probs)[::-1][:k]
+        return [(self.vision_categories[index], float(probs[index])) for index in top.tolist()]
+
+
+def make_inference_backend(
+    name: str,
+    *,
+    onnx_dir: Path = DEFAULT_ONNX_DIR,
+    quantized: bool = False,
+    cache_dir: Optional[Path] = None,
+) -> InferenceBackend:
+    if name == "onnx":
+        return OnnxBackend(onnx_dir, quantized=quantized)
+    if name == "torch":
+        return TorchBackend(cache_dir=cache_dir)
+    raise ValueError(f"Unknown inference backend {name!r}")
 
-        candidates = []
-        # Primary search result list.
-        for anchor in soup.select("li.m-search-results__item a[href]"):
-            href = anchor.get("href")
-            if not href:
+
+def export_onnx_models(output_dir: Path, *, quantize: bool = True, opset: int = ONNX_OPSET) -> dict:
+    import torch
+
+    backend = TorchBackend(device="cpu")
+    backend.log = print
+    if not backend.load_clip() or not backend.load_vision():
+        raise RuntimeError("Exporting to ONNX needs the torch CLIP and ResNet50 models")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    class ClipImageLogits(torch.nn.Module):
+        def forward(self, pixel_values):
+            return backend._clip_image_logits(pixel_values)
+
+    files: dict[str, dict[str, str]] = {"clip": {"fp32": "clip_image.onnx"}, "vision": {"fp32": "resnet50.onnx"}}
+    exports = (
+        ("clip", ClipImageLogits(), "pixel_values", "logits"),
+        ("vision", backend._vision_model, "input", "logits"),
+    )
+    for model, module, input_name, output_name in exports:
+        path = output_dir / files[model]["fp32"]
+        with torch.no_grad():
+            torch.onnx.export(
+                module,
+                (torch.zeros(1, 3, VISION_CROP, VISION_CROP),),
+                str(path),
+                input_names=[input_name],
+                output_names=[output_name],
+                dynamic_axes={input_name: {0: "batch"}, output_name: {0: "batch"}},
+                opset_version=opset,
+            )
+        print(f"Wrote {path} ({path.stat().st_size / 1e6:.1f} MB)")
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic  # type: ignore
+
+            quantized_path = path.with_suffix(".int8.onnx")
+            quantize_dynamic(str(path), str(quantized_path), weight_type=QuantType.QInt8)
+            files[model]["int8"] = quantized_path.name
+            print(f"Wrote {quantized_path} ({quantized_path.stat().st_size / 1e6:.1f} MB)")
+
+    manifest = {
+        "clip_model": CLIP_MODEL_NAME,
+        "clip_prompts": list(CLIP_PROMPTS),
+        "vision_model": VISION_MODEL_NAME,
+        "vision_categories": backend.vision_categories,
+        "opset": opset,
+        "files": files,
+    }
+    (output_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+# Collects CLIP scoring requests from concurrent workers into one forward pass.
+class ClipBatcher:
+    def __init__(self, validator: "ImageValidator", *, max_batch_size: int, window: float = CLIP_BATCH_WINDOW) -> None:
+        self.validator = validator
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Validations in progress; only they can still add to a batch.
+        self._active = 0
+
+    @contextmanager
+    def session(self):
+        with self._lock:
+            self._active += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def score(self, pixel_values) -> Optional[tuple[float, float]]:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="clip-batcher", daemon=True)
+                self._thread.start()
+        future: Future = Future()
+        self._queue.put((pixel_values, future))
+        return future.result()
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            # A lone validation is scored at once instead of waiting out the window.
+            while len(batch) < min(self.max_batch_size, self._active):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                scores = self.validator._clip_scores([pixel_values for pixel_values, _ in batch])
+            except BaseException as exc:  # noqa: BLE001 - delivered to every waiter
+                for _, future in batch:
+                    future.set_exception(exc)
                 continue
-            text = anchor.get_text(" ", strip=True).lower()
-            href_lower = href.lower()
-            score = 0
-            if scientific_name.lower() in text:
-                score += 3
-            if scientific_name.lower().replace(" ", "-") in href_lower:
-                score += 2
-            if "/animal/" in href_lower:
-                score += 1
-            candidates.append((score, href))
-
-        # Fallback to any anchor that mentions "/science/" topics.
-        if not candidates:
-            for anchor in soup.select("a[href]"):
-                href = anchor.get("href") or ""
-                if not href.startswith("/"):
-                    continue
-                href_lower = href.lower()
-                if any(part in href_lower for part in ("/animal/", "/science/", "/plant/")):
-                    candidates.append((0, href))
+            for (_, future), result in zip(batch, scores):
+                future.set_result(result)
 
-        if not candidates:
-            raise RuntimeError(f"No search results found for {scientific_name}")
 
-        candidates.sort(key=lambda item: item[0], reverse=True)
-        chosen = candidates[0][1]
-        return urljoin(BRITANNICA_BASE, chosen)
+class ImageValidator:
+    def __init__(
+        self,
+        *,
+        debug: bool = False,
+        log: Optional[logging.Logger] = None,
+        max_batch_size: int = CLIP_MAX_BATCH_SIZE,
+        batch_concurrent: bool = False,
+        cache_dir: Optional[Path] = None,
+        verdict_cache: Optional[VerdictCache] = None,
+        backend: Optional[InferenceBackend] = None,
+        timings: Optional[RunTimings] = None,
+        stages: Optional[Iterable[ValidationStage]] = None,
+        working_size: Optional[int] = None,
+    ) -> None:
+        try:
+            from PIL import Image  # type: ignore
+        except ImportError:
+            self._image_module = None
+        else:
+            self._image_module = Image
+
+        try:
+            import numpy as np  # type: ignore
+        except ImportError:
+            self._np = None
+        else:
+            self._np = np
 
-    def fetch_article(self, url: str) -> BeautifulSoup:
-        response = self._request("GET", url)
-        return BeautifulSoup(response.text, "html.parser")
+        self._backend = backend or TorchBackend(cache_dir=cache_dir)
+        self._backend.log = self._debug_log
+        self.timings = timings
+        self.stages = order_validation_stages(stages if stages is not None else DEFAULT_VALIDATION_STAGES)
+        self.stage_stats = {stage.name: StageStats() for stage in self.stages}
+        self._stats_lock = threading.Lock()
+        # None until the backend has been asked to load the model.
+        self._model_ready: dict[str, Optional[bool]] = {"clip": None, "vision": None}
+        self._model_locks = {name: threading.Lock() for name in self._model_ready}
+        self._warmup_thread: Optional[threading.Thread] = None
+        self.max_batch_size = max(1, max_batch_size)
+        # With several workers, single accepts() calls are pooled into batches.
+        self._clip_batcher = (
+            ClipBatcher(self, max_batch_size=self.max_batch_size)
+            if batch_concurrent and self.max_batch_size > 1
+            else None
+        )
+        self._debug = debug
+        self._log = log or logger
+        # Decode to at most working_size pixels per side (None: full resolution).
+        self.working_size = working_size
+        self.fingerprint = validator_fingerprint(self._backend.name, working_size)
+        self._verdict_cache = verdict_cache
+        if verdict_cache is not None:
+            verdict_cache.prune()
+        self._clip_prompts = list(CLIP_PROMPTS)
+        self._clip_positive_indices = set(CLIP_POSITIVE_INDICES)
 
-    def download_image(self, url: str) -> bytes:
-        response = self._request("GET", url, stream=True)
-        return response.content
+    def _debug_log(self, message: str) -> None:
+        if self._debug and self._log:
+            self._log.info(message)
 
-    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
-        for attempt in range(MAX_RETRIES):
-            response = self.session.request(method, url, timeout=TIMEOUT, **kwargs)
-            if response.status_code >= 400:
-                if attempt == MAX_RETRIES - 1:
-                    response.raise_for_status()
-                time.sleep(RETRY_DELAY)
+    def accepts(
+        self,
+        image_bytes: Union[bytes, Path],
+        *,
+        alt_text: str = "",
+        scientific_name: str = "",
+        common_name: str = "",
+        source_url: str = "",
+        content_hash: str = "",
+    ) -> bool:
+        request = ValidationRequest(
+            image=image_bytes,
+            alt_text=alt_text,
+            scientific_name=scientific_name,
+            common_name=common_name,
+            source_url=source_url,
+            content_hash=content_hash,
+        )
+        if self._clip_batcher is None:
+            return self._validate([request], self._clip_scores)[0]
+        with self._clip_batcher.session() as batcher:
+            return self._validate([request], lambda images: [batcher.score(image) for image in images])[0]
+
+    def _validate(
+        self,
+        requests: list[ValidationRequest],
+        clip_scorer: Callable[[list], list[Optional[tuple[float, float]]]],
+    ) -> list[bool]:
+        # Runs the stages breadth-first over the requests. accepts() passes a
+        # single request; CLIP batches come from ClipBatcher pooling the calls
+        # of concurrent validation workers.
+        items = [self._new_item(request) for request in requests]
+        try:
+            looked_up = False
+            for stage in self.stages:
+                live = [item for item in items if item.verdict is None]
+                if not live:
+                    break
+                if stage.needs and not looked_up:
+                    for item in live:
+                        self._lookup_cached(item)
+                    looked_up = True
+                    live = [item for item in live if item.verdict is None]
+                if "clip" in stage.needs:
+                    started = time.perf_counter()
+                    self._prefetch_clip(live, clip_scorer)
+                    self._record_stage(stage.name, time.perf_counter() - started)
+                    live = [item for item in live if item.verdict is None]
+                for item in live:
+                    self._run_stage(stage, item)
+            for item in items:
+                if item.verdict is None and item.decode_failed:
+                    self._decide(item, True, "image decode unavailable but alt text supports animal")
+                elif item.verdict is None:
+                    self._decide(
+                        item,
+                        True,
+                        f"{item.signals.width}x{item.signals.height}, clip={'yes' if item.passed_clip else 'no'}",
+                    )
+                self._remember(item)
+        finally:
+            for item in items:
+                item.gray = None
+                if item.tensors is not None:
+                    item.tensors.close()
+                    item.tensors = None
+                if item.image is not None:
+                    self._close_image(item.image)
+                    item.image = None
+        return [bool(item.verdict) for item in items]
+
+    def _new_item(self, request: ValidationRequest) -> _ValidationItem:
+        descriptor = request.source_url or request.alt_text or request.scientific_name or "<unknown>"
+        alt_lower = (request.alt_text or "").lower()
+        context = _ValidationContext(
+            descriptor=descriptor,
+            alt_lower=alt_lower,
+            alt_support=self._alt_text_supports(alt_lower, request.scientific_name, request.common_name),
+            strong_alt_match=self._alt_text_matches_names(alt_lower, request.scientific_name, request.common_name),
+            key=hashlib.sha1(
+                "\0".join((alt_lower, request.scientific_name, request.common_name)).encode("utf-8")
+            ).hexdigest(),
+        )
+        item = _ValidationItem(request=request, context=context)
+        self._debug_log(f"Validating image candidate {descriptor}")
+        if not request.image:
+            self._decide(item, False, "empty payload")
+        return item
+
+    def _run_stage(self, stage: ValidationStage, item: _ValidationItem) -> None:
+        started = time.perf_counter()
+        try:
+            reason = stage.check(self, item)
+        except _ImageUndecodable:
+            reason = None
+            self._decode_fallback(item)
+        self._record_stage(stage.name, time.perf_counter() - started, ran=True, rejected=reason is not None)
+        if reason is not None:
+            self._decide(item, False, reason)
+
+    def _record_stage(self, name: str, seconds: float, *, ran: bool = False, rejected: bool = False) -> None:
+        with self._stats_lock:
+            stats = self.stage_stats[name]
+            stats.seconds += seconds
+            stats.runs += int(ran)
+            stats.rejections += int(rejected)
+
+    def stage_report(self) -> str:
+        with self._stats_lock:
+            rows = [(stage.name, self.stage_stats[stage.name]) for stage in self.stages]
+        lines = [f"{'stage':>16} {'runs':>6} {'rejected':>9} {'time':>9}"]
+        for name, stats in rows:
+            lines.append(f"{name:>16} {stats.runs:6d} {stats.rejections:9d} {stats.seconds:8.2f}s")
+        return "\n".join(lines)
+
+    def _decide(self, item: _ValidationItem, verdict: bool, reason: str) -> None:
+        item.verdict = verdict
+        item.reason = reason
+        self._debug_log(f"{'Accepting' if verdict else 'Rejecting'} {item.context.descriptor}: {reason}")
+
+    def _decode_fallback(self, item: _ValidationItem) -> None:
+        # With a strongly matching alt an undecodable image is not rejected;
+        # it is accepted once every remaining stage has passed, so a later
+        # text-only stage can still turn it down whatever the stage order.
+        item.cacheable = False
+        if not item.context.strong_alt_match:
+            self._decide(item, False, "cannot decode image and alt text unsupported")
+
+    def _remember(self, item: _ValidationItem) -> None:
+        if self._verdict_cache is None or not item.cacheable or not item.request.content_hash:
+            return
+        # Verdicts reached without CLIP or ResNet are only valid for this run;
+        # a later run with working models must look at the image again.
+        if any(ready is False for ready in self._model_ready.values()):
+            return
+        self._verdict_cache.store(
+            item.request.content_hash,
+            self.fingerprint,
+            item.signals,
+            item.context.key,
+            bool(item.verdict),
+            item.reason,
+        )
+
+    def _lookup_cached(self, item: _ValidationItem) -> None:
+        if self._verdict_cache is None or not item.request.content_hash:
+            return
+        cached = self._verdict_cache.get(item.request.content_hash, self.fingerprint)
+        if cached is None:
+            return
+        item.signals = cached.signals
+        item.cacheable = True
+        if item.context.key in cached.verdicts:
+            verdict, reason = cached.verdicts[item.context.key]
+            self._decide(item, verdict, f"{reason} (cached)")
+            item.cacheable = False
+
+    def _prefetch_clip(
+        self,
+        items: list[_ValidationItem],
+        clip_scorer: Callable[[list], list[Optional[tuple[float, float]]]],
+    ) -> None:
+        pending: list[_ValidationItem] = []
+        for item in items:
+            if item.signals.clip is not None:
                 continue
-            return response
-        raise RuntimeError(f"Failed to fetch {url}")
+            try:
+                self._item_pixels(item)
+            except _ImageUndecodable:
+                self._decode_fallback(item)
+                continue
+            pending.append(item)
+        if pending and self._np is None:
+            self._debug_log("Skipping CLIP evaluation: numpy unavailable")
+        elif pending:
+            inputs = [self._item_tensors(item).clip_input() for item in pending]
+            for item, clip_scores in zip(pending, clip_scorer(inputs)):
+                item.signals.clip = clip_scores
+
+    def _item_pixels(self, item: _ValidationItem):
+        if item.image is None:
+            if item.decode_failed:
+                raise _ImageUndecodable
+            self._item_dims(item)
+            item.image = self._load_image(item.request.image)
+            if item.image is None:
+                item.decode_failed = True
+                raise _ImageUndecodable
+        return item.image
+
+    def _item_dims(self, item: _ValidationItem) -> tuple[int, int]:
+        # Native dimensions, read from the header without decoding pixels.
+        if item.signals.width is None or item.signals.height is None:
+            dims = None if item.decode_failed else self._read_dimensions(item.request.image)
+            if dims is None:
+                item.decode_failed = True
+                raise _ImageUndecodable
+            item.signals.width, item.signals.height = dims
+            item.cacheable = True
+        return item.signals.width, item.signals.height
+
+    def _item_gray(self, item: _ValidationItem):
+        if item.gray is None:
+            image = self._item_pixels(item)
+            gray = image.convert("L")
+            try:
+                item.gray = self._np.asarray(gray)
+            finally:
+                self._close_image(gray)
+        return item.gray
+
+    def _item_tensors(self, item: _ValidationItem) -> ImageTensors:
+        if item.tensors is None:
+            item.tensors = ImageTensors(self._item_pixels(item), self._np)
+        return item.tensors
+
+    def _item_variance_ok(self, item: _ValidationItem) -> bool:
+        if item.signals.variance_ok is None:
+            if self._np is None:
+                return self._basic_variance_check(self._item_pixels(item))
+            item.signals.variance_ok = bool(self._basic_variance_check(None, gray=self._item_gray(item)))
+        return item.signals.variance_ok
+
+    def _item_vision(self, item: _ValidationItem) -> Optional[bool]:
+        labels = item.signals.vision_labels
+        if labels is None:
+            # Only ever runs once per candidate: the labels are kept in its signals.
+            if self._np is None:
+                return None
+            labels = self._vision_labels(self._item_tensors(item).vision_input())
+            if labels is None:
+                return None
+            item.signals.vision_labels = labels
+        return any(self._label_is_animal(label) for label in labels)
+
+    # Stages. Each returns a rejection reason, or None to pass the image on.
+    # Together they accept exactly when every check passes, so running them
+    # cheapest-first changes which reason is reported, never the verdict.
+
+    def _stage_url_keywords(self, item: _ValidationItem) -> Optional[str]:
+        source_url = item.request.source_url
+        hits = NEGATIVE_URL_MATCHER.find_all(source_url.lower()) if source_url else []
+        return f"URL keyword filter ({', '.join(hits)})" if hits else None
+
+    def _stage_alt_keywords(self, item: _ValidationItem) -> Optional[str]:
+        hits = NEGATIVE_ALT_MATCHER.find_all(item.context.alt_lower)
+        return f"negative alt keyword match ({', '.join(hits)})" if hits else None
+
+    def _stage_alt_context(self, item: _ValidationItem) -> Optional[str]:
+        context = item.context
+        if not context.alt_lower or context.alt_support:
+            return None
+        if context.strong_alt_match:
+            # An undecodable image with a strongly matching alt is accepted.
+            self._item_pixels(item)
+        return "alt text lacks animal context"
+
+    def _stage_resolution(self, item: _ValidationItem) -> Optional[str]:
+        width, height = self._item_dims(item)
+        if width < MIN_IMAGE_WIDTH or height < MIN_IMAGE_HEIGHT:
+            return f"resolution {width}x{height} below threshold"
+        return None
+
+    def _stage_text_overlay(self, item: _ValidationItem) -> Optional[str]:
+        text_overlay = item.signals.text_overlay
+        if text_overlay is None:
+            image = self._item_pixels(item)
+            gray = None
+            if self._np is not None and max(image.size) <= VALIDATION_WORKING_SIZE:
+                gray = self._item_gray(item)
+            text_overlay = bool(self._detect_text_overlay(image, gray=gray))
+            if self._np is not None:
+                item.signals.text_overlay = text_overlay
+        return "detected text overlay" if text_overlay else None
+
+    def _stage_variance(self, item: _ValidationItem) -> Optional[str]:
+        # Flat images need CLIP to confirm them; without CLIP they are done.
+        if not self._item_variance_ok(item) and self._model_ready["clip"] is False:
+            return "grayscale variance too low without CLIP confirmation"
+        return None
+
+    def _stage_clip(self, item: _ValidationItem) -> Optional[str]:
+        context = item.context
+        clip_scores = item.signals.clip
+        if clip_scores is None:
+            item.passed_clip = None
+            if not self._item_variance_ok(item):
+                return "grayscale variance too low without CLIP confirmation"
+            return None
+        clip_positive, clip_negative = clip_scores
+        item.passed_clip = (
+            clip_positive >= CLIP_POSITIVE_THRESHOLD and clip_positive >= clip_negative + CLIP_MARGIN
+        )
+        if item.passed_clip:
+            return None
+        if clip_positive < CLIP_OVERRIDE_FLOOR and not context.strong_alt_match:
+            return f"CLIP confidence {clip_positive:.3f} too low for override"
+        # Every override path still requires the variance check.
+        if not self._item_variance_ok(item):
+            return "grayscale variance too low without CLIP confirmation"
+        if context.strong_alt_match:
+            self._debug_log(
+                f"Overriding CLIP rejection for {context.descriptor}: alt text strongly matches animal context"
+            )
+        else:
+            item.needs_animal_label = True
+        return None
+
+    def _stage_vision(self, item: _ValidationItem) -> Optional[str]:
+        vision_result = self._item_vision(item)
+        if item.needs_animal_label:
+            if not vision_result:
+                return "CLIP classifier flagged as non-natural photo"
+            self._debug_log(
+                f"Overriding CLIP rejection for {item.context.descriptor}: vision model detected animal subject"
+            )
+        if vision_result is False:
+            return "vision model did not find an animal subject"
+        return None
+
+    @staticmethod
+    def _close_image(image) -> None:
+        try:
+            image.close()
+        except Exception:
+            pass
+
+    def _read_dimensions(self, image_bytes: Union[bytes, Path]) -> Optional[tuple[int, int]]:
+        image_module = self._image_module
+        if image_module is None:
+            return None
+        try:
+            if isinstance(image_bytes, bytes):
+                head = image_bytes[:IMAGE_SNIFF_LIMIT]
+            else:
+                with open(image_bytes, "rb") as handle:
+                    head = handle.read(IMAGE_SNIFF_LIMIT)
+        except OSError:
+            return None
+        header = sniff_image_header(head)
+        if header is not None and header.width and header.height:
+            return header.width, header.height
+        # Formats the sniffer does not know: PIL parses the header lazily too.
+        source = BytesIO(image_bytes) if isinstance(image_bytes, bytes) else image_bytes
+        try:
+            with image_module.open(source) as image:
+                return image.size
+        except Exception:
+            return None
+
+    def _load_image(self, image_bytes: Union[bytes, Path]):
+        image_module = self._image_module
+        if image_module is None:
+            return None
+        source = BytesIO(image_bytes) if isinstance(image_bytes, bytes) else image_bytes
+        try:
+            with image_module.open(source) as image:
+                if not self.working_size:
+                    return image.convert("RGB")
+                box = (self.working_size, self.working_size)
+                # JPEGs decode at 1/2, 1/4 or 1/8 scale, never below box.
+                image.draft("RGB", box)
+                working = image.convert("RGB")
+            working.thumbnail(box)
+            return working
+        except Exception:
+            return None
+
+    def _basic_variance_check(self, image, *, gray=None) -> bool:
+        if self._np is None:
+            return True
+        if gray is None:
+            converted = image.convert("L")
+            try:
+                gray = self._np.asarray(converted)
+            finally:
+                self._close_image(converted)
+        return float(gray.std()) > 12.0
+
+    def _detect_text_overlay(self, image, *, gray=None) -> bool:
+        if self._np is None:
+            return False
+        if gray is None:
+            downscaled = image.copy()
+            try:
+                downscaled.thumbnail((VALIDATION_WORKING_SIZE, VALIDATION_WORKING_SIZE))
+                gray = self._np.asarray(downscaled.convert("L"))
+            finally:
+                self._close_image(downscaled)
+        if gray.size == 0:
+            return False
+        high = (gray > 240).mean()
+        low = (gray < 15).mean()
+        return high > 0.55 and low > 0.15
+
+    def _alt_text_supports(self, alt_lower: str, scientific_name: str, common_name: str) -> bool:
+        if not alt_lower:
+            return True
+        tokens: set[str] = set()
+        for name in (scientific_name, common_name):
+            for token in re.split(r"[^a-z0-9]+", name.lower()):
+                if len(token) >= 4:
+                    tokens.add(token)
+        if not tokens:
+            return False
+        return any(token in alt_lower for token in tokens)
+
+    def _alt_text_matches_names(self, alt_lower: str, scientific_name: str, common_name: str) -> bool:
+        if not alt_lower:
+            return False
+        names = [scientific_name.lower(), common_name.lower()]
+        return any(name and name in alt_lower for name in names)
+
+    def _label_is_animal(self, label: str) -> bool:
+        lower = label.lower()
+        return ANIMAL_LABEL_MATCHER.search(lower)
+
+    def warm_up(self) -> threading.Thread:
+        # Load both models in the background; callers that need a model before
+        # it is ready block on its lock instead of loading it a second time.
+        if self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(target=self._warm_up, name="model-warmup", daemon=True)
+            self._warmup_thread.start()
+        return self._warmup_thread
+
+    def _warm_up(self) -> None:
+        try:
+            self._ensure_clip()
+            self._ensure_vision_model()
+        except Exception as exc:  # noqa: BLE001 - validation retries the load on demand
+            self._debug_log(f"Model warm-up failed: {exc}")
+
+    def _ensure_model(self, name: str, loader: Callable[[], bool]) -> bool:
+        ready = self._model_ready[name]
+        if ready is not None:
+            return ready
+        started = time.perf_counter()
+        with self._model_locks[name]:
+            ready = self._model_ready[name]
+            if ready is None:
+                ready = self._model_ready[name] = loader()
+                if self.timings is not None:
+                    self.timings.add(f"model load ({name})", time.perf_counter() - started)
+                return ready
+        # Another thread (normally the warm-up) was loading it.
+        if self.timings is not None:
+            self.timings.add("waiting for models", time.perf_counter() - started)
+        return ready
+
+    def _ensure_vision_model(self) -> bool:
+        return self._ensure_model("vision", self._backend.load_vision)
+
+    def _vision_labels(self, pixel_values) -> Optional[list[str]]:
+        if not self._ensure_vision_model():
+            return None
+        top = self._backend.vision_top_labels(pixel_values)
+        if not top:
+            return None
+        label_debug = ", ".join(f"{label}:{prob:.3f}" for label, prob in top)
+        self._debug_log(f"Vision labels: {label_debug}")
+        return [label for label, _ in top]
+
+    def _clip_scores(self, inputs: list) -> list[Optional[tuple[float, float]]]:
+        # (best positive, best negative) prompt probability per CLIP input,
+        # max_batch_size inputs per forward pass; None when CLIP is unavailable.
+        if not inputs:
+            return []
+        if not self._ensure_clip():
+            self._debug_log("Skipping CLIP evaluation: model unavailable")
+            return [None] * len(inputs)
+        negative_indices = [
+            index for index in range(len(self._clip_prompts)) if index not in self._clip_positive_indices
+        ]
+        scores: list[Optional[tuple[float, float]]] = []
+        for offset in range(0, len(inputs), self.max_batch_size):
+            chunk = self._np.stack(inputs[offset : offset + self.max_batch_size])
+            for row in self._backend.clip_probabilities(chunk):
+                positive = max(row[index] for index in self._clip_positive_indices)
+                negative = max(row[index] for index in negative_indices)
+                self._debug_log(f"CLIP evaluation: positive={positive:.3f}, negative={negative:.3f}")
+                scores.append((positive, negative))
+        return scores
+
+    def _ensure_clip(self) -> bool:
+        return self._ensure_model("clip", self._backend.load_clip)
+
+
+DEFAULT_VALIDATION_STAGES = (
+    ValidationStage("url_keywords", 0, ImageValidator._stage_url_keywords),
+    ValidationStage("alt_keywords", 0, ImageValidator._stage_alt_keywords),
+    ValidationStage("alt_context", 0, ImageValidator._stage_alt_context),
+    ValidationStage("resolution", 1, ImageValidator._stage_resolution, needs=("dims",)),
+    ValidationStage("variance", 10, ImageValidator._stage_variance, needs=("pixels",)),
+    ValidationStage("text_overlay", 20, ImageValidator._stage_text_overlay, needs=("pixels",)),
+    ValidationStage("clip", 100, ImageValidator._stage_clip, needs=("clip",), after=("variance",)),
+    ValidationStage("vision", 200, ImageValidator._stage_vision, needs=("vision",), after=("clip",)),
+)
+
+
+class ImageRejected(RuntimeError):
+    pass
+
+
+@dataclass
+class DownloadedImage:
+    url: str
+    path: Path
+    sha256: str
+    size: int
+    content_type: str
+    header: Optional[ImageHeader]
+    phash: Optional[int] = None
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    def save_to(self, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(self.path), str(target))
+
+    def discard(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class ImageProbe:
+    url: str
+    resolved_url: str
+    content_type: str
+    size: Optional[int]
+    header: Optional[ImageHeader]
+    identity: str
+
+    @property
+    def plausible(self) -> bool:
+        # What the response headers alone allow.
+        if self.content_type and not self.content_type.startswith("image/"):
+            if self.content_type != "application/octet-stream":
+                return False
+        return self.size is None or self.size <= MAX_IMAGE_BYTES
+
+    @property
+    def usable(self) -> bool:
+        return self.plausible and self.header is not None and not self.header.is_undersized()
+
+    @property
+    def clearly_large(self) -> bool:
+        header = self.header
+        return (
+            self.usable
+            and header is not None
+            and header.width is not None
+            and header.height is not None
+            and header.width >= 2 * MIN_IMAGE_WIDTH
+            and header.height >= 2 * MIN_IMAGE_HEIGHT
+        )
+
+    def rank(self, candidate: ImageCandidate) -> int:
+        header = self.header
+        width = header.width if header and header.width else candidate.width or 0
+        height = header.height if header and header.height else candidate.height or 0
+        score = min(width, IMAGE_RANK_MAX_WIDTH) * 4 + min(height, IMAGE_RANK_MAX_HEIGHT)
+        if header is not None:
+            score += IMAGE_FORMAT_BONUS.get(header.format, 0)
+        return score + candidate.alt_score
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - time.time())
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = MAX_RETRIES
+    base_delay: float = RETRY_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    retry_after_limit: float = RETRY_AFTER_LIMIT
+    retry_statuses: frozenset[int] = field(default_factory=lambda: RETRYABLE_STATUSES)
+
+    def should_retry(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.retry_after_limit)
+        # Exponential backoff with "equal jitter": half fixed, half random.
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+# Opens per host after a run of consecutive transient failures; once the
+# cooldown passes a single trial request decides whether it closes again.
+# Other callers keep failing fast while the trial is in flight (half-open);
+# a trial that never reports back expires after another cooldown.
+class CircuitBreaker:
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN,
+    ) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures: dict[str, int] = {}
+        self._open_until: dict[str, float] = {}
+        self._trial_until: dict[str, float] = {}
+
+    def check(self, host: str) -> None:
+        with self._lock:
+            open_until = self._open_until.get(host)
+            if open_until is None:
+                return
+            now = time.monotonic()
+            if now < open_until or now < self._trial_until.get(host, 0.0):
+                raise CircuitOpenError(f"Circuit open for {host}; skipping request")
+            self._trial_until[host] = now + self.cooldown
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._open_until.pop(host, None)
+            self._trial_until.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            self._trial_until.pop(host, None)
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold:
+                self._open_until[host] = time.monotonic() + self.cooldown
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float = DEFAULT_HOST_RATE, burst: int = DEFAULT_HOST_BURST) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._blocked_until: dict[str, float] = {}
+
+    def defer(self, url: str, seconds: float) -> None:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._blocked_until[host] = max(until, self._blocked_until.get(host, 0.0))
+
+    def acquire(self, url: str) -> None:
+        host = urlparse(url).netloc.lower()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._blocked_until.get(host, 0.0) - now
+                if wait <= 0:
+                    if self.rate <= 0:
+                        return
+                    wait = self._take(host, now)
+                    if wait <= 0:
+                        return
+            time.sleep(wait)
+
+    def _take(self, host: str, now: float) -> float:
+        tokens, updated = self._buckets.get(host, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        if tokens >= 1.0:
+            self._buckets[host] = (tokens - 1.0, now)
+            return 0.0
+        self._buckets[host] = (tokens, now)
+        return (1.0 - tokens) / self.rate
+
+
+def canonical_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    port = parsed.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)), doseq=True)
+    return urlunparse((scheme, host, parsed.path or "/", parsed.params, query, ""))
+
+
+def _build_response(
+    url: str,
+    status: int,
+    headers: dict[str, str],
+    body: bytes,
+    reason: str = "",
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = requests.structures.CaseInsensitiveDict(headers)
+    response._content = body
+    response._content_consumed = True
+    response.url = url
+    response.reason = reason or ("OK" if status < 400 else "")
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    stored_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    def is_fresh(self, fresh_for: float) -> bool:
+        return time.time() - self.stored_at < fresh_for
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        response = _build_response(self.url, self.status, self.headers, self.body)
+        response.from_cache = True  # type: ignore[attr-defined]
+        return response
+
+
+class HttpCache:
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        fresh_for: float = HTTP_CACHE_FRESH_FOR,
+        ttl: float = HTTP_CACHE_TTL,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+    ) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.fresh_for = fresh_for
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(directory / "http_cache.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                compressed INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._db.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        key = canonical_url(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status, headers, body, compressed, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        stored_url, status, headers, body, compressed, stored_at = row
+        if compressed:
+            body = zlib.decompress(body)
+        return CachedResponse(
+            url=stored_url,
+            status=status,
+            headers=json.loads(headers),
+            body=body,
+            stored_at=stored_at,
+        )
+
+    def store(self, url: str, response: requests.Response, body: Optional[bytes] = None) -> None:
+        if body is None:
+            body = response.content
+        headers = {
+            name: response.headers[name]
+            for name in HTTP_CACHE_STORED_HEADERS
+            if name in response.headers
+        }
+        content_type = headers.get("content-type", "").lower()
+        compressed = any(marker in content_type for marker in COMPRESSIBLE_CONTENT_TYPES)
+        payload = zlib.compress(body, 6) if compressed else body
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    canonical_url(url),
+                    url,
+                    response.status_code,
+                    json.dumps(headers),
+                    sqlite3.Binary(payload),
+                    int(compressed),
+                    len(payload),
+                    now,
+                    now,
+                ),
+            )
+            self._db.commit()
+
+    def mark_revalidated(self, url: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, canonical_url(url)),
+            )
+            self._db.commit()
+
+    def evict(self) -> int:
+        removed = 0
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM responses WHERE accessed_at < ?", (time.time() - self.ttl,)
+            )
+            removed += cursor.rowcount
+            (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            if total > self.max_bytes:
+                stale: list[str] = []
+                for key, size in self._db.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+                ):
+                    if total <= self.max_bytes:
+                        break
+                    stale.append(key)
+                    total -= size
+                self._db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in stale])
+                removed += len(stale)
+            self._db.commit()
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _normalize_term(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+class ResolutionIndex:
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, object]] = {}
+        self._dirty = False
+        if path is not None and path.exists():
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("Ignoring unreadable resolution index %s", path)
+
+    def get(self, term: str) -> Optional[tuple[str, int]]:
+        with self._lock:
+            entry = self._entries.get(_normalize_term(term))
+        if not entry:
+            return None
+        return str(entry["url"]), int(entry.get("score", 0))  # type: ignore[arg-type]
+
+    def record(self, term: str, url: str, score: int) -> None:
+        with self._lock:
+            self._entries[_normalize_term(term)] = {"url": url, "score": score, "resolvedAt": int(time.time())}
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._entries, indent=2, sort_keys=True, ensure_ascii=False)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(payload, encoding="utf-8")
+
+
+# Concurrent callers asking for the same key share one in-flight call; the
+# most recent results (including failures) are kept for the rest of the run.
+class RequestCoalescer:
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Future] = OrderedDict()
+
+    def run(self, key: Hashable, func: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if future is None:
+                future = Future()
+                self._entries[key] = future
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+        if owner:
+            try:
+                future.set_result(func())
+            except BaseException as exc:  # noqa: BLE001 - delivered to every waiter
+                future.set_exception(exc)
+        return future.result()
+
+
+class CassetteMiss(RuntimeError):
+    pass
+
+
+# Record/replay archive of raw HTTP exchanges: one index.json keyed by
+# method + canonical URL (+ Range) pointing into an append-only bodies.bin.
+class Cassette:
+    def __init__(self, directory: Path, mode: str, *, latency_factor: float = 0.0) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        self.directory = directory
+        self.mode = mode
+        self.latency_factor = latency_factor
+        self._lock = threading.Lock()
+        self._index_path = directory / "index.json"
+        self._bodies_path = directory / "bodies.bin"
+        self._entries: dict[str, dict[str, object]] = {}
+        if self._index_path.exists():
+            self._entries = json.loads(self._index_path.read_text(encoding="utf-8"))["entries"]
+        elif mode == "replay":
+            raise FileNotFoundError(f"No cassette found in {directory}")
+        if mode == "record":
+            directory.mkdir(parents=True, exist_ok=True)
+            self._bodies = open(self._bodies_path, "ab")
+        else:
+            self._bodies = open(self._bodies_path, "rb")
+
+    @staticmethod
+    def key(method: str, url: str, headers: Optional[dict[str, str]] = None) -> str:
+        byte_range = (headers or {}).get("Range", "")
+        return f"{method.upper()} {canonical_url(url)} {byte_range}".rstrip()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, key: str, response: requests.Response, elapsed: float) -> None:
+        body = response.content
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        headers.pop("content-encoding", None)
+        headers.pop("transfer-encoding", None)
+        content_type = headers.get("content-type", "").lower()
+        compressed = any(marker in content_type for marker in COMPRESSIBLE_CONTENT_TYPES)
+        payload = zlib.compress(body, 6) if compressed else body
+        with self._lock:
+            offset = self._bodies.seek(0, os.SEEK_END)
+            self._bodies.write(payload)
+            self._entries[key] = {
+                "url": response.url,
+                "status": response.status_code,
+                "reason": response.reason or "",
+                "headers": headers,
+                "offset": offset,
+                "length": len(payload),
+                "compressed": compressed,
+                "elapsed": round(elapsed, 4),
+            }
+
+    def replay(self, key: str) -> requests.Response:
+        entry = self._entries.get(key)
+        if entry is None and key.endswith("bytes=0-" + str(IMAGE_PROBE_BYTES - 1)):
+            # Serve a recorded full response, like a server ignoring Range.
+            entry = self._entries.get(key.rsplit(" ", 1)[0])
+        if entry is None:
+            raise CassetteMiss(f"No recorded response for {key}")
+        with self._lock:
+            self._bodies.seek(int(entry["offset"]))  # type: ignore[arg-type]
+            payload = self._bodies.read(int(entry["length"]))  # type: ignore[arg-type]
+        body = zlib.decompress(payload) if entry["compressed"] else payload
+        if self.latency_factor > 0:
+            time.sleep(float(entry["elapsed"]) * self.latency_factor)  # type: ignore[arg-type]
+        return _build_response(
+            str(entry["url"]),
+            int(entry["status"]),  # type: ignore[arg-type]
+            dict(entry["headers"]),  # type: ignore[arg-type]
+            body,
+            reason=str(entry.get("reason", "")),
+        )
+
+    def iter_bodies(self, content_type: str = "") -> Iterable[tuple[str, bytes]]:
+        for key in sorted(self._entries):
+            entry = self._entries[key]
+            if content_type and content_type not in str(entry["headers"].get("content-type", "")):  # type: ignore[union-attr]
+                continue
+            if int(entry["status"]) != 200:  # type: ignore[arg-type]
+                continue
+            yield str(entry["url"]), self.replay(key).content
+
+    def close(self) -> None:
+        with self._lock:
+            if self._bodies.closed:
+                return
+            self._bodies.close()
+            if self.mode == "record":
+                payload = {"version": 1, "entries": self._entries}
+                self._index_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+
+
+def perceptual_hash(image_bytes: Union[bytes, Path]) -> Optional[int]:
+    # 64-bit difference hash: each bit says whether a pixel of the grayscale
+    # thumbnail is brighter than its right-hand neighbour.
+    try:
+        from PIL import Image  # type: ignore
+    except ImportError:
+        return None
+    source = BytesIO(image_bytes) if isinstance(image_bytes, bytes) else image_bytes
+    try:
+        with Image.open(source) as image:
+            image.draft("L", (DHASH_SIZE * 8, DHASH_SIZE * 8))
+            thumbnail = image.convert("L").resize((DHASH_SIZE + 1, DHASH_SIZE), resample=Image.LANCZOS)
+    except Exception:
+        return None
+    pixels = thumbnail.tobytes()
+    thumbnail.close()
+    value = 0
+    for row in range(DHASH_SIZE):
+        offset = row * (DHASH_SIZE + 1)
+        for column in range(DHASH_SIZE):
+            value = (value << 1) | int(pixels[offset + column] > pixels[offset + column + 1])
+    return value
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+
+# Burkhard-Keller tree over perceptual hashes. Children hang off edges labelled
+# with their Hamming distance to the parent; by the triangle inequality a
+# search within radius r only follows edges within r of the query's distance
+# to the node, so lookups touch a small part of the tree.
+class BKTree:
+    def __init__(self) -> None:
+        # node: (hash, payloads, children by edge distance)
+        self._root: Optional[tuple[int, list, dict[int, tuple]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, payload: object) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = (value, [payload], {})
+            return
+        node = self._root
+        while True:
+            distance = hamming_distance(value, node[0])
+            if distance == 0:
+                node[1].append(payload)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [payload], {})
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> list[tuple[int, object]]:
+        matches: list[tuple[int, object]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(value, node[0])
+            if distance <= max_distance:
+                matches.extend((distance, payload) for payload in node[1])
+            for edge, child in node[2].items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+
+# Workers claim a hash before validating a candidate so two seeds can never
+# both accept the same bytes; rejected candidates release their claim.
+class ImageHashRegistry:
+    def __init__(
+        self,
+        hashes: Iterable[str] = (),
+        *,
+        max_distance: int = PERCEPTUAL_DUPLICATE_DISTANCE,
+    ) -> None:
+        self._hashes: set[str] = set(hashes)
+        self._pending: set[str] = set()
+        self.max_distance = max_distance
+        # Accepted images by perceptual hash, and in-flight claims by sha256.
+        self._similar = BKTree()
+        self._pending_similar: dict[str, tuple[int, str]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, digest: object) -> bool:
+        with self._lock:
+            return digest in self._hashes or digest in self._pending
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hashes)
+
+    def claim(self, digest: str) -> bool:
+        with self._lock:
+            if digest in self._hashes or digest in self._pending:
+                return False
+            self._pending.add(digest)
+            return True
+
+    def claim_similar(self, digest: str, phash: int, owner: str) -> Optional[str]:
+        # Returns the owner of an accepted or in-flight image within
+        # max_distance of phash, or records the claim and returns None.
+        # Images of the same owner never count as duplicates of each other.
+        with self._lock:
+            for _, other in self._similar.search(phash, self.max_distance):
+                if other != owner:
+                    return str(other)
+            for other_digest, (other_phash, other) in self._pending_similar.items():
+                if other_digest != digest and other != owner and hamming_distance(phash, other_phash) <= self.max_distance:
+                    return other
+            self._pending_similar[digest] = (phash, owner)
+            return None
+
+    def release(self, digest: str) -> None:
+        with self._lock:
+            self._pending.discard(digest)
+            self._pending_similar.pop(digest, None)
+
+    def add(self, digest: str, phash: Optional[int] = None, owner: str = "") -> None:
+        with self._lock:
+            self._pending.discard(digest)
+            self._hashes.add(digest)
+            pending = self._pending_similar.pop(digest, None)
+            if phash is None and pending is not None:
+                phash, owner = pending
+            if phash is not None:
+                self._similar.add(phash, owner)
+
+
+@dataclass
+class ManifestEntry:
+    path: Path
+    size: int
+    mtime_ns: int
+    sha256: str
+    phash: Optional[int]
+    owner: str
+
+
+def _sha256_file(path: Path) -> str:
+    # hashlib releases the GIL for large buffers, so mapped files hash in
+    # parallel across threads without copying them into Python bytes.
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+    return digest.hexdigest()
+
+
+def _hash_image_file(path: Path) -> tuple[str, Optional[int]]:
+    return _sha256_file(path), perceptual_hash(path)
+
+
+# Persistent record of the files in the image directory. Files whose size and
+# mtime match the stored row are trusted without being read; only new or
+# changed files are hashed. Each row also names the record that owns the image.
+class ImageManifest:
+    def __init__(self, path: Optional[Path]) -> None:
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path) if path is not None else ":memory:", check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS images (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                phash TEXT,
+                owner TEXT NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        # Absolute but unresolved, so a row stays keyed by the directory
+        # entry even when that entry is a symlink.
+        return str(path.absolute())
+
+    @staticmethod
+    def _entry(row: tuple) -> ManifestEntry:
+        path, size, mtime_ns, sha256, phash, owner = row
+        return ManifestEntry(Path(path), size, mtime_ns, sha256, int(phash, 16) if phash else None, owner)
+
+    def _write(self, entry: ManifestEntry) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self._key(entry.path),
+                entry.size,
+                entry.mtime_ns,
+                entry.sha256,
+                f"{entry.phash:016x}" if entry.phash is not None else None,
+                entry.owner,
+            ),
+        )
+
+    def owner_of(self, sha256: str) -> Optional[str]:
+        # The record whose image has this content, if any file in the
+        # manifest holds it.
+        with self._lock:
+            row = self._db.execute(
+                "SELECT owner FROM images WHERE sha256 = ? ORDER BY path LIMIT 1", (sha256,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def scan(self, directory: Path, *, workers: int = 0) -> list[ManifestEntry]:
+        # Brings the rows for ``directory`` up to date and returns them. Rows
+        # of files that no longer exist are dropped.
+        prefix = self._key(directory) + os.sep
+        with self._lock:
+            known = {
+                row[0]: self._entry(row)
+                for row in self._db.execute(
+                    "SELECT * FROM images WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+                )
+            }
+        current: dict[str, ManifestEntry] = {}
+        stale: list[tuple[str, Path, os.stat_result]] = []
+        files = sorted(directory.iterdir()) if directory.is_dir() else []
+        for path in files:
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            key = self._key(path)
+            stat = path.stat()
+            entry = known.get(key)
+            if entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                current[key] = entry
+            else:
+                stale.append((key, path, stat))
+        if stale:
+            with ThreadPoolExecutor(max(1, workers or min(8, os.cpu_count() or 1)), thread_name_prefix="manifest") as executor:
+                hashed = list(executor.map(lambda item: _hash_image_file(item[1]), stale))
+            for (key, path, stat), (sha256, phash) in zip(stale, hashed):
+                previous = known.get(key)
+                current[key] = ManifestEntry(
+                    path=path,
+                    size=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns,
+                    sha256=sha256,
+                    phash=phash,
+                    owner=previous.owner if previous is not None else path.stem,
+                )
+        with self._lock:
+            for key in known.keys() - current.keys():
+                self._db.execute("DELETE FROM images WHERE path = ?", (key,))
+            for key, _, _ in stale:
+                self._write(current[key])
+            self._db.commit()
+        logger.info("Image manifest: %d files, %d rehashed", len(current), len(stale))
+        return [current[key] for key in sorted(current)]
+
+    def record(self, path: Path, *, sha256: str, phash: Optional[int], owner: str) -> ManifestEntry:
+        stat = path.stat()
+        entry = ManifestEntry(path, stat.st_size, stat.st_mtime_ns, sha256, phash, owner)
+        with self._lock:
+            self._write(entry)
+            self._db.commit()
+        return entry
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# Content-addressed image store. Each distinct image is kept once under
+# blobs/<sha[:2]>/<sha>, and directories such as public/assets/animals and its
+# backups are "views" whose files are hardlinks to blobs. Snapshots therefore
+# cost directory entries rather than copies. Views are only ever changed by
+# replacing entries, never by writing through them, so updating one view
+# leaves the others alone. Where a hardlink is impossible (e.g. across
+# filesystems) the view gets a plain copy; views never contain symlinks.
+class BlobStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._blobs = root / "blobs"
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        self._views_path = root / "views.json"
+        self._lock = threading.Lock()
+
+    def blob_path(self, sha256: str) -> Path:
+        return self._blobs / sha256[:2] / sha256
+
+    def views(self) -> list[Path]:
+        try:
+            return [Path(view) for view in json.loads(self._views_path.read_text(encoding="utf-8"))]
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def _save_views(self, views: Iterable[Path]) -> None:
+        temp = self._views_path.with_suffix(".tmp")
+        temp.write_text(json.dumps(sorted({str(view) for view in views}), indent=2), encoding="utf-8")
+        os.replace(temp, self._views_path)
+
+    def register_view(self, directory: Path) -> None:
+        with self._lock:
+            views = self.views()
+            resolved = directory.resolve()
+            if resolved not in views:
+                self._save_views([*views, resolved])
+
+    def put(self, source: Path, sha256: str) -> Path:
+        # Moves ``source`` into the store, or drops it when the blob exists.
+        blob = self.blob_path(sha256)
+        with self._lock:
+            if blob.exists():
+                source.unlink()
+                return blob
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(source), str(blob))
+        return blob
+
+    def _replace_with_link(self, blob: Path, target: Path) -> bool:
+        # Atomically points ``target`` at ``blob``; leaves it untouched and
+        # returns False when the filesystem refuses the hardlink.
+        temp = target.with_name(f".{target.name}.{threading.get_ident()}.link")
+        if temp.is_symlink() or temp.exists():
+            temp.unlink()
+        try:
+            os.link(blob, temp)
+        except OSError:
+            return False
+        os.replace(temp, target)
+        return True
+
+    def link(self, sha256: str, target: Path) -> None:
+        blob = self.blob_path(sha256)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not self._replace_with_link(blob, target):
+            temp = target.with_name(f".{target.name}.{threading.get_ident()}.copy")
+            shutil.copy2(blob, temp)
+            os.replace(temp, target)
+
+    def _is_linked(self, path: Path, sha256: str) -> bool:
+        blob = self.blob_path(sha256)
+        try:
+            return blob.exists() and os.path.samefile(path, blob)
+        except OSError:
+            return False
+
+    def adopt(
+        self,
+        directory: Path,
+        *,
+        hashes: Optional[dict[str, str]] = None,
+        workers: int = 0,
+    ) -> dict[str, str]:
+        # Turns an existing directory into a view: files already in the
+        # store are replaced by links, new content becomes a blob. Returns
+        # the blob hash of every file by name. ``hashes`` (by name, e.g. from
+        # the image manifest) avoids rehashing files whose hash is known.
+        if not directory.is_dir():
+            raise FileNotFoundError(f"Image directory {directory} does not exist")
+        files = [
+            path
+            for path in sorted(directory.iterdir())
+            if not path.name.startswith(".") and (path.is_file() or path.is_symlink())
+        ]
+        known = dict(hashes or {})
+        unknown = [path for path in files if path.name not in known and path.exists()]
+        if unknown:
+            with ThreadPoolExecutor(max(1, workers or min(8, os.cpu_count() or 1)), thread_name_prefix="blobs") as executor:
+                known.update(zip((path.name for path in unknown), executor.map(_sha256_file, unknown)))
+        contents: dict[str, str] = {}
+        reclaimed = 0
+        for path in files:
+            sha = known.get(path.name, "")
+            if not sha:
+                logger.warning("Skipping broken link %s", path)
+                continue
+            contents[path.name] = sha
+            if self._is_linked(path, sha):
+                continue
+            blob = self.blob_path(sha)
+            with self._lock:
+                if not blob.exists():
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        # The file's own inode becomes the blob; nothing is copied.
+                        if path.is_symlink():
+                            raise OSError
+                        os.link(path, blob)
+                    except OSError:
+                        shutil.copy2(path, blob)
+            if not self._is_linked(path, sha):
+                size = path.stat().st_size
+                if self._replace_with_link(blob, path):
+                    reclaimed += size
+        self.register_view(directory)
+        logger.info("Adopted %s: %d files, %.1f MB deduplicated", directory, len(contents), reclaimed / 1e6)
+        return contents
+
+    def snapshot(self, directory: Path, destination: Path) -> int:
+        if destination.exists():
+            raise FileExistsError(f"Snapshot destination {destination} already exists")
+        contents = self.adopt(directory)
+        destination.mkdir(parents=True)
+        for name, sha in contents.items():
+            self.link(sha, destination / name)
+        self.register_view(destination)
+        return len(contents)
+
+    def gc(self, *, dry_run: bool = False) -> tuple[int, int]:
+        # Removes blobs that no registered view links to. Views that no
+        # longer exist are unregistered first.
+        with self._lock:
+            views = [view for view in self.views() if view.is_dir()]
+            self._save_views(views)
+            inodes: set[tuple[int, int]] = set()
+            for view in views:
+                for entry in view.iterdir():
+                    if entry.is_file():
+                        stat = entry.stat()
+                        inodes.add((stat.st_dev, stat.st_ino))
+            removed = 0
+            freed = 0
+            for blob in self._blobs.glob("*/*"):
+                stat = blob.stat()
+                if (stat.st_dev, stat.st_ino) in inodes:
+                    continue
+                removed += 1
+                freed += stat.st_size
+                if not dry_run:
+                    blob.unlink()
+        return removed, freed
+
+
+class BritannicaClient:
+    def __init__(
+        self,
+        *,
+        refresh: bool = False,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        pool_size: int = 10,
+        cache: Optional[HttpCache] = None,
+        resolutions: Optional[ResolutionIndex] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cassette: Optional[Cassette] = None,
+        html_parser: Optional[str] = None,
+        early_stop_articles: bool = True,
+    ) -> None:
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.refresh = refresh
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.cache = cache
+        self.resolutions = resolutions or ResolutionIndex()
+        self._search_calls = RequestCoalescer(max_entries=1024)
+        self._article_calls = RequestCoalescer(max_entries=max(16, pool_size))
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # URLs that answered 404/410 during this run are not requested again.
+        self._dead_urls: dict[str, int] = {}
+        self.cassette = cassette
+        self.html_parser = resolve_html_parser(html_parser)
+        self.early_stop_articles = early_stop_articles
+
+    def fetch_article_url(self, scientific_name: str) -> str:
+        # Weak (score 0) resolutions are searched again so better results are
+        # picked up once Britannica's index improves.
+        if not self.refresh:
+            known = self.resolutions.get(scientific_name)
+            if known is not None and known[1] > 0:
+                return known[0]
+        key = _normalize_term(scientific_name)
+        return self._search_calls.run(key, lambda: self._search_article_url(scientific_name))
+
+    def _search_article_url(self, scientific_name: str) -> str:
+        search_url = f"{BRITANNICA_BASE}/search?query={quote_plus(scientific_name)}"
+        response = self._request("GET", search_url)
+        soup = make_soup(response.text, self.html_parser)
+
+        candidates = score_search_results(soup, scientific_name)
+        if not candidates:
+            raise RuntimeError(f"No search results found for {scientific_name}")
+
+        score, chosen = candidates[0]
+        article_url = urljoin(BRITANNICA_BASE, chosen)
+        self.resolutions.record(scientific_name, article_url, score)
+        return article_url
+
+    def fetch_article(self, url: str) -> BeautifulSoup:
+        return self.fetch_article_page(url).soup
+
+    def fetch_article_page(self, url: str) -> ArticlePage:
+        return self._article_calls.run(canonical_url(url), lambda: self._parse_article(url))
+
+    def _parse_article(self, url: str) -> ArticlePage:
+        response = self._request("GET", url, stream=True)
+        truncated_by = response.headers.get(TRUNCATED_HEADER) if getattr(response, "from_cache", False) else None
+        if truncated_by and (not self.early_stop_articles or truncated_by != TRUNCATED_RULE):
+            # The cache holds only the prefix an early-stopping run kept; this
+            # client wants the whole page, or the prefix was cut by an older
+            # rule, so fetch it past the cache.
+            response.close()
+            response = self._fetch("GET", url, stream=True)
+        try:
+            markup, truncated = read_article_markup(response, early_stop=self.early_stop_articles)
+        finally:
+            response.close()
+        if self.cache is not None and response.status_code == 200 and not getattr(response, "from_cache", False):
+            # The truncated prefix is all a later early-stopping run needs; the
+            # marker makes full-page clients refetch it.
+            response.headers["Content-Type"] = "text/html; charset=utf-8"
+            if truncated:
+                response.headers[TRUNCATED_HEADER] = TRUNCATED_RULE
+            self.cache.store(url, response, body=markup.encode("utf-8"))
+        return ArticlePage(
+            url=url,
+            soup=make_soup(markup, self.html_parser),
+            metadata=extract_head_metadata(markup),
+        )
+
+    def download_image(
+        self,
+        url: str,
+        *,
+        max_bytes: int = MAX_IMAGE_BYTES,
+        check_dimensions: bool = True,
+    ) -> DownloadedImage:
+        response = self._request("GET", url, stream=True)
+        try:
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type and not content_type.startswith("image/") and content_type != "application/octet-stream":
+                raise ImageRejected(f"unexpected content type {content_type}")
+            declared = response.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > max_bytes:
+                raise ImageRejected(f"declared size {declared} bytes exceeds {max_bytes}")
+            downloaded = self._spool_image(response, url, content_type, max_bytes, check_dimensions)
+        finally:
+            response.close()
+
+        if self.cache is not None and not getattr(response, "from_cache", False):
+            if downloaded.size <= HTTP_CACHE_MAX_ENTRY_BYTES:
+                self.cache.store(url, response, body=downloaded.read_bytes())
+        return downloaded
+
+    def probe_image(self, url: str) -> ImageProbe:
+        if self.cache is not None and not self.refresh:
+            cached = self.cache.get(url)
+            if cached is not None and cached.status == 200:
+                return self._make_probe(url, url, cached.headers, len(cached.body), cached.body[:IMAGE_PROBE_BYTES])
+
+        response = self._request(
+            "GET",
+            url,
+            stream=True,
+            headers={"Range": f"bytes=0-{IMAGE_PROBE_BYTES - 1}"},
+        )
+        try:
+            head = bytearray()
+            for chunk in response.iter_content(8192):
+                head.extend(chunk)
+                header = sniff_image_header(bytes(head))
+                if len(head) >= IMAGE_PROBE_BYTES or (header is not None and header.width is not None):
+                    break
+            size: Optional[int] = None
+            content_range = response.headers.get("content-range", "")
+            if response.status_code == 206 and "/" in content_range:
+                total = content_range.rsplit("/", 1)[1].strip()
+                size = int(total) if total.isdigit() else None
+            else:
+                declared = response.headers.get("content-length", "")
+                size = int(declared) if declared.isdigit() else None
+            return self._make_probe(url, response.url or url, response.headers, size, bytes(head))
+        finally:
+            response.close()
+
+    @staticmethod
+    def _make_probe(url: str, resolved_url: str, headers, size: Optional[int], head: bytes) -> ImageProbe:
+        content_type = (headers.get("content-type") or "").split(";")[0].strip().lower()
+        etag = (headers.get("etag") or "").strip()
+        # Variants that differ only in URL but serve the same bytes share an identity.
+        if etag:
+            identity = "etag:" + etag.removeprefix("W/")
+        elif size is not None:
+            identity = f"bytes:{size}:{hashlib.sha1(head[:4096]).hexdigest()}"
+        else:
+            identity = "url:" + canonical_url(resolved_url)
+        return ImageProbe(
+            url=url,
+            resolved_url=resolved_url,
+            content_type=content_type,
+            size=size,
+            header=sniff_image_header(head),
+            identity=identity,
+        )
+
+    def _spool_image(
+        self,
+        response: requests.Response,
+        url: str,
+        content_type: str,
+        max_bytes: int,
+        check_dimensions: bool,
+    ) -> DownloadedImage:
+        digest = hashlib.sha256()
+        size = 0
+        head = bytearray()
+        header: Optional[ImageHeader] = None
+        sniffing = True
+        handle = tempfile.NamedTemporaryFile(prefix="pexedu-", suffix=".img", delete=False)
+        path = Path(handle.name)
+        try:
+            with handle:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ImageRejected(f"payload exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    handle.write(chunk)
+                    if not sniffing:
+                        continue
+                    head.extend(chunk)
+                    header = sniff_image_header(bytes(head))
+                    if header is None:
+                        if len(head) >= 32:
+                            raise ImageRejected("payload is not a recognised image format")
+                        continue
+                    if header.width is not None:
+                        sniffing = False
+                        if check_dimensions and header.is_undersized():
+                            raise ImageRejected(f"resolution {header.width}x{header.height} below threshold")
+                    elif len(head) >= IMAGE_SNIFF_LIMIT:
+                        sniffing = False
+            # NamedTemporaryFile creates 0600 files; once moved into the image
+            # directory they must be readable like any other asset.
+            path.chmod(0o666 & ~_UMASK)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return DownloadedImage(
+            url=url,
+            path=path,
+            sha256=digest.hexdigest(),
+            size=size,
+            content_type=content_type,
+            header=header,
+        )
+
+    def close(self) -> None:
+        self.resolutions.save()
+        if self.cassette is not None:
+            self.cassette.close()
+        if self.cache is not None:
+            self.cache.evict()
+            self.cache.close()
+        self.session.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        cache = self.cache if method.upper() == "GET" and "headers" not in kwargs else None
+        cached: Optional[CachedResponse] = None
+        if cache is not None and not self.refresh:
+            cached = cache.get(url)
+            if cached is not None:
+                if cached.is_fresh(cache.fresh_for):
+                    return cached.to_response()
+                kwargs["headers"] = cached.conditional_headers()
+
+        response = self._fetch(method, url, **kwargs)
+        if cached is not None and response.status_code == 304:
+            cache.mark_revalidated(url)
+            return cached.to_response()
+        # Streamed bodies are stored by the caller once they have been consumed.
+        if cache is not None and response.status_code == 200 and not kwargs.get("stream"):
+            cache.store(url, response)
+        return response
+
+    def _fetch(self, method: str, url: str, **kwargs) -> requests.Response:
+        policy = self.retry_policy
+        host = urlparse(url).netloc.lower()
+        key = canonical_url(url)
+        dead_status = self._dead_urls.get(key)
+        if dead_status is not None:
+            raise requests.HTTPError(f"{dead_status} Client Error (cached) for url: {url}")
+
+        for attempt in range(1, policy.max_attempts + 1):
+            self.circuit_breaker.check(host)
+            try:
+                response = self._send(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                self.circuit_breaker.record_failure(host)
+                if attempt == policy.max_attempts:
+                    raise
+                delay = policy.backoff(attempt)
+                logger.debug("Retrying %s in %.1fs after %s", url, delay, exc)
+                time.sleep(delay)
+                continue
+
+            status = response.status_code
+            if status < 400:
+                self.circuit_breaker.record_success(host)
+                return response
+            if not policy.should_retry(status):
+                # The host answered; only this resource is unavailable.
+                self.circuit_breaker.record_success(host)
+                if status in DEAD_STATUSES:
+                    self._dead_urls[key] = status
+                response.raise_for_status()
+
+            self.circuit_breaker.record_failure(host)
+            if attempt == policy.max_attempts:
+                response.raise_for_status()
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            delay = policy.backoff(attempt, retry_after)
+            response.close()
+            if retry_after is not None:
+                # Server-requested backoff applies to every worker talking to the host.
+                self.rate_limiter.defer(url, delay)
+            logger.debug("Retrying %s in %.1fs after HTTP %d", url, delay, status)
+            time.sleep(delay)
+        raise RuntimeError(f"Failed to fetch {url}")
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        cassette = self.cassette
+        if cassette is not None and cassette.mode == "replay":
+            return cassette.replay(Cassette.key(method, url, kwargs.get("headers")))
+        self.rate_limiter.acquire(url)
+        started = time.perf_counter()
+        response = self.session.request(method, url, timeout=TIMEOUT, **kwargs)
+        if cassette is not None:
+            # Recording always captures the full body so replays are complete.
+            response.content
+            cassette.record(
+                Cassette.key(method, url, kwargs.get("headers")),
+                response,
+                time.perf_counter() - started,
+            )
+        return response
+
+
+def slugify_scientific_name(scientific_name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", scientific_name.lower()).strip("_")
+
+
+def extract_sentences(soup: BeautifulSoup) -> list[str]:
+    article_sections = soup.select("section.m-article__body-content p")
+    if not article_sections:
+        article_sections = soup.select("article p")
+
+    sentences: list[str] = []
+    for paragraph in article_sections:
+        text = paragraph.get_text(" ", strip=True)
+        if not text:
+            continue
+        for sentence in TEXT_SENTENCE_SPLIT.split(text):
+            cleaned = sentence.strip()
+            if cleaned:
+                sentences.append(cleaned)
+    return sentences
+
+
+def pick_sentence(sentences: Iterable[str], keywords: Iterable[str], used: set[str]) -> Optional[str]:
+    for sentence in sentences:
+        lower = sentence.lower()
+        if sentence in used:
+            continue
+        if any(keyword in lower for keyword in keywords):
+            used.add(sentence)
+            return sentence
+    return None
+
+
+def fallback_sentence(sentences: Iterable[str], used: set[str]) -> str:
+    sentinel = None
+    for sentence in sentences:
+        if sentinel is None:
+            sentinel = sentence
+        if sentence not in used:
+            used.add(sentence)
+            return sentence
+    if sentinel is not None:
+        return sentinel
+    raise RuntimeError("Could not locate any descriptive sentence")
+
+
+# Record field -> keywords that mark a sentence as a candidate for it.
+SENTENCE_FIELD_KEYWORDS = {
+    "size": SIZE_KEYWORDS,
+    "lifeExpectancy": LIFE_KEYWORDS,
+    "habitat": HABITAT_KEYWORDS,
+    "funFact": FUN_FACT_KEYWORDS,
+}
+SENTENCE_FIELD_MATCHER = KeywordMatcher(
+    keyword for keywords in SENTENCE_FIELD_KEYWORDS.values() for keyword in keywords
+)
+_NUMBER_PATTERN = re.compile(r"\d")
+
+
+# Inverted index built in one pass over the article: every informative
+# sentence is matched once against all field keywords and filed under each
+# field it mentions, ranked by keyword hits, then numbers, then position.
+class SentenceIndex:
+    def __init__(self, sentences: Iterable[str]) -> None:
+        self.sentences: list[str] = []
+        ranked: dict[str, list[tuple[int, int, str]]] = {field: [] for field in SENTENCE_FIELD_KEYWORDS}
+        for sentence in sentences:
+            if not sentence_is_informative(sentence):
+                continue
+            position = len(self.sentences)
+            self.sentences.append(sentence)
+            hits = SENTENCE_FIELD_MATCHER.find_all(sentence.lower())
+            if not hits:
+                continue
+            has_number = 1 if _NUMBER_PATTERN.search(sentence) else 0
+            for field_name, keywords in SENTENCE_FIELD_KEYWORDS.items():
+                matched = sum(1 for keyword in hits if keyword in keywords)
+                if matched:
+                    ranked[field_name].append((-(matched * 2 + has_number), position, sentence))
+        self._ranked = {field: [sentence for *_, sentence in sorted(entries)] for field, entries in ranked.items()}
+
+    def best(self, field_name: str, used: set[str]) -> Optional[str]:
+        for sentence in self._ranked.get(field_name, ()):
+            if sentence not in used:
+                used.add(sentence)
+                return sentence
+        return None
+
+    def fallback(self, used: set[str]) -> Optional[str]:
+        for sentence in self.sentences:
+            if sentence not in used:
+                used.add(sentence)
+                return sentence
+        return None
+
+
+def fill_missing_fields(
+    seed: AnimalSeed,
+    article_soup: BeautifulSoup,
+    *,
+    summary: str = "",
+    debug: bool = False,
+) -> dict[str, str]:
+    fields = {
+        "size": seed.size or "",
+        "lifeExpectancy": seed.life_expectancy or "",
+        "habitat": seed.habitat or "",
+        "funFact": seed.fun_fact or "",
+    }
+    missing = [field_name for field_name, value in fields.items() if not value]
+    if not missing:
+        return fields
+
+    sentences = extract_sentences(article_soup)
+    if summary:
+        # The metadata summary ranks after the article's own sentences.
+        sentences.extend(sentence.strip() for sentence in TEXT_SENTENCE_SPLIT.split(summary) if sentence.strip())
+    index = SentenceIndex(sentences)
+    used = {value for value in fields.values() if value}
+    for field_name in missing:
+        sentence = index.best(field_name, used)
+        if sentence is None and field_name == "funFact":
+            sentence = index.fallback(used)
+        if sentence:
+            fields[field_name] = sentence
+            if debug:
+                logger.info("Filled %s for %s from article text", field_name, seed.scientific_name)
+    return fields
+
+
+def derive_image_filename(url: str, animal_id: str) -> str:
+    parsed = urlparse(url)
+    basename = os.path.basename(parsed.path)
+    _, _, ext = basename.rpartition('.')
+    ext = ext.lower() if ext else 'jpg'
+    return f"{animal_id}.{ext}"
+
+
+def rank_image_candidates(
+    client: BritannicaClient,
+    candidates: list[ImageCandidate],
+    *,
+    probe_limit: int = IMAGE_PROBE_CANDIDATES,
+    debug: bool = False,
+) -> list[tuple[ImageCandidate, str]]:
+    # Probe the most promising candidates with small ranged requests and order
+    # them by what the server actually holds. Variants that were not probed,
+    # or whose probe failed or was inconclusive, follow in page order.
+    probed: list[tuple[int, ImageCandidate, str]] = []
+    unranked: list[tuple[ImageCandidate, str]] = []
+    seen_identities: set[str] = set()
+    large = 0
+    for position, candidate in enumerate(candidates):
+        for candidate_url in candidate.urls:
+            if position >= probe_limit or large >= IMAGE_PROBE_ENOUGH:
+                unranked.append((candidate, candidate_url))
+                continue
+            try:
+                probe = client.probe_image(candidate_url)
+            except Exception:
+                probe = None
+            if probe is None or (probe.header is None and probe.plausible):
+                if debug:
+                    logger.info("Probe inconclusive for %s; keeping page order", candidate_url)
+                unranked.append((candidate, candidate_url))
+                continue
+            if not probe.usable:
+                if debug:
+                    logger.info("Probe rejected %s (%s, %s)", candidate_url, probe.content_type, probe.header)
+                continue
+            if probe.identity in seen_identities:
+                if debug:
+                    logger.info("Skipping %s: same resource as an earlier variant", candidate_url)
+                continue
+            seen_identities.add(probe.identity)
+            probed.append((probe.rank(candidate), candidate, candidate_url))
+            if probe.clearly_large:
+                large += 1
+
+    probed.sort(key=lambda item: item[0], reverse=True)
+    return [(candidate, candidate_url) for _, candidate, candidate_url in probed] + unranked
+
+
+def _validate_claimed(
+    image_validator: Optional[ImageValidator],
+    used_hashes: Optional[ImageHashRegistry],
+    candidate_hash: str,
+    image_bytes: Union[bytes, Path],
+    **context: str,
+) -> bool:
+    # The hash is already claimed; give it back unless the image is accepted.
+    accepted = False
+    try:
+        accepted = image_validator is None or image_validator.accepts(image_bytes, **context)
+    finally:
+        if not accepted and used_hashes is not None:
+            used_hashes.release(candidate_hash)
+    return accepted
+
+
+# Executors shared by every seed's image search: downloads run up to
+# ``lookahead`` candidates ahead of the one being validated, and validation
+# runs on its own bounded pool so inference never starves the network.
+@dataclass
+class ImageSearchPools:
+    downloads: ThreadPoolExecutor
+    validations: ThreadPoolExecutor
+    lookahead: int = 1
+
+    def shutdown(self) -> None:
+        self.downloads.shutdown(wait=True)
+        self.validations.shutdown(wait=True)
+
+
+def _download_candidate(client: BritannicaClient, candidate_url: str, debug: bool) -> Optional[DownloadedImage]:
+    try:
+        return client.download_image(candidate_url)
+    except ImageRejected as exc:
+        if debug:
+            logger.info("Rejected %s while downloading: %s", candidate_url, exc)
+    except Exception:
+        if debug:
+            logger.info("Download failed for %s", candidate_url)
+    return None
 
 
-def slugify_scientific_name(scientific_name: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "_", scientific_name.lower()).strip("_")
+def _accept_downloaded(
+    downloaded: DownloadedImage,
+    seed: AnimalSeed,
+    *,
+    alt_text: str,
+    image_validator: Optional[ImageValidator],
+    used_hashes: Optional[ImageHashRegistry],
+    debug: bool,
+    pools: Optional[ImageSearchPools] = None,
+) -> bool:
+    if used_hashes is not None and not used_hashes.claim(downloaded.sha256):
+        if debug:
+            logger.info("Skipping duplicate image for %s", downloaded.url)
+        downloaded.discard()
+        return False
+    if used_hashes is not None:
+        # Re-encoded or resized copies of an image another animal already
+        # uses are skipped before any model runs.
+        phash = downloaded.phash = perceptual_hash(downloaded.path)
+        if phash is not None:
+            owner = used_hashes.claim_similar(downloaded.sha256, phash, slugify_scientific_name(seed.scientific_name))
+            if owner is not None:
+                if debug:
+                    logger.info("Skipping near-duplicate of %s's image for %s", owner, downloaded.url)
+                used_hashes.release(downloaded.sha256)
+                downloaded.discard()
+                return False
 
+    validate = partial(
+        _validate_claimed,
+        image_validator,
+        used_hashes,
+        downloaded.sha256,
+        downloaded.path,
+        alt_text=alt_text,
+        scientific_name=seed.scientific_name,
+        common_name=seed.common_name,
+        source_url=downloaded.url,
+        content_hash=downloaded.sha256,
+    )
+    try:
+        accepted = validate() if pools is None else pools.validations.submit(validate).result()
+    except BaseException:
+        downloaded.discard()
+        raise
+    if not accepted:
+        downloaded.discard()
+    return accepted
 
-def extract_sentences(soup: BeautifulSoup) -> list[str]:
-    article_sections = soup.select("section.m-article__body-content p")
-    if not article_sections:
-        article_sections = soup.select("article p")
 
-    sentences: list[str] = []
-    for paragraph in article_sections:
-        text = paragraph.get_text(" ", strip=True)
-        if not text:
-            continue
-        for sentence in TEXT_SENTENCE_SPLIT.split(text):
-            cleaned = sentence.strip()
-            if cleaned:
-                sentences.append(cleaned)
-    return sentences
+def _discard_when_done(future: Future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    downloaded = future.result()
+    if downloaded is not None:
+        downloaded.discard()
 
 
-def pick_sentence(sentences: Iterable[str], keywords: Iterable[str], used: set[str]) -> Optional[str]:
-    for sentence in sentences:
-        lower = sentence.lower()
-        if sentence in used:
-            continue
-        if any(keyword in lower for keyword in keywords):
-            used.add(sentence)
-            return sentence
-    return None
+def _first_accepted_image(
+    client: BritannicaClient,
+    ranked: Iterable[tuple[ImageCandidate, str]],
+    seed: AnimalSeed,
+    attempted_urls: set[str],
+    *,
+    image_validator: Optional[ImageValidator],
+    used_hashes: Optional[ImageHashRegistry],
+    debug: bool,
+    pools: Optional[ImageSearchPools] = None,
+) -> Optional[DownloadedImage]:
+    # Candidates are still claimed and validated strictly in rank order; with
+    # pools the next downloads are already in flight meanwhile.
+    remaining = iter(ranked)
+    window: deque[tuple[ImageCandidate, Future]] = deque()
 
+    def start_next() -> None:
+        for candidate, candidate_url in remaining:
+            if candidate_url in attempted_urls:
+                continue
+            attempted_urls.add(candidate_url)
+            if debug:
+                logger.info(
+                    "Downloading candidate image %s (alt=%r) for %s",
+                    candidate_url,
+                    candidate.alt_text,
+                    seed.scientific_name,
+                )
+            if pools is None:
+                future: Future = Future()
+                future.set_result(_download_candidate(client, candidate_url, debug))
+            else:
+                future = pools.downloads.submit(_download_candidate, client, candidate_url, debug)
+            window.append((candidate, future))
+            return
 
-def fallback_sentence(sentences: Iterable[str], used: set[str]) -> str:
-    sentinel = None
-    for sentence in sentences:
-        if sentinel is None:
-            sentinel = sentence
-        if sentence not in used:
-            used.add(sentence)
-            return sentence
-    if sentinel is not None:
-        return sentinel
-    raise RuntimeError("Could not locate any descriptive sentence")
-def derive_image_filename(url: str, animal_id: str) -> str:
-    parsed = urlparse(url)
-    basename = os.path.basename(parsed.path)
-    _, _, ext = basename.rpartition('.')
-    ext = ext.lower() if ext else 'jpg'
-    return f"{animal_id}.{ext}"
+    try:
+        for _ in range(1 + (pools.lookahead if pools is not None else 0)):
+            start_next()
+        while window:
+            candidate, future = window.popleft()
+            start_next()
+            downloaded = future.result()
+            if downloaded is None:
+                continue
+            if _accept_downloaded(
+                downloaded,
+                seed,
+                alt_text=candidate.alt_text,
+                image_validator=image_validator,
+                used_hashes=used_hashes,
+                debug=debug,
+                pools=pools,
+            ):
+                return downloaded
+        return None
+    finally:
+        # Prefetched candidates behind the accepted one are not needed.
+        for _, future in window:
+            if not future.cancel():
+                future.add_done_callback(_discard_when_done)
 
 
-def build_record(
+def _store_image(
+    downloaded: DownloadedImage,
     seed: AnimalSeed,
-    client: BritannicaClient,
     image_dir: Path,
     *,
-    skip_images: bool,
-    image_validator: Optional[ImageValidator] = None,
-    debug: bool = False,
-    used_hashes: Optional[set[str]] = None,
-) -> AnimalRecord:
+    overwrite: bool,
+    used_hashes: Optional[ImageHashRegistry],
+    manifest: Optional[ImageManifest] = None,
+    blob_store: Optional[BlobStore] = None,
+) -> str:
+    owner = slugify_scientific_name(seed.scientific_name)
+    filename = derive_image_filename(downloaded.url, owner)
+    target_path = image_dir / filename
+    if overwrite or not target_path.exists():
+        if blob_store is not None:
+            blob_store.put(downloaded.path, downloaded.sha256)
+            blob_store.link(downloaded.sha256, target_path)
+        else:
+            downloaded.save_to(target_path)
+        if manifest is not None:
+            manifest.record(target_path, sha256=downloaded.sha256, phash=downloaded.phash, owner=owner)
+    else:
+        downloaded.discard()
+    if used_hashes is not None:
+        used_hashes.add(downloaded.sha256, owner=owner)
+    return f"/assets/animals/{filename}"
+
+
+def fetch_seed_article(client: BritannicaClient, seed: AnimalSeed) -> ArticlePage:
     try:
         article_url = client.fetch_article_url(seed.scientific_name)
     except RuntimeError:
         article_url = client.fetch_article_url(seed.common_name)
-    article_soup = client.fetch_article(article_url)
+    return client.fetch_article_page(article_url)
 
-    size_sentence = seed.size or ""
-    life_sentence = seed.life_expectancy or ""
-    habitat_sentence = seed.habitat or ""
-    fun_sentence = seed.fun_fact or ""
 
-    image_path = "/assets/placeholder.svg"
-    if not skip_images:
-        direct_urls: list[str] = []
-        if seed.image_url:
-            direct_urls = sanitize_image_variants(seed.image_url)
-        if direct_urls:
+def find_seed_image(
+    seed: AnimalSeed,
+    client: BritannicaClient,
+    *,
+    image_validator: Optional[ImageValidator] = None,
+    debug: bool = False,
+    used_hashes: Optional[ImageHashRegistry] = None,
+    pools: Optional[ImageSearchPools] = None,
+    article: Optional[ArticlePage] = None,
+    article_candidates: Optional[list[ImageCandidate]] = None,
+) -> tuple[Optional[DownloadedImage], bool]:
+    # Returns the accepted download and whether it may overwrite an existing file.
+    # ``article`` is the seed's already parsed article, reused instead of
+    # fetching and parsing that page a second time; ``article_candidates``
+    # are the image candidates already collected from it.
+    search = partial(
+        _first_accepted_image,
+        client,
+        seed=seed,
+        image_validator=image_validator,
+        used_hashes=used_hashes,
+        debug=debug,
+        pools=pools,
+    )
+    direct_urls: list[str] = []
+    if seed.image_url:
+        direct_urls = sanitize_image_variants(seed.image_url)
+    if direct_urls:
+        if debug:
+            logger.info("Trying direct image URL(s) for %s", seed.scientific_name)
+        direct_candidate = ImageCandidate(
+            urls=direct_urls, alt_text=seed.common_name, width=None, height=None, score=0
+        )
+        downloaded = search([(direct_candidate, url) for url in direct_urls], attempted_urls=set())
+        if downloaded is not None:
             if debug:
-                logger.info("Trying direct image URL(s) for %s", seed.scientific_name)
-            for candidate_url in direct_urls:
-                try:
-                    image_bytes = client.download_image(candidate_url)
-                except Exception:
-                    if debug:
-                        logger.info("Direct download failed for %s", candidate_url)
-                    continue
-                candidate_hash = hashlib.sha256(image_bytes).hexdigest()
-                if used_hashes is not None and candidate_hash in used_hashes:
-                    if debug:
-                        logger.info("Direct image duplicate for %s", candidate_url)
-                    continue
-                if image_validator and not image_validator.accepts(
-                    image_bytes,
-                    alt_text=seed.common_name,
-                    scientific_name=seed.scientific_name,
-                    common_name=seed.common_name,
-                    source_url=candidate_url,
-                ):
-                    continue
-                filename = derive_image_filename(candidate_url, slugify_scientific_name(seed.scientific_name))
-                target_path = image_dir / filename
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                target_path.write_bytes(image_bytes)
-                if used_hashes is not None:
-                    used_hashes.add(candidate_hash)
-                image_path = f"/assets/animals/{filename}"
-                if debug:
-                    logger.info("Selected direct image %s for %s", candidate_url, seed.scientific_name)
-                break
-            if not image_path.endswith('placeholder.svg'):
-                return AnimalRecord(
-                    id=slugify_scientific_name(seed.scientific_name),
-                    group=seed.group,
-                    commonName=seed.common_name,
-                    scientificName=seed.scientific_name,
-                    size=size_sentence,
-                    lifeExpectancy=life_sentence,
-                    habitat=habitat_sentence,
-                    funFact=fun_sentence,
-                    image=image_path,
+                logger.info("Selected direct image %s for %s", downloaded.url, seed.scientific_name)
+            return downloaded, True
+
+    seen_terms: set[str] = set()
+    # Names of one animal often resolve to the same article; its candidates
+    # were all tried the first time.
+    searched_pages: set[str] = set()
+    for term in [seed.scientific_name, seed.common_name, *seed.image_search_terms]:
+        if not term:
+            continue
+        normalized = term.strip().lower()
+        if not normalized or normalized in seen_terms:
+            continue
+        seen_terms.add(normalized)
+        try:
+            article_url = client.fetch_article_url(term)
+        except RuntimeError:
+            continue
+        if canonical_url(article_url) in searched_pages:
+            continue
+        searched_pages.add(canonical_url(article_url))
+        known_candidates: Optional[list[ImageCandidate]] = None
+        if article is not None and canonical_url(article_url) == canonical_url(article.url):
+            page = article
+            known_candidates = article_candidates
+        else:
+            page = client.fetch_article_page(article_url)
+        attempted_urls: set[str] = set()
+        downloaded: Optional[DownloadedImage] = None
+
+        # Fast path: the lead image the page advertises in its metadata.
+        metadata_candidates = page.metadata.image_candidates(article_url)
+        if metadata_candidates:
+            if debug:
+                logger.info(
+                    "Trying %d metadata image(s) for %s using term %s",
+                    len(metadata_candidates),
+                    seed.scientific_name,
+                    term,
                 )
+            downloaded = search(
+                [(candidate, url) for candidate in metadata_candidates for url in candidate.urls],
+                attempted_urls=attempted_urls,
+            )
 
-        search_terms: list[str] = []
-        seen_terms: set[str] = set()
-        for term in [seed.scientific_name, seed.common_name, *seed.image_search_terms]:
-            if not term:
-                continue
-            normalized = term.strip().lower()
-            if not normalized or normalized in seen_terms:
-                continue
-            seen_terms.add(normalized)
-            try:
-                article_url = client.fetch_article_url(term)
-            except RuntimeError:
-                continue
-            article_soup = client.fetch_article(article_url)
-            candidates = collect_image_candidates(article_soup, article_url)
+        if downloaded is None:
+            candidates = (
+                known_candidates if known_candidates is not None else collect_image_candidates(page.soup, article_url)
+            )
             if debug:
                 logger.info(
                     "Found %d image candidates for %s using term %s",
@@ -1028,85 +4037,239 @@ def build_record(
                     seed.scientific_name,
                     term,
                 )
-            if not candidates:
-                continue
-
-            attempted_urls: set[str] = set()
-            for candidate in candidates:
-                chosen_url: Optional[str] = None
-                chosen_hash: Optional[str] = None
-                image_bytes: Optional[bytes] = None
-                for candidate_url in candidate.urls:
-                    if candidate_url in attempted_urls:
-                        continue
-                    attempted_urls.add(candidate_url)
-                    if debug:
-                        logger.info(
-                            "Downloading candidate image %s (alt=%r) for %s",
-                            candidate_url,
-                            candidate.alt_text,
-                            seed.scientific_name,
-                        )
-                    try:
-                        image_bytes = client.download_image(candidate_url)
-                    except Exception:
-                        if debug:
-                            logger.info("Download failed for %s", candidate_url)
-                        image_bytes = None
-                        continue
-
-                    candidate_hash = hashlib.sha256(image_bytes).hexdigest()
-                    if used_hashes is not None and candidate_hash in used_hashes:
-                        if debug:
-                            logger.info("Skipping duplicate image for %s", candidate_url)
-                        image_bytes = None
-                        continue
-
-                    if image_validator and not image_validator.accepts(
-                        image_bytes,
-                        alt_text=candidate.alt_text,
-                        scientific_name=seed.scientific_name,
-                        common_name=seed.common_name,
-                        source_url=candidate_url,
-                    ):
-                        image_bytes = None
-                        continue
+            if candidates:
+                downloaded = search(
+                    rank_image_candidates(client, candidates, debug=debug),
+                    attempted_urls=attempted_urls,
+                )
 
-                    chosen_url = candidate_url
-                    chosen_hash = candidate_hash
-                    break
+        if downloaded is not None:
+            if debug:
+                logger.info("Selected image %s for %s", downloaded.url, seed.scientific_name)
+            return downloaded, client.refresh
 
-                if chosen_url and image_bytes:
-                    filename = derive_image_filename(chosen_url, slugify_scientific_name(seed.scientific_name))
-                    target_path = image_dir / filename
-                    if client.refresh or not target_path.exists():
-                        target_path.parent.mkdir(parents=True, exist_ok=True)
-                        target_path.write_bytes(image_bytes)
-                    if used_hashes is not None and chosen_hash is not None:
-                        used_hashes.add(chosen_hash)
-                    image_path = f"/assets/animals/{filename}"
-                    if debug:
-                        logger.info("Selected image %s for %s", chosen_url, seed.scientific_name)
-                    break
-            if not image_path.endswith('placeholder.svg'):
-                break
+    if debug:
+        logger.info("No acceptable image found for %s", seed.scientific_name)
+    return None, False
 
-        if image_path.endswith('placeholder.svg') and debug:
-            logger.info("No acceptable image found for %s", seed.scientific_name)
 
+def make_record(seed: AnimalSeed, fields: dict[str, str], image_path: str) -> AnimalRecord:
     return AnimalRecord(
         id=slugify_scientific_name(seed.scientific_name),
         group=seed.group,
         commonName=seed.common_name,
         scientificName=seed.scientific_name,
-        size=size_sentence,
-        lifeExpectancy=life_sentence,
-        habitat=habitat_sentence,
-        funFact=fun_sentence,
+        size=fields["size"],
+        lifeExpectancy=fields["lifeExpectancy"],
+        habitat=fields["habitat"],
+        funFact=fields["funFact"],
         image=image_path,
     )
 
 
+@dataclass
+class StageConfig:
+    fetch_workers: int = 1
+    extract_workers: int = 1
+    image_workers: int = 1
+    download_workers: int = 2
+    validate_workers: int = 1
+    # Capacity of each queue between stages; a full queue stalls the stage
+    # feeding it.
+    queue_size: int = 8
+    download_ahead: int = 1
+
+    @classmethod
+    def from_workers(cls, workers: int) -> "StageConfig":
+        workers = max(1, workers)
+        return cls(
+            fetch_workers=workers,
+            image_workers=workers,
+            download_workers=max(2, workers),
+            validate_workers=workers,
+            queue_size=max(8, workers * 2),
+        )
+
+
+@dataclass
+class SeedWork:
+    index: int
+    seed: AnimalSeed
+    page: Optional[ArticlePage] = None
+    fields: dict[str, str] = field(default_factory=dict)
+    image_candidates: Optional[list[ImageCandidate]] = None
+    downloaded: Optional[DownloadedImage] = None
+    overwrite: bool = False
+
+
+_STAGE_END = object()
+
+
+# A pool of threads draining one bounded queue into the next. Work that raises
+# is reported through ``on_error`` and goes no further.
+class PipelineStage:
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[SeedWork], None],
+        *,
+        workers: int,
+        inbox: queue.Queue,
+        outbox: Optional[queue.Queue],
+        on_error: Callable[[SeedWork, Exception], None],
+        timings: Optional[RunTimings] = None,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self.on_error = on_error
+        self.timings = timings
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{name}-{index}", daemon=True)
+            for index in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            work = self.inbox.get()
+            if work is _STAGE_END:
+                return
+            started = time.perf_counter()
+            try:
+                self.handler(work)
+            except Exception as exc:  # noqa: BLE001 - reported once the run finishes
+                self.on_error(work, exc)
+                continue
+            finally:
+                if self.timings is not None:
+                    self.timings.add(f"stage {self.name}", time.perf_counter() - started)
+            if self.outbox is not None:
+                self.outbox.put(work)
+
+    def close(self) -> None:
+        # Call once everything upstream has been queued.
+        for _ in self._threads:
+            self.inbox.put(_STAGE_END)
+        for thread in self._threads:
+            thread.join()
+
+
+def benchmark_html_parsers(cassette: Cassette, *, repeat: int = 3) -> dict[str, float]:
+    pages = [(url, body.decode("utf-8", errors="replace")) for url, body in cassette.iter_bodies("text/html")]
+    if not pages:
+        raise RuntimeError(f"Cassette {cassette.directory} contains no HTML pages")
+
+    results: dict[str, float] = {}
+    for backend in HTML_PARSER_BACKENDS:
+        if resolve_html_parser(backend) != backend:
+            print(f"{backend:>12}: unavailable")
+            continue
+        parse_time = 0.0
+        query_time = 0.0
+        for _ in range(repeat):
+            for url, markup in pages:
+                started = time.perf_counter()
+                soup = make_soup(markup, backend)
+                parsed = time.perf_counter()
+                if "/search" in url:
+                    score_search_results(soup, "")
+                else:
+                    collect_image_candidates(soup, url)
+                    extract_sentences(soup)
+                parse_time += parsed - started
+                query_time += time.perf_counter() - parsed
+        elapsed = (parse_time + query_time) / repeat
+        results[backend] = elapsed
+        print(
+            f"{backend:>12}: {elapsed * 1000:8.1f} ms for {len(pages)} pages "
+            f"(parse {parse_time / repeat * 1000:.1f} ms, queries {query_time / repeat * 1000:.1f} ms)"
+        )
+    if "lxml" in results and "html.parser" in results and results["lxml"] > 0:
+        print(f"{'speedup':>12}: {results['html.parser'] / results['lxml']:.2f}x")
+    return results
+
+
+def _benchmark_backend(name: str, onnx_dir: Path, quantized: bool, image_paths: list[Path]) -> dict:
+    # Runs in a fresh process so load time and peak RSS belong to this backend.
+    import resource
+
+    import numpy as np  # type: ignore
+    from PIL import Image  # type: ignore
+
+    backend = make_inference_backend(name, onnx_dir=onnx_dir, quantized=quantized)
+    started = time.perf_counter()
+    if not backend.load_clip() or not backend.load_vision():
+        return {"available": False}
+    load_time = time.perf_counter() - started
+
+    clip_time = vision_time = 0.0
+    probabilities: list[list[float]] = []
+    labels: list[list[str]] = []
+    for path in image_paths:
+        with Image.open(path) as opened:
+            image = opened.convert("RGB")
+        tensors = ImageTensors(image, np)
+        clip_input, vision_input = tensors.clip_input()[None], tensors.vision_input()
+        tensors.close()
+        image.close()
+        started = time.perf_counter()
+        probabilities.extend(backend.clip_probabilities(clip_input))
+        clip_time += time.perf_counter() - started
+        started = time.perf_counter()
+        labels.append([label for label, _ in backend.vision_top_labels(vision_input)])
+        vision_time += time.perf_counter() - started
+    count = max(1, len(image_paths))
+    return {
+        "available": True,
+        "load_s": load_time,
+        "clip_ms": clip_time / count * 1000,
+        "vision_ms": vision_time / count * 1000,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "probabilities": probabilities,
+        "labels": labels,
+    }
+
+
+def benchmark_inference_backends(image_paths: list[Path], onnx_dir: Path) -> dict[str, dict]:
+    if not image_paths:
+        raise RuntimeError("No images to benchmark; point --image-dir at downloaded assets")
+    from concurrent.futures import ProcessPoolExecutor
+
+    results: dict[str, dict] = {}
+    for label, name, quantized in (("torch", "torch", False), ("onnx", "onnx", False), ("onnx-int8", "onnx", True)):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(_benchmark_backend, name, onnx_dir, quantized, image_paths).result()
+        if not result["available"]:
+            print(f"{label:>10}: unavailable")
+            continue
+        results[label] = result
+
+    reference = results.get("torch")
+    for label, result in results.items():
+        line = (
+            f"{label:>10}: load {result['load_s']:6.2f} s, clip {result['clip_ms']:7.1f} ms/img, "
+            f"resnet {result['vision_ms']:7.1f} ms/img, peak RSS {result['peak_rss_mb']:7.0f} MB"
+        )
+        if reference is not None and label != "torch":
+            drift = max(
+                abs(ours - theirs)
+                for row, reference_row in zip(result["probabilities"], reference["probabilities"])
+                for ours, theirs in zip(row, reference_row)
+            )
+            top1 = sum(
+                ours[:1] == theirs[:1] for ours, theirs in zip(result["labels"], reference["labels"])
+            ) / len(image_paths)
+            status = "ok" if drift <= INFERENCE_TOLERANCE else f"exceeds {INFERENCE_TOLERANCE}"
+            result["clip_drift"] = drift
+            result["top1_agreement"] = top1
+            line += f", clip drift {drift:.4f} ({status}), resnet top-1 agreement {top1:.0%}"
+        print(line)
+    return results
+
+
 def load_seeds(path: Path) -> list[AnimalSeed]:
     raw_entries = json.loads(path.read_text(encoding="utf-8"))
     seeds: list[AnimalSeed] = []
@@ -1140,43 +4303,184 @@ def run(
     image_dir: Path,
     *,
     debug_image_selection: bool = False,
+    workers: int = 1,
+    rate_limit: float = DEFAULT_HOST_RATE,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_retries: int = MAX_RETRIES,
+    cassette: Optional[Cassette] = None,
+    html_parser: Optional[str] = None,
+    clip_batch_size: int = CLIP_MAX_BATCH_SIZE,
+    inference_backend: str = "torch",
+    onnx_dir: Path = DEFAULT_ONNX_DIR,
+    onnx_int8: bool = False,
+    stage_config: Optional[StageConfig] = None,
+    low_memory_validation: bool = False,
+    blob_store: Optional[BlobStore] = None,
 ) -> None:
     seeds = load_seeds(Path("data/animals_source.json"))
     if limit is not None:
         seeds = seeds[:limit]
 
-    client = BritannicaClient(refresh=refresh)
-    image_validator = None if skip_images else ImageValidator(debug=debug_image_selection, log=logger)
-    used_hashes: Optional[set[str]] = None
+    stages = stage_config or StageConfig.from_workers(workers)
+    timings = RunTimings()
+    if cassette is not None:
+        # Cache hits would never reach the cassette, and replays must not
+        # depend on (or pollute) the live cache.
+        cache_dir = None
+    client = BritannicaClient(
+        refresh=refresh,
+        rate_limiter=HostRateLimiter(rate_limit),
+        pool_size=max(10, (stages.fetch_workers + stages.image_workers + stages.download_workers) * 2),
+        cache=HttpCache(cache_dir) if cache_dir is not None else None,
+        resolutions=ResolutionIndex(cache_dir / "resolutions.json") if cache_dir is not None else None,
+        retry_policy=RetryPolicy(max_attempts=max(1, max_retries)),
+        cassette=cassette,
+        html_parser=html_parser,
+    )
+    image_validator = None
+    verdict_cache: Optional[VerdictCache] = None
+    pools: Optional[ImageSearchPools] = None
     if not skip_images:
-        used_hashes = set()
-        if image_dir.exists() and not refresh:
-            for existing in image_dir.glob("*"):
-                try:
-                    used_hashes.add(hashlib.sha256(existing.read_bytes()).hexdigest())
-                except Exception:
-                    continue
-    records: list[AnimalRecord] = []
-    failures: list[tuple[AnimalSeed, Exception]] = []
-    for seed in seeds:
-        try:
-            record = build_record(
-                seed,
-                client,
+        if cache_dir is not None:
+            verdict_cache = VerdictCache(cache_dir)
+        image_validator = ImageValidator(
+            debug=debug_image_selection,
+            log=logger,
+            max_batch_size=clip_batch_size,
+            batch_concurrent=stages.validate_workers > 1,
+            cache_dir=cache_dir,
+            verdict_cache=verdict_cache,
+            backend=make_inference_backend(
+                inference_backend, onnx_dir=onnx_dir, quantized=onnx_int8, cache_dir=cache_dir
+            ),
+            timings=timings,
+            working_size=VALIDATION_WORKING_SIZE if low_memory_validation else None,
+        )
+        # Model loading overlaps with the first seeds' network fetches.
+        image_validator.warm_up()
+        pools = ImageSearchPools(
+            downloads=ThreadPoolExecutor(max(1, stages.download_workers), thread_name_prefix="download"),
+            validations=ThreadPoolExecutor(max(1, stages.validate_workers), thread_name_prefix="validate"),
+            lookahead=max(0, stages.download_ahead),
+        )
+    used_hashes: Optional[ImageHashRegistry] = None
+    manifest: Optional[ImageManifest] = None
+    if not skip_images:
+        used_hashes = ImageHashRegistry()
+        # Without a cache directory the manifest lives in memory for this run.
+        manifest = ImageManifest(cache_dir / "images.sqlite3" if cache_dir is not None else None)
+        if not refresh:
+            with timings.measure("image manifest"):
+                entries = manifest.scan(image_dir)
+                for entry in entries:
+                    used_hashes.add(entry.sha256, entry.phash, entry.owner)
+            if blob_store is not None and image_dir.is_dir():
+                with timings.measure("blob store"):
+                    blob_store.adopt(image_dir, hashes={entry.path.name: entry.sha256 for entry in entries})
+        elif blob_store is not None:
+            blob_store.register_view(image_dir)
+
+    def fetch(work: SeedWork) -> None:
+        work.page = fetch_seed_article(client, work.seed)
+
+    def extract(work: SeedWork) -> None:
+        assert work.page is not None
+        work.fields = fill_missing_fields(
+            work.seed,
+            work.page.soup,
+            summary=work.page.metadata.description,
+            debug=debug_image_selection,
+        )
+        if not skip_images:
+            work.image_candidates = collect_image_candidates(work.page.soup, work.page.url)
+
+    def find_image(work: SeedWork) -> None:
+        work.downloaded, work.overwrite = find_seed_image(
+            work.seed,
+            client,
+            image_validator=image_validator,
+            debug=debug_image_selection,
+            used_hashes=used_hashes,
+            pools=pools,
+            article=work.page,
+            article_candidates=work.image_candidates,
+        )
+        work.page = None
+        work.image_candidates = None
+
+    results: dict[int, AnimalRecord] = {}
+
+    def write(work: SeedWork) -> None:
+        image_path = "/assets/placeholder.svg"
+        if work.downloaded is not None:
+            image_path = _store_image(
+                work.downloaded,
+                work.seed,
                 image_dir,
-                skip_images=skip_images,
-                image_validator=image_validator,
-                debug=debug_image_selection,
+                overwrite=work.overwrite,
                 used_hashes=used_hashes,
+                manifest=manifest,
+                blob_store=blob_store,
             )
-        except Exception as exc:  # noqa: BLE001 - re-raise after processing
-            failures.append((seed, exc))
-            continue
-        records.append(record)
-        time.sleep(0.5)  # be polite to Britannica
+        results[work.index] = make_record(work.seed, work.fields, image_path)
+
+    failures: list[tuple[int, AnimalSeed, Exception]] = []
+    failures_lock = threading.Lock()
+
+    def on_error(work: SeedWork, exc: Exception) -> None:
+        if work.downloaded is not None:
+            work.downloaded.discard()
+        with failures_lock:
+            failures.append((work.index, work.seed, exc))
+
+    # fetch -> extract -> images -> write, each stage with its own workers and
+    # a bounded queue in front of it.
+    plan: list[tuple[str, Callable[[SeedWork], None], int]] = [
+        ("fetch", fetch, stages.fetch_workers),
+        ("extract", extract, stages.extract_workers),
+    ]
+    if not skip_images:
+        plan.append(("images", find_image, stages.image_workers))
+    plan.append(("write", write, 1))
+    queues = [queue.Queue(maxsize=max(1, stages.queue_size)) for _ in plan]
+    running: list[PipelineStage] = []
+    try:
+        for position, (name, handler, stage_workers) in enumerate(plan):
+            running.append(
+                PipelineStage(
+                    name,
+                    handler,
+                    workers=stage_workers,
+                    inbox=queues[position],
+                    outbox=queues[position + 1] if position + 1 < len(plan) else None,
+                    on_error=on_error,
+                    timings=timings,
+                )
+            )
+        for index, seed in enumerate(seeds):
+            queues[0].put(SeedWork(index=index, seed=seed))
+    finally:
+        for stage in running:
+            stage.close()
+        if pools is not None:
+            pools.shutdown()
+        client.close()
+        if verdict_cache is not None:
+            verdict_cache.close()
+        if manifest is not None:
+            manifest.close()
 
+    # Results are collected in seed order so the output stays deterministic
+    # regardless of which worker finishes first.
+    records = [results[index] for index in sorted(results)]
+    failures.sort(key=lambda failure: failure[0])
+    print("Timings:")
+    print(timings.report())
+    if image_validator is not None:
+        print("Validation stages:")
+        print(image_validator.stage_report())
     if failures:
-        messages = [f"{seed.scientific_name} ({seed.common_name}): {exc}" for seed, exc in failures]
+        messages = [f"{seed.scientific_name} ({seed.common_name}): {exc}" for _, seed, exc in failures]
         raise RuntimeError("Some animals failed to process:\n" + "\n".join(messages))
 
     serialize_records(records, output_path)
@@ -1186,7 +4490,11 @@ def main(argv: Optional[list[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Fetch animal data and images from Britannica")
     parser.add_argument("--limit", type=int, help="Only process the first N animals from the seed list")
     parser.add_argument("--skip-images", action="store_true", help="Do not download images, keep placeholder paths")
-    parser.add_argument("--refresh", action="store_true", help="Force re-download of images even if cached")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Force re-download of images and pages, bypassing the HTTP cache",
+    )
     parser.add_argument("--output", type=Path, default=Path("data/animals.json"), help="Path to write the compiled dataset")
     parser.add_argument(
         "--image-dir",
@@ -1199,18 +4507,240 @@ def main(argv: Optional[list[str]] = None) -> None:
         action="store_true",
         help="Emit detailed logs about image candidate filtering",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of seeds to process concurrently "
+        "(default for --fetch-workers, --image-workers and --validate-workers)",
+    )
+    parser.add_argument("--fetch-workers", type=int, metavar="N", help="Threads fetching search and article pages")
+    parser.add_argument(
+        "--extract-workers", type=int, metavar="N", help="Threads extracting facts from parsed articles (default: 1)"
+    )
+    parser.add_argument(
+        "--image-workers", type=int, metavar="N", help="Seeds whose image candidates are searched concurrently"
+    )
+    parser.add_argument(
+        "--download-workers", type=int, metavar="N", help="Concurrent image downloads shared by all seeds"
+    )
+    parser.add_argument(
+        "--validate-workers", type=int, metavar="N", help="Concurrent image validations (model inference; default: --workers)"
+    )
+    parser.add_argument(
+        "--download-ahead",
+        type=int,
+        metavar="N",
+        help="Candidates each seed downloads ahead of the one being validated (default: 1, 0 disables)",
+    )
+    parser.add_argument("--queue-size", type=int, metavar="N", help="Capacity of the queues between stages")
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=DEFAULT_HOST_RATE,
+        help="Maximum requests per second to each host, shared by all workers (0 disables)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for the persistent HTTP response cache",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Disable the persistent HTTP response cache")
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=MAX_RETRIES,
+        help="Attempts per request for transient failures (429, 5xx, timeouts, connection errors)",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="Record every HTTP exchange (including image bytes) into a cassette directory",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        type=Path,
+        metavar="DIR",
+        help="Serve all HTTP requests from a recorded cassette without network access",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        metavar="FACTOR",
+        help="With --replay, sleep for the recorded latency multiplied by FACTOR (default: 0)",
+    )
+    parser.add_argument(
+        "--clip-batch-size",
+        type=int,
+        default=CLIP_MAX_BATCH_SIZE,
+        metavar="N",
+        help="Largest number of images scored per CLIP forward pass; with --validate-workers > 1 "
+        "(or --workers > 1), concurrent candidates are batched together (default: %(default)s, 1 disables batching)",
+    )
+    parser.add_argument(
+        "--low-memory-validation",
+        action="store_true",
+        help=f"Decode candidates at most {VALIDATION_WORKING_SIZE} px per side (JPEG draft mode) and share "
+        "that copy across all image checks",
+    )
+    parser.add_argument(
+        "--inference-backend",
+        choices=INFERENCE_BACKENDS,
+        default="torch",
+        help="Runtime for the CLIP and ResNet50 image checks (onnx needs a prior --export-onnx)",
+    )
+    parser.add_argument(
+        "--onnx-dir",
+        type=Path,
+        default=DEFAULT_ONNX_DIR,
+        metavar="DIR",
+        help="Directory holding the exported ONNX models (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--onnx-int8",
+        action="store_true",
+        help="With --inference-backend onnx, use the dynamically quantised int8 models",
+    )
+    parser.add_argument(
+        "--export-onnx",
+        action="store_true",
+        help="Export CLIP and ResNet50 (fp32 and int8) to --onnx-dir and exit",
+    )
+    parser.add_argument(
+        "--benchmark-inference",
+        action="store_true",
+        help="Compare latency, peak memory and drift of the torch and ONNX backends on the "
+        "images in --image-dir (at most --limit, default 16) and exit",
+    )
+    parser.add_argument(
+        "--blob-dir",
+        type=Path,
+        default=DEFAULT_BLOB_DIR,
+        metavar="DIR",
+        help="Content-addressed store used by --blob-store and the snapshot commands (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--blob-store",
+        action="store_true",
+        help="Keep downloaded images in --blob-dir and hardlink them into --image-dir",
+    )
+    parser.add_argument(
+        "--snapshot-images",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIR",
+        help="Link the current --image-dir into a snapshot directory and exit "
+        "(default: <image-dir>_backup_<timestamp> next to it)",
+    )
+    parser.add_argument(
+        "--adopt-images",
+        type=Path,
+        action="append",
+        default=[],
+        metavar="DIR",
+        help="Deduplicate an existing image directory (e.g. an old backup) into --blob-dir and exit; repeatable",
+    )
+    parser.add_argument(
+        "--gc-blobs",
+        action="store_true",
+        help="Delete blobs in --blob-dir that no image directory links to and exit",
+    )
+    parser.add_argument(
+        "--html-parser",
+        choices=("auto", *HTML_PARSER_BACKENDS),
+        default="auto",
+        help="BeautifulSoup tree builder (auto prefers lxml and falls back to html.parser)",
+    )
+    parser.add_argument(
+        "--benchmark-html-parsers",
+        action="store_true",
+        help="Time every available HTML parser on the pages in the --replay cassette and exit",
+    )
 
     args = parser.parse_args(argv)
     if args.debug_image_selection:
         logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
-    run(
-        args.limit,
-        args.skip_images,
-        args.refresh,
-        args.output,
-        args.image_dir,
-        debug_image_selection=args.debug_image_selection,
-    )
+    if args.export_onnx:
+        export_onnx_models(args.onnx_dir)
+        return
+    if args.snapshot_images is not None or args.adopt_images or args.gc_blobs:
+        blob_store = BlobStore(args.blob_dir)
+        for directory in args.adopt_images:
+            if not directory.is_dir():
+                parser.error(f"--adopt-images: {directory} is not a directory")
+            print(f"Adopted {directory}: {len(blob_store.adopt(directory))} images")
+        if args.snapshot_images is not None:
+            destination = (
+                Path(args.snapshot_images)
+                if args.snapshot_images
+                else args.image_dir.with_name(f"{args.image_dir.name}_backup_{time.strftime('%Y%m%d_%H%M%S')}")
+            )
+            count = blob_store.snapshot(args.image_dir, destination)
+            print(f"Snapshot {destination}: {count} images")
+        if args.gc_blobs:
+            removed, freed = blob_store.gc()
+            print(f"Removed {removed} unreferenced blobs ({freed / 1e6:.1f} MB)")
+        return
+    if args.benchmark_inference:
+        images = sorted(path for path in args.image_dir.glob("*") if path.suffix.lower() in IMAGE_EXTENSIONS)
+        benchmark_inference_backends(images[: args.limit or 16], args.onnx_dir)
+        return
+    stage_config = StageConfig.from_workers(args.workers)
+    for name in (
+        "fetch_workers",
+        "extract_workers",
+        "image_workers",
+        "download_workers",
+        "validate_workers",
+        "download_ahead",
+        "queue_size",
+    ):
+        value = getattr(args, name)
+        if value is not None:
+            setattr(stage_config, name, value)
+    if args.benchmark_html_parsers and args.replay is None:
+        parser.error("--benchmark-html-parsers requires --replay DIR")
+    cassette: Optional[Cassette] = None
+    if args.record is not None:
+        cassette = Cassette(args.record, "record")
+    elif args.replay is not None:
+        cassette = Cassette(args.replay, "replay", latency_factor=args.replay_latency)
+    try:
+        if args.benchmark_html_parsers:
+            assert cassette is not None
+            benchmark_html_parsers(cassette)
+            return
+        run(
+            args.limit,
+            args.skip_images,
+            args.refresh,
+            args.output,
+            args.image_dir,
+            debug_image_selection=args.debug_image_selection,
+            workers=args.workers,
+            rate_limit=args.rate_limit,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            max_retries=args.max_retries,
+            cassette=cassette,
+            html_parser=args.html_parser,
+            clip_batch_size=args.clip_batch_size,
+            inference_backend=args.inference_backend,
+            onnx_dir=args.onnx_dir,
+            onnx_int8=args.onnx_int8,
+            stage_config=stage_config,
+            low_memory_validation=args.low_memory_validation,
+            blob_store=BlobStore(args.blob_dir) if args.blob_store else None,
+        )
+    finally:
+        # The index of a recording is only written on close, including
+        # when the run fails part-way.
+        if cassette is not None:
+            cassette.close()
 
 
 if __name__ == "__main__":
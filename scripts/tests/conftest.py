@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# scripts/ is not a package; make data_pipeline importable from the tests.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
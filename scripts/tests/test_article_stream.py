@@ -0,0 +1,117 @@
+import random
+from itertools import accumulate
+
+import pytest
+
+import data_pipeline as dp
+
+HEAD = '<html><head><title>Red fox</title></head><body><header><section class="nav">menu</section></header>'
+BODY_OPEN = f'<article><section class="topic {dp.ARTICLE_BODY_CLASS}" data-level="1">'
+BODY = '<p>Žlutý lišák</p><section class="inner"><p>nested</p><SECTION><p>deeper</p></SECTION></section><p>more</p>'
+BODY_CLOSE = "</section>"
+TAIL = '<section class="related">related</section></article><footer>footer</footer></body></html>'
+
+WITH_BODY = HEAD + BODY_OPEN + BODY + BODY_CLOSE + TAIL
+WITH_BODY_END = WITH_BODY.index("<footer>")
+ARTICLE_ONLY = HEAD + "<article><p>short</p><article><p>inner</p></article><p>after</p></article>" + "<footer>f</footer>"
+ARTICLE_ONLY_END = ARTICLE_ONLY.index("<footer>")
+# Sentences sit in several body sections; all of them come before </article>.
+TWO_BODIES = (
+    HEAD + BODY_OPEN + "<p>First part.</p>" + BODY_CLOSE + '<figure class="media">fig</figure>'
+    f'<section class="{dp.ARTICLE_BODY_CLASS}"><p>Second part.</p></section></article><footer>f</footer>'
+)
+TWO_BODIES_END = TWO_BODIES.index("<footer>")
+# Tags that only start like <section>/<article>, and a class that only
+# contains the body class as a substring, must not move the stopping point.
+DECOYS = (
+    HEAD + f'<section-x class="{dp.ARTICLE_BODY_CLASS}">x</section-x>'
+    f'<section class="{dp.ARTICLE_BODY_CLASS}-wrapper">w</section>'
+    "<article><p>a</p><article-teaser>t</article-teaser><section-x>s</section-x><p>b</p></article>"
+    "<footer>f</footer>"
+)
+DECOYS_END = DECOYS.index("<footer>")
+
+
+def random_chunks(text, rng):
+    cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, min(40, len(text) - 1))))
+    return [text[start:end] for start, end in zip([0, *cuts], [*cuts, len(text)])]
+
+
+def stop_offset(chunks):
+    # Characters consumed when the scanner first reports the body closed.
+    scanner = dp.ArticleStreamScanner()
+    consumed = 0
+    for chunk in chunks:
+        consumed += len(chunk)
+        if scanner.feed(chunk):
+            return consumed
+    return None
+
+
+@pytest.mark.parametrize(
+    "document, end",
+    [
+        (WITH_BODY, WITH_BODY_END),
+        (ARTICLE_ONLY, ARTICLE_ONLY_END),
+        (TWO_BODIES, TWO_BODIES_END),
+        (DECOYS, DECOYS_END),
+    ],
+    ids=["body", "article-only", "two-bodies", "decoys"],
+)
+def test_stops_in_the_chunk_that_closes_the_body(document, end):
+    rng = random.Random(document)
+    for _ in range(500):
+        chunks = random_chunks(document, rng)
+        # The stopping chunk is the one holding the closing tag's last '>'.
+        expected = next(total for total in accumulate(map(len, chunks)) if total >= end)
+        assert stop_offset(chunks) == expected
+
+
+def test_single_character_chunks():
+    assert stop_offset(list(WITH_BODY)) == WITH_BODY_END
+    assert stop_offset(list(ARTICLE_ONLY)) == ARTICLE_ONLY_END
+
+
+def test_body_outside_an_article_never_stops():
+    document = HEAD + f'<section class="{dp.ARTICLE_BODY_CLASS}"><p>x</p></section><article>a</article><p>y</p>'
+    assert stop_offset(random_chunks(document, random.Random(5))) is None
+
+
+def test_unterminated_body_never_stops():
+    rng = random.Random(3)
+    document = HEAD + BODY_OPEN + BODY
+    for _ in range(100):
+        assert stop_offset(random_chunks(document, rng)) is None
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self.headers = {"content-type": "text/html; charset=utf-8"}
+        self.encoding = "utf-8"
+        self._chunks = chunks
+
+    def iter_content(self, chunk_size):
+        return iter(self._chunks)
+
+
+def test_read_article_markup_across_multibyte_boundaries():
+    payload = WITH_BODY.encode("utf-8")
+    rng = random.Random(11)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(payload)), 25))
+        chunks = [payload[start:end] for start, end in zip([0, *cuts], [*cuts, len(payload)])]
+        markup, truncated = dp.read_article_markup(FakeResponse(chunks))
+        assert truncated
+        assert markup.startswith(WITH_BODY[:WITH_BODY_END])
+        assert WITH_BODY.startswith(markup)
+
+    full, truncated = dp.read_article_markup(FakeResponse([payload]), early_stop=False)
+    assert (full, truncated) == (WITH_BODY, False)
+
+
+def test_every_body_section_is_kept():
+    markup, truncated = dp.read_article_markup(FakeResponse([TWO_BODIES.encode("utf-8")]))
+    assert truncated
+    sentences = dp.extract_sentences(dp.make_soup(markup, "html.parser"))
+    assert any("First part" in sentence for sentence in sentences)
+    assert any("Second part" in sentence for sentence in sentences)
@@ -0,0 +1,100 @@
+import hashlib
+
+import pytest
+
+import data_pipeline as dp
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def inode(path):
+    stat = path.stat()
+    return stat.st_dev, stat.st_ino
+
+
+@pytest.fixture
+def store(tmp_path):
+    return dp.BlobStore(tmp_path / "store")
+
+
+def test_adopt_links_identical_files_and_keeps_their_contents(tmp_path, store):
+    images = tmp_path / "images"
+    fox = write(images / "fox.jpg", b"fox pixels")
+    write(images / "fox_copy.jpg", b"fox pixels")
+    write(images / "wolf.jpg", b"wolf pixels")
+
+    contents = store.adopt(images)
+
+    fox_sha = hashlib.sha256(b"fox pixels").hexdigest()
+    assert contents == {
+        "fox.jpg": fox_sha,
+        "fox_copy.jpg": fox_sha,
+        "wolf.jpg": hashlib.sha256(b"wolf pixels").hexdigest(),
+    }
+    assert inode(images / "fox.jpg") == inode(images / "fox_copy.jpg") == inode(store.blob_path(fox_sha))
+    assert fox.stat().st_nlink == 3
+    assert (images / "fox_copy.jpg").read_bytes() == b"fox pixels"
+    assert (images / "wolf.jpg").read_bytes() == b"wolf pixels"
+    assert store.views() == [images.resolve()]
+
+
+def test_adopt_rejects_a_missing_directory(tmp_path, store):
+    with pytest.raises(FileNotFoundError):
+        store.adopt(tmp_path / "missing")
+    assert store.views() == []
+
+
+def test_gc_removes_only_unreferenced_blobs(tmp_path, store):
+    images = tmp_path / "images"
+    write(images / "fox.jpg", b"fox pixels")
+    write(images / "wolf.jpg", b"wolf pixels")
+    contents = store.adopt(images)
+    orphan = write(tmp_path / "download.tmp", b"orphan pixels")
+    orphan_blob = store.put(orphan, hashlib.sha256(b"orphan pixels").hexdigest())
+    (images / "wolf.jpg").unlink()
+
+    assert store.gc(dry_run=True) == (2, len(b"orphan pixels") + len(b"wolf pixels"))
+    assert orphan_blob.exists()
+
+    assert store.gc() == (2, len(b"orphan pixels") + len(b"wolf pixels"))
+    assert not orphan_blob.exists()
+    assert not store.blob_path(contents["wolf.jpg"]).exists()
+    assert store.blob_path(contents["fox.jpg"]).exists()
+    assert (images / "fox.jpg").read_bytes() == b"fox pixels"
+
+
+def test_gc_forgets_deleted_views(tmp_path, store):
+    backup = tmp_path / "backup"
+    write(backup / "fox.jpg", b"fox pixels")
+    store.adopt(backup)
+    for path in backup.iterdir():
+        path.unlink()
+    backup.rmdir()
+
+    assert store.gc() == (1, len(b"fox pixels"))
+    assert store.views() == []
+
+
+def test_snapshot_shares_inodes_with_the_source(tmp_path, store):
+    images = tmp_path / "images"
+    write(images / "fox.jpg", b"fox pixels")
+    write(images / "wolf.jpg", b"wolf pixels")
+    snapshot = tmp_path / "images_backup"
+
+    assert store.snapshot(images, snapshot) == 2
+
+    for name in ("fox.jpg", "wolf.jpg"):
+        assert inode(snapshot / name) == inode(images / name)
+    assert {view.name for view in store.views()} == {"images", "images_backup"}
+    with pytest.raises(FileExistsError):
+        store.snapshot(images, snapshot)
+    # Replacing a file in the live directory leaves the snapshot intact.
+    new_sha = hashlib.sha256(b"new fox").hexdigest()
+    store.put(write(tmp_path / "new.tmp", b"new fox"), new_sha)
+    store.link(new_sha, images / "fox.jpg")
+    assert (images / "fox.jpg").read_bytes() == b"new fox"
+    assert (snapshot / "fox.jpg").read_bytes() == b"fox pixels"
@@ -0,0 +1,74 @@
+import pytest
+
+import data_pipeline as dp
+
+PAGE_URL = "https://www.britannica.com/animal/red-fox"
+IMAGE_URL = "https://cdn.britannica.com/fox.jpg"
+PAGE = b"<html><body><article><p>The red fox.</p></article></body></html>"
+IMAGE = bytes(range(256)) * 4
+
+
+class FakeNetwork:
+    # Stands in for the session below BritannicaClient._send, so the
+    # cassette sees every exchange exactly as the network returned it.
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, method, url, **kwargs):
+        headers = kwargs.get("headers") or {}
+        self.requests.append((method, url, headers.get("Range", "")))
+        if url == PAGE_URL:
+            return dp._build_response(url, 200, {"content-type": "text/html; charset=utf-8", "etag": '"v1"'}, PAGE)
+        if url == IMAGE_URL and "Range" in headers:
+            return dp._build_response(url, 206, {"content-type": "image/jpeg"}, IMAGE[:64])
+        if url == IMAGE_URL:
+            return dp._build_response(url, 200, {"content-type": "image/jpeg"}, IMAGE)
+        return dp._build_response(url, 404, {}, b"")
+
+
+def exchanges(client):
+    return [
+        client._send("GET", PAGE_URL),
+        client._send("GET", IMAGE_URL, headers={"Range": "bytes=0-63"}),
+        client._send("GET", IMAGE_URL),
+        client._send("GET", PAGE_URL + "-missing"),
+    ]
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    network = FakeNetwork()
+    recorder = dp.BritannicaClient(cassette=dp.Cassette(tmp_path / "tape", "record"))
+    recorder.session.request = network
+    recorded = exchanges(recorder)
+    recorder.close()
+    assert len(network.requests) == 4
+
+    replayer = dp.BritannicaClient(cassette=dp.Cassette(tmp_path / "tape", "replay"))
+    replayer.session.request = lambda *args, **kwargs: pytest.fail("replay must not reach the network")
+    replayed = exchanges(replayer)
+
+    for original, copy in zip(recorded, replayed):
+        assert (copy.url, copy.status_code, copy.content) == (original.url, original.status_code, original.content)
+        assert copy.headers.get("content-type") == original.headers.get("content-type")
+    assert replayed[0].headers["etag"] == '"v1"'
+    with pytest.raises(dp.CassetteMiss):
+        replayer._send("GET", "https://www.britannica.com/animal/gray-wolf")
+    replayer.close()
+
+
+def test_commands_that_exit_early_leave_no_recording(tmp_path):
+    tape = tmp_path / "tape"
+    dp.main(["--record", str(tape), "--gc-blobs", "--blob-dir", str(tmp_path / "blobs")])
+    assert not tape.exists()
+
+
+def test_failed_run_still_writes_the_index(tmp_path, monkeypatch):
+    def failing_run(*args, cassette, **kwargs):
+        cassette.record("GET https://example.com", dp._build_response("https://example.com", 200, {}, b"x"), 0.1)
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(dp, "run", failing_run)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        dp.main(["--record", str(tmp_path / "tape")])
+
+    assert len(dp.Cassette(tmp_path / "tape", "replay")) == 1
@@ -0,0 +1,101 @@
+import threading
+import time
+from io import BytesIO
+
+import pytest
+
+import data_pipeline as dp
+
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("numpy")
+
+COLORS = ("olive", "navy", "white", "black", "orange", "teal", "gray", "pink")
+
+
+class ShadeBackend(dp.InferenceBackend):
+    # CLIP scores follow the brightness of each image, so every image in a
+    # batch gets its own score; ResNet is unavailable.
+    name = "shade"
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def load_clip(self):
+        return True
+
+    def clip_probabilities(self, pixel_values):
+        with self._lock:
+            self.batch_sizes.append(len(pixel_values))
+        rows = []
+        for pixels in pixel_values:
+            positive = min(1.0, max(0.0, (float(pixels.mean()) + 2.0) / 4.0))
+            row = [0.0] * len(dp.CLIP_PROMPTS)
+            row[min(dp.CLIP_POSITIVE_INDICES)] = positive
+            row[min(set(range(len(row))) - dp.CLIP_POSITIVE_INDICES)] = 1.0 - positive
+            rows.append(row)
+        return rows
+
+    def load_vision(self):
+        return False
+
+    def vision_top_labels(self, pixel_values, k=5):
+        raise AssertionError("ResNet is unavailable")
+
+
+class ShadeValidator(dp.ImageValidator):
+    def __init__(self, **kwargs):
+        super().__init__(backend=ShadeBackend(), **kwargs)
+
+    def _basic_variance_check(self, image, *, gray=None):
+        return True
+
+    def _detect_text_overlay(self, image, *, gray=None):
+        return False
+
+
+def encoded(color):
+    buffer = BytesIO()
+    Image.new("RGB", (640, 480), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def verdict(validator, color):
+    return validator.accepts(encoded(color), scientific_name="Vulpes vulpes", common_name="Red fox")
+
+
+def test_pooled_batches_match_single_calls():
+    single = ShadeValidator()
+    expected = {color: verdict(single, color) for color in COLORS}
+    assert set(expected.values()) == {True, False}
+
+    pooled = ShadeValidator(batch_concurrent=True, max_batch_size=len(COLORS))
+    pooled._clip_batcher.window = 1.0
+    barrier = threading.Barrier(len(COLORS))
+    results = {}
+
+    def worker(color):
+        barrier.wait()
+        results[color] = verdict(pooled, color)
+
+    threads = [threading.Thread(target=worker, args=(color,)) for color in COLORS]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == expected
+    assert max(pooled._backend.batch_sizes) > 1
+    assert sum(pooled._backend.batch_sizes) == len(COLORS)
+
+
+def test_lone_validation_skips_the_batch_window():
+    validator = ShadeValidator(batch_concurrent=True, max_batch_size=8)
+    validator._clip_batcher.window = 5.0
+
+    started = time.monotonic()
+    verdict(validator, "olive")
+
+    assert time.monotonic() - started < 2.0
+    assert validator._backend.batch_sizes == [1]
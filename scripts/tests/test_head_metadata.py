@@ -0,0 +1,133 @@
+import json
+
+import data_pipeline as dp
+
+ARTICLE_URL = "https://www.britannica.com/animal/red-fox"
+JSON_LD = {
+    "@context": "https://schema.org",
+    "@graph": [
+        {"@type": "WebPage", "description": "JSON-LD description."},
+        {
+            "@type": "ImageObject",
+            "image": [
+                "https://cdn.britannica.com/og-fox.jpg",
+                {"url": "https://cdn.britannica.com/ld-fox.jpg"},
+                {"contentUrl": "/ld-den.jpg"},
+                {"caption": "no url"},
+            ],
+        },
+    ],
+}
+HEAD = f"""<html><head>
+<title>Red fox | Britannica</title>
+<meta property="og:title" content="Red fox">
+<meta name="description" content="Plain description.">
+<meta property="og:image" content="https://cdn.britannica.com/og-fox.jpg">
+<meta property="og:image" content="https://cdn.britannica.com/second-og.jpg">
+<meta property="og:image:alt" content="Red fox in snow">
+<meta name="twitter:image" content="https://cdn.britannica.com/tw-fox.jpg?w=400">
+<script type="application/ld+json">{{"@type": "Thing", "image": </script>
+<script type="application/ld+json">{json.dumps(JSON_LD)}</script>
+<script>var notJson = {{</script>
+</head>"""
+BODY = """<body>
+<meta property="og:image" content="https://cdn.britannica.com/body-meta.jpg">
+<article><figure><img src="https://cdn.britannica.com/figure-fox.jpg" width="800" height="600" alt="Red fox"></figure>
+<img src="https://cdn.britannica.com/plain-fox.jpg" width="640" alt="A red fox in the forest"></article>
+</body></html>"""
+
+
+def test_head_tags_and_json_ld_are_collected_in_order():
+    metadata = dp.extract_head_metadata(HEAD + BODY)
+
+    assert metadata.images == [
+        "https://cdn.britannica.com/og-fox.jpg",
+        "https://cdn.britannica.com/tw-fox.jpg?w=400",
+        "https://cdn.britannica.com/ld-fox.jpg",
+        "/ld-den.jpg",
+    ]
+    assert metadata.image_alt == "Red fox in snow"
+    assert metadata.title == "Red fox"
+    assert metadata.description == "Plain description."
+
+
+def test_malformed_json_ld_is_skipped():
+    markup = (
+        '<html><head><script type="application/ld+json">{"image": "https://cdn.example.com/a.jpg",</script>'
+        '<script type="application/ld+json">[{"description": "Recovered."}, 3, "text"]</script></head></html>'
+    )
+    metadata = dp.extract_head_metadata(markup)
+
+    assert metadata.images == []
+    assert metadata.description == "Recovered."
+
+
+def test_only_the_head_is_read():
+    metadata = dp.extract_head_metadata("<html><head><title>t</title></head>" + BODY)
+    assert metadata.images == []
+
+    # Without a closing </head>, only the first 64 KiB are scanned.
+    padding = "<p>" + "x" * (64 * 1024) + "</p>"
+    late = '<meta property="og:image" content="https://cdn.britannica.com/late.jpg">'
+    assert dp.extract_head_metadata("<html>" + padding + late).images == []
+
+
+def test_metadata_candidates_are_absolute_and_filtered():
+    metadata = dp.ArticleMetadata(
+        images=[
+            "/images/fox.jpg?w=300",
+            "https://cdn.britannica.com/placeholder.png",
+            "https://cdn.britannica.com/fox-logo.png",
+            "https://www.britannica.com/images/fox.jpg",
+        ],
+        image_alt="Red fox",
+    )
+
+    candidates = metadata.image_candidates(ARTICLE_URL)
+
+    assert [candidate.urls for candidate in candidates] == [
+        ["https://www.britannica.com/images/fox.jpg", "https://www.britannica.com/images/fox.jpg?w=300"],
+    ]
+    assert candidates[0].alt_text == "Red fox"
+
+
+def find_attempts(markup):
+    # URLs find_seed_image tries to download, in order, when none is accepted.
+    page = dp.ArticlePage(
+        url=ARTICLE_URL,
+        soup=dp.make_soup(markup, "html.parser"),
+        metadata=dp.extract_head_metadata(markup),
+    )
+    attempts = []
+
+    def download_image(url):
+        attempts.append(url)
+        raise dp.ImageRejected("rejected by test")
+
+    def probe_image(url):
+        raise RuntimeError("no probes in this test")
+
+    client = dp.BritannicaClient()
+    client.fetch_article_url = lambda term: ARTICLE_URL
+    client.download_image = download_image
+    client.probe_image = probe_image
+    seed = dp.AnimalSeed("mammals", "Red fox", "Vulpes vulpes", "", "", "", "", "", [])
+
+    assert dp.find_seed_image(seed, client, article=page) == (None, False)
+    return attempts
+
+
+def test_head_images_are_tried_before_the_article_images():
+    attempts = find_attempts(HEAD + BODY)
+
+    assert attempts[:2] == ["https://cdn.britannica.com/og-fox.jpg", "https://cdn.britannica.com/tw-fox.jpg"]
+    assert attempts.index("https://cdn.britannica.com/ld-fox.jpg") < attempts.index(
+        "https://cdn.britannica.com/figure-fox.jpg"
+    )
+    assert attempts[-2:] == ["https://cdn.britannica.com/figure-fox.jpg", "https://cdn.britannica.com/plain-fox.jpg"]
+
+
+def test_page_without_head_metadata_falls_back_to_the_article_images():
+    attempts = find_attempts("<html><head><title>Red fox</title></head>" + BODY)
+
+    assert attempts == ["https://cdn.britannica.com/figure-fox.jpg", "https://cdn.britannica.com/plain-fox.jpg"]
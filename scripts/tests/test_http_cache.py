@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+import data_pipeline as dp
+
+URL = "https://www.britannica.com/animal/red-fox"
+
+
+class FakeTransport:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs.get("headers") or {}))
+        status, headers, body = self.responses.pop(0)
+        return dp._build_response(url, status, headers, body)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = dp.HttpCache(tmp_path, fresh_for=60)
+    yield cache
+    cache.close()
+
+
+def make_client(cache, transport):
+    client = dp.BritannicaClient(cache=cache)
+    client._send = transport
+    return client
+
+
+def age_entry(cache, seconds):
+    with cache._lock:
+        cache._db.execute("UPDATE responses SET stored_at = stored_at - ?", (seconds,))
+        cache._db.commit()
+
+
+def test_fresh_entry_is_served_without_a_request(cache):
+    transport = FakeTransport((200, {"content-type": "text/html", "etag": '"v1"'}, b"<html>v1</html>"))
+    client = make_client(cache, transport)
+
+    assert client._request("GET", URL).content == b"<html>v1</html>"
+    cached = client._request("GET", URL)
+
+    assert cached.content == b"<html>v1</html>"
+    assert getattr(cached, "from_cache", False)
+    assert len(transport.requests) == 1
+
+
+def test_stale_entry_is_revalidated_and_304_reuses_the_body(cache):
+    transport = FakeTransport(
+        (200, {"content-type": "text/html", "etag": '"v1"', "last-modified": "Mon, 01 Sep 2025 00:00:00 GMT"}, b"v1"),
+        (304, {}, b""),
+    )
+    client = make_client(cache, transport)
+    client._request("GET", URL)
+    age_entry(cache, 120)
+
+    response = client._request("GET", URL)
+
+    assert response.status_code == 200
+    assert response.content == b"v1"
+    _, _, headers = transport.requests[1]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Sep 2025 00:00:00 GMT"
+    # The 304 renewed the entry, so it is fresh again.
+    assert cache.get(URL).is_fresh(cache.fresh_for)
+    client._request("GET", URL)
+    assert len(transport.requests) == 2
+
+
+def test_stale_entry_is_replaced_by_a_changed_response(cache):
+    transport = FakeTransport(
+        (200, {"content-type": "text/html", "etag": '"v1"'}, b"v1"),
+        (200, {"content-type": "text/html", "etag": '"v2"'}, b"v2"),
+    )
+    client = make_client(cache, transport)
+    client._request("GET", URL)
+    age_entry(cache, 120)
+
+    assert client._request("GET", URL).content == b"v2"
+    assert cache.get(URL).body == b"v2"
+    assert cache.get(URL).etag == '"v2"'
+
+
+def test_refresh_bypasses_fresh_entries(cache):
+    transport = FakeTransport((200, {"etag": '"v1"'}, b"v1"), (200, {"etag": '"v2"'}, b"v2"))
+    make_client(cache, transport)._request("GET", URL)
+    refreshing = make_client(cache, transport)
+    refreshing.refresh = True
+
+    assert refreshing._request("GET", URL).content == b"v2"
+    assert len(transport.requests) == 2
+    assert time.time() - cache.get(URL).stored_at < 5
@@ -0,0 +1,144 @@
+from typing import Optional
+from urllib.parse import urljoin
+
+import pytest
+
+import data_pipeline as dp
+
+BASE_URL = "https://www.britannica.com/animal/red-fox"
+
+PAGE = """
+<html><body>
+<header><img class="site-logo" src="/logo.svg" alt="Britannica"></header>
+<img src="https://cdn.britannica.com/teaser.jpg?w=300" width="300" height="200" alt="fox in the wild">
+<div class="assemblies">
+  <img data-src="/images/assembly-fox.jpg" data-width="800" data-height="600" alt="Red fox">
+  <img src="https://cdn.britannica.com/shared.jpg" width="500" alt="shared">
+</div>
+<figure class="md-assembly">
+  <img srcset="https://cdn.britannica.com/fox-640.jpg 640w, https://cdn.britannica.com/fox-1280.jpg?w=1280 1280w"
+       src="https://cdn.britannica.com/fox.jpg" width="1280" height="960" alt="Red fox (Vulpes vulpes) in a forest">
+  <img src="https://cdn.britannica.com/fox-map.jpg" width="900" alt="Range map of the red fox">
+</figure>
+<div class="md-assembly">
+  <div class="assemblies"><img data-srcset="/img/den.jpg 700w, /img/den-big.jpg 1400w" alt="Fox den in the forest"></div>
+  <img src="https://cdn.britannica.com/placeholder-default.png" alt="fox">
+  <img src="https://cdn.britannica.com/fox-drawing.jpg" alt="A fox drawing" width="2000">
+</div>
+<figure><figcaption>x</figcaption><img src="https://cdn.britannica.com/shared.jpg" width="720" height="480"
+  alt="Fox cub near the river"></figure>
+<img src="https://cdn.britannica.com/cartoon-fox.png" alt="Cartoon fox poster" width="1200">
+<img alt="no source">
+<img src="https://cdn.britannica.com/fox-icon.png" alt="fox">
+<section><img data-original="//cdn.britannica.com/kit.jpg" height="400" alt="Kit in the sea"></section>
+</body></html>
+"""
+
+
+def baseline_candidates(soup, base_url):
+    # collect_image_candidates as it was before the single-walk rewrite: one
+    # soup.select per container selector, with visited nodes skipped.
+    candidates = []
+    seen_nodes = set()
+    seen_urls = set()
+
+    def consider(img):
+        if id(img) in seen_nodes:
+            return
+        seen_nodes.add(id(img))
+        classes = img.get("class", [])
+        if isinstance(classes, str):
+            classes = [classes]
+        if any("logo" in cls.lower() for cls in classes if isinstance(cls, str)):
+            return
+        alt_text = (img.get("alt") or "").strip()
+        alt_lower = alt_text.lower()
+        if "logo" in alt_lower or "placeholder" in alt_lower:
+            return
+        variant_entries = []
+        for attr in ("data-srcset", "srcset"):
+            value = img.get(attr)
+            if value:
+                variant_entries.extend(dp._parse_srcset(value))
+                break
+        direct_width = dp._parse_dimension(img.get("data-width")) or dp._parse_dimension(img.get("width"))
+        direct_height = dp._parse_dimension(img.get("data-height")) or dp._parse_dimension(img.get("height"))
+        for attr in ("data-src", "data-original", "data-url", "src"):
+            value = img.get(attr)
+            if value:
+                variant_entries.append((value, direct_width))
+                break
+        if not variant_entries:
+            return
+        normalized_urls = []
+        max_width: Optional[int] = None
+        for raw_url, width in variant_entries:
+            if not raw_url:
+                continue
+            absolute = urljoin(base_url, raw_url)
+            if not absolute or dp.is_placeholder_image(absolute):
+                continue
+            if any(keyword in absolute.lower() for keyword in dp.NEGATIVE_URL_KEYWORDS):
+                continue
+            for variant in dp.sanitize_image_variants(absolute):
+                if variant in seen_urls:
+                    continue
+                normalized_urls.append(variant)
+                seen_urls.add(variant)
+                if len(normalized_urls) >= 6:
+                    break
+            if len(normalized_urls) >= 6:
+                break
+            if width and (max_width is None or width > max_width):
+                max_width = width
+        if not normalized_urls:
+            return
+        score = (max_width or 0) * 4 + (direct_height or 0)
+        if alt_lower:
+            if any(keyword in alt_lower for keyword in dp.POSITIVE_ALT_KEYWORDS):
+                score += 2500
+            if any(keyword in alt_lower for keyword in dp.NEGATIVE_ALT_KEYWORDS):
+                score -= 3000
+        candidates.append((normalized_urls, alt_text, max_width, direct_height, score))
+
+    for selector in ("figure img", ".md-assembly img", ".assemblies img", "img"):
+        for img in soup.select(selector):
+            consider(img)
+    candidates.sort(key=lambda candidate: candidate[4], reverse=True)
+    return candidates
+
+
+def summary(candidates):
+    return [(c.urls, c.alt_text, c.width, c.height, c.score) for c in candidates]
+
+
+@pytest.fixture(params=sorted(dp.HTML_PARSER_BACKENDS))
+def soup(request):
+    try:
+        return dp.make_soup(PAGE, request.param)
+    except Exception:
+        pytest.skip(f"{request.param} is not installed")
+
+
+def test_single_walk_matches_the_multi_select_baseline(soup):
+    expected = baseline_candidates(soup, BASE_URL)
+
+    assert len(expected) >= 6
+    assert summary(dp.collect_image_candidates(soup, BASE_URL, enough_strong=None)) == expected
+    # This page has fewer strong candidates than the early stop needs.
+    assert summary(dp.collect_image_candidates(soup, BASE_URL)) == expected
+
+
+def test_shared_urls_go_to_the_highest_priority_container(soup):
+    candidates = dp.collect_image_candidates(soup, BASE_URL, enough_strong=None)
+    owners = [c.alt_text for c in candidates if "https://cdn.britannica.com/shared.jpg" in c.urls]
+    assert owners == ["Fox cub near the river"]
+
+
+def test_early_stop_only_skips_lower_priority_images(soup):
+    full = summary(dp.collect_image_candidates(soup, BASE_URL, enough_strong=None))
+    stopped = summary(dp.collect_image_candidates(soup, BASE_URL, enough_strong=1))
+
+    assert stopped and all(candidate in full for candidate in stopped)
+    assert "Red fox (Vulpes vulpes) in a forest" in [alt for _, alt, _, _, _ in stopped]
+    assert len(stopped) < len(full)
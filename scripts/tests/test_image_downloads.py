@@ -0,0 +1,45 @@
+import os
+import stat
+from io import BytesIO
+
+import pytest
+import requests
+
+import data_pipeline as dp
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def jpeg(size):
+    buffer = BytesIO()
+    Image.new("RGB", size, "olive").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def client_serving(payload):
+    def send(method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.raw = BytesIO(payload)
+        response.headers["content-type"] = "image/jpeg"
+        return response
+
+    client = dp.BritannicaClient()
+    client._send = send
+    return client
+
+
+def test_saved_downloads_follow_the_umask(tmp_path):
+    downloaded = client_serving(jpeg((400, 300))).download_image("https://cdn.example.com/fox.jpg")
+    target = tmp_path / "animals" / "vulpes_vulpes.jpg"
+    downloaded.save_to(target)
+
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o666 & ~dp._UMASK
+
+
+def test_undersized_and_oversized_downloads_are_rejected():
+    with pytest.raises(dp.ImageRejected, match="below threshold"):
+        client_serving(jpeg((100, 100))).download_image("https://cdn.example.com/small.jpg")
+    with pytest.raises(dp.ImageRejected, match="exceeds"):
+        client_serving(jpeg((400, 300))).download_image("https://cdn.example.com/big.jpg", max_bytes=100)
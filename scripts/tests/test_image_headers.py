@@ -0,0 +1,65 @@
+from io import BytesIO
+
+import pytest
+
+import data_pipeline as dp
+
+Image = pytest.importorskip("PIL.Image")
+features = pytest.importorskip("PIL.features")
+
+
+def encode(fmt, size=(640, 480), mode="RGB", **options):
+    buffer = BytesIO()
+    Image.new(mode, size, "olive").save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "fmt, options",
+    [
+        ("JPEG", {}),
+        ("JPEG", {"progressive": True}),
+        ("JPEG", {"exif": b"Exif\x00\x00" + b"\x00" * 2048}),
+        ("PNG", {}),
+        ("GIF", {}),
+    ],
+)
+def test_dimensions_come_from_the_header(fmt, options):
+    header = dp.sniff_image_header(encode(fmt, (641, 479), **options))
+
+    assert header == dp.ImageHeader(fmt.lower(), 641, 479)
+
+
+@pytest.mark.parametrize(
+    "mode, options",
+    [
+        ("RGB", {"lossless": False}),  # VP8
+        ("RGB", {"lossless": True}),  # VP8L
+        ("RGBA", {"lossless": False, "exif": b"Exif\x00\x00" + b"\x00" * 64}),  # VP8X
+    ],
+)
+def test_webp_variants(mode, options):
+    if not features.check("webp"):
+        pytest.skip("Pillow built without WebP")
+    data = encode("WEBP", (641, 479), mode=mode, **options)
+
+    assert dp.sniff_image_header(data) == dp.ImageHeader("webp", 641, 479)
+
+
+@pytest.mark.parametrize("fmt", ["JPEG", "PNG", "GIF"])
+def test_short_prefix_names_the_format_without_dimensions(fmt):
+    header = dp.sniff_image_header(encode(fmt)[:8])
+
+    assert header is not None
+    assert header.format == fmt.lower()
+    assert (header.width, header.height) == (None, None)
+
+
+@pytest.mark.parametrize("data", [b"", b"<!DOCTYPE html><html>", b"RIFF\x00\x00\x00\x00WAVEfmt "])
+def test_non_images_are_not_recognised(data):
+    assert dp.sniff_image_header(data) is None
+
+
+def test_undersized_header():
+    assert dp.sniff_image_header(encode("PNG", (100, 100))).is_undersized()
+    assert not dp.sniff_image_header(encode("PNG", (dp.MIN_IMAGE_WIDTH, dp.MIN_IMAGE_HEIGHT))).is_undersized()
@@ -0,0 +1,107 @@
+import hashlib
+import os
+
+import pytest
+
+import data_pipeline as dp
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    # Names of the files the manifest actually reads.
+    seen = []
+    original = dp._hash_image_file
+
+    def counting(path):
+        seen.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(dp, "_hash_image_file", counting)
+    return seen
+
+
+@pytest.fixture
+def images(tmp_path):
+    directory = tmp_path / "animals"
+    directory.mkdir()
+    (directory / "vulpes_vulpes.jpg").write_bytes(b"fox")
+    (directory / "canis_lupus.png").write_bytes(b"wolf")
+    (directory / ".hidden.tmp").write_bytes(b"partial")
+    return directory
+
+
+def open_manifest(tmp_path):
+    return dp.ImageManifest(tmp_path / "cache" / "images.sqlite3")
+
+
+def test_first_scan_hashes_every_file(tmp_path, images, hashed):
+    manifest = open_manifest(tmp_path)
+    entries = manifest.scan(images)
+
+    assert sorted(hashed) == ["canis_lupus.png", "vulpes_vulpes.jpg"]
+    assert {entry.path.name: entry.sha256 for entry in entries} == {
+        "canis_lupus.png": hashlib.sha256(b"wolf").hexdigest(),
+        "vulpes_vulpes.jpg": hashlib.sha256(b"fox").hexdigest(),
+    }
+    assert {entry.owner for entry in entries} == {"canis_lupus", "vulpes_vulpes"}
+    manifest.close()
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path, images, hashed):
+    open_manifest(tmp_path).scan(images)
+    hashed.clear()
+
+    manifest = open_manifest(tmp_path)
+    entries = manifest.scan(images)
+
+    assert hashed == []
+    assert len(entries) == 2
+    manifest.close()
+
+
+def test_changed_files_are_rehashed(tmp_path, images, hashed):
+    open_manifest(tmp_path).scan(images)
+    hashed.clear()
+    fox = images / "vulpes_vulpes.jpg"
+    fox.write_bytes(b"new fox")
+    wolf = images / "canis_lupus.png"
+    wolf.write_bytes(b"WOLF")  # same size, later mtime
+    stat = wolf.stat()
+    os.utime(wolf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    entries = {entry.path.name: entry for entry in open_manifest(tmp_path).scan(images)}
+
+    assert sorted(hashed) == ["canis_lupus.png", "vulpes_vulpes.jpg"]
+    assert entries["vulpes_vulpes.jpg"].sha256 == hashlib.sha256(b"new fox").hexdigest()
+    assert entries["canis_lupus.png"].sha256 == hashlib.sha256(b"WOLF").hexdigest()
+
+
+def test_deleted_files_leave_the_manifest(tmp_path, images, hashed):
+    manifest = open_manifest(tmp_path)
+    manifest.scan(images)
+    (images / "canis_lupus.png").unlink()
+
+    entries = manifest.scan(images)
+
+    assert [entry.path.name for entry in entries] == ["vulpes_vulpes.jpg"]
+    assert manifest.owner_of(hashlib.sha256(b"wolf").hexdigest()) is None
+    manifest.close()
+
+
+def test_recorded_owner_survives_rescans(tmp_path, images, hashed):
+    manifest = open_manifest(tmp_path)
+    manifest.scan(images)
+    stored = images / "fennec.jpg"
+    stored.write_bytes(b"fennec")
+    sha = hashlib.sha256(b"fennec").hexdigest()
+    manifest.record(stored, sha256=sha, phash=None, owner="vulpes_zerda")
+    hashed.clear()
+
+    entries = {entry.path.name: entry for entry in manifest.scan(images)}
+
+    assert hashed == []
+    assert entries["fennec.jpg"].owner == "vulpes_zerda"
+    assert manifest.owner_of(sha) == "vulpes_zerda"
+    assert manifest.owner_of(hashlib.sha256(b"fox").hexdigest()) == "vulpes_vulpes"
+    assert manifest.owner_of("0" * 64) is None
+    manifest.close()
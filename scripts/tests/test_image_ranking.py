@@ -0,0 +1,116 @@
+import struct
+
+import data_pipeline as dp
+
+CDN = "https://cdn.britannica.com/"
+
+
+def jpeg_head(width, height):
+    sof = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 3) + b"\x01\x22\x00"
+    return b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + bytes(9) + sof
+
+
+def png_head(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height) + bytes(5)
+
+
+class FakeCdn:
+    # Serves the first bytes of images described by (status, content type,
+    # head bytes, etag) per file name.
+    def __init__(self, files):
+        self.files = files
+        self.probed = []
+
+    def __call__(self, method, url, **kwargs):
+        name = url.removeprefix(CDN)
+        self.probed.append(name)
+        status, content_type, head, etag = self.files.get(name, (404, "text/html", b"", ""))
+        headers = {"content-type": content_type, "content-range": f"bytes 0-{len(head) - 1}/{len(head) + 50_000}"}
+        if etag:
+            headers["etag"] = etag
+        return dp._build_response(url, status, headers, head)
+
+
+def image(name, width, height, *, fmt="jpeg", etag=""):
+    head = jpeg_head(width, height) if fmt == "jpeg" else png_head(width, height)
+    return name, (206, f"image/{fmt}", head, etag or f'"{name}"')
+
+
+def candidate(name, alt_score=0):
+    return dp.ImageCandidate(urls=[CDN + name], alt_text="", width=None, height=None, score=0, alt_score=alt_score)
+
+
+def rank(files, names, **kwargs):
+    cdn = FakeCdn(dict(files))
+    client = dp.BritannicaClient(rate_limiter=dp.HostRateLimiter(rate=0))
+    client._send = cdn
+    candidates = [candidate(name) if isinstance(name, str) else name for name in names]
+    ranked = dp.rank_image_candidates(client, candidates, **kwargs)
+    return [url.removeprefix(CDN) for _, url in ranked], cdn.probed
+
+
+def test_larger_images_rank_first():
+    files = [image("thumb.jpg", 400, 300), image("full.jpg", 1600, 1200), image("mid.jpg", 900, 600)]
+    order, _ = rank(files, ["thumb.jpg", "full.jpg", "mid.jpg"])
+    assert order == ["full.jpg", "mid.jpg", "thumb.jpg"]
+
+
+def test_format_breaks_ties_between_equal_sizes():
+    files = [image("fox.png", 800, 600, fmt="png"), image("fox.jpg", 800, 600)]
+    order, _ = rank(files, ["fox.png", "fox.jpg"])
+    assert order == ["fox.jpg", "fox.png"]
+
+
+def test_resolution_beyond_the_cap_earns_nothing():
+    files = [image("capped.jpg", dp.IMAGE_RANK_MAX_WIDTH, dp.IMAGE_RANK_MAX_HEIGHT), image("huge.jpg", 6000, 4000)]
+    order, _ = rank(files, ["capped.jpg", "huge.jpg"])
+    assert order == ["capped.jpg", "huge.jpg"]
+
+
+def test_alt_score_counts_towards_the_rank():
+    files = [image("a.jpg", 800, 600), image("b.jpg", 801, 600)]
+    order, _ = rank(files, ["b.jpg", candidate("a.jpg", alt_score=50)])
+    assert order == ["a.jpg", "b.jpg"]
+
+
+def test_unusable_probes_are_dropped():
+    files = [
+        image("tiny.jpg", 120, 90),
+        ("page.jpg", (206, "text/html", b"<html>", '"page"')),
+        image("fox.jpg", 800, 600),
+    ]
+    order, _ = rank(files, ["tiny.jpg", "page.jpg", "fox.jpg"])
+    assert order == ["fox.jpg"]
+
+
+def test_failed_and_inconclusive_probes_follow_in_page_order():
+    files = [
+        ("garbled.jpg", (206, "image/jpeg", b"\x00" * 64, '"garbled"')),
+        image("fox.jpg", 800, 600),
+    ]
+    order, _ = rank(files, ["missing.jpg", "garbled.jpg", "fox.jpg"])
+    assert order == ["fox.jpg", "missing.jpg", "garbled.jpg"]
+
+
+def test_variants_of_the_same_resource_are_ranked_once():
+    files = [image("fox-large.jpg", 1600, 1200, etag='"v1"'), image("fox-copy.jpg", 1600, 1200, etag='W/"v1"')]
+    order, _ = rank(files, ["fox-large.jpg", "fox-copy.jpg"])
+    assert order == ["fox-large.jpg"]
+
+
+def test_probing_stops_once_enough_large_images_are_known():
+    names = [f"large{index}.jpg" for index in range(dp.IMAGE_PROBE_ENOUGH)] + ["late-huge.jpg", "late-small.jpg"]
+    files = [image(name, 1600, 1200) for name in names[:-2]]
+    files += [image("late-huge.jpg", 2400, 1800), image("late-small.jpg", 400, 300)]
+
+    order, probed = rank(files, names)
+
+    assert probed == names[: dp.IMAGE_PROBE_ENOUGH]
+    assert order == names
+
+
+def test_probe_limit_leaves_the_rest_in_page_order():
+    files = [image("a.jpg", 400, 300), image("b.jpg", 900, 600), image("c.jpg", 1600, 1200)]
+    order, probed = rank(files, ["a.jpg", "b.jpg", "c.jpg"], probe_limit=2)
+    assert probed == ["a.jpg", "b.jpg"]
+    assert order == ["b.jpg", "a.jpg", "c.jpg"]
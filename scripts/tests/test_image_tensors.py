@@ -0,0 +1,63 @@
+import pytest
+
+import data_pipeline as dp
+
+Image = pytest.importorskip("PIL.Image")
+np = pytest.importorskip("numpy")
+
+
+def smooth_image(size=(900, 600)):
+    # Gradients with no hard edges, so resampling filters differ by little
+    # more than rounding.
+    width, height = size
+    x = np.linspace(0, 255, width, dtype=np.float32)[None, :]
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    pixels = np.stack([x + 0 * y, y + 0 * x, (x + y) / 2], axis=-1).astype(np.uint8)
+    return Image.fromarray(pixels, "RGB")
+
+
+def test_inputs_are_normalised_chw_crops():
+    tensors = dp.ImageTensors(smooth_image(), np)
+
+    clip = tensors.clip_input()
+    vision = tensors.vision_input()
+
+    assert clip.shape == (3, dp.CLIP_IMAGE_SIZE, dp.CLIP_IMAGE_SIZE)
+    assert vision.shape == (3, dp.VISION_CROP, dp.VISION_CROP)
+    assert clip.dtype == vision.dtype == np.float32
+    assert tensors.clip_input() is clip
+    assert min(tensors.pixels.shape[:2]) == dp.VISION_RESIZE
+    tensors.close()
+
+
+def test_vision_input_matches_torchvision_preprocessing():
+    torch = pytest.importorskip("torch")
+    models = pytest.importorskip("torchvision.models")
+    image = smooth_image()
+    reference = models.ResNet50_Weights.IMAGENET1K_V2.transforms()(image)
+
+    tensors = dp.ImageTensors(image, np)
+    ours = torch.from_numpy(tensors.vision_input())
+    tensors.close()
+
+    assert ours.shape == reference.shape
+    assert torch.allclose(ours, reference, atol=1e-5)
+
+
+def test_clip_input_matches_the_hf_processor():
+    pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    image = smooth_image()
+    # CLIPImageProcessor's defaults are the openai/clip-vit-base-patch32 ones.
+    reference = transformers.CLIPImageProcessor()(images=image, return_tensors="np")["pixel_values"][0]
+
+    tensors = dp.ImageTensors(image, np)
+    ours = tensors.clip_input()
+    tensors.close()
+
+    # Ours is resampled from the 232 px bilinear copy rather than from the
+    # decoded image, so it is close to the processor's output but not identical.
+    assert ours.shape == reference.shape
+    difference = np.abs(ours - reference)
+    assert float(difference.mean()) < 0.02
+    assert float(difference.max()) < 0.15
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+import data_pipeline as dp
+
+TABLES = {
+    "negative_alt": dp.NEGATIVE_ALT_KEYWORDS,
+    "negative_url": dp.NEGATIVE_URL_KEYWORDS,
+    "animal_label": dp.ANIMAL_LABEL_KEYWORDS,
+    "positive_alt": dp.POSITIVE_ALT_KEYWORDS,
+    "placeholder_url": dp.PLACEHOLDER_URL_TOKENS,
+    "excluded_phrases": dp.EXCLUDED_PHRASES,
+}
+
+
+def sample_texts(keywords, rng, count=300):
+    keywords = [keyword.lower() for keyword in keywords if keyword]
+    filler = "abcdefghijklmnopqrstuvwxyz -_/.()"
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(0, 4)):
+            if keywords and rng.random() < 0.4:
+                keyword = rng.choice(keywords)
+                # Cut keywords short now and then to get near misses.
+                parts.append(keyword[: rng.randint(1, len(keyword))] if rng.random() < 0.3 else keyword)
+            else:
+                parts.append("".join(rng.choice(filler) for _ in range(rng.randint(0, 12))))
+        yield "".join(parts)
+
+
+@pytest.mark.parametrize("table", sorted(TABLES))
+def test_matches_plain_substring_checks(table):
+    keywords = TABLES[table]
+    lowered = {keyword.lower() for keyword in keywords if keyword}
+    matcher = dp.KeywordMatcher(keywords)
+    rng = random.Random(table)
+    for text in sample_texts(keywords, rng):
+        assert matcher.search(text) == any(keyword in text for keyword in lowered), text
+        assert set(matcher.find_all(text)) == {keyword for keyword in lowered if keyword in text}, text
+
+
+def test_overlapping_and_nested_keywords():
+    keywords = ["cat", "catfish", "fish", "atf", "a.b", "(x)", "c+"]
+    matcher = dp.KeywordMatcher(keywords)
+    rng = random.Random(7)
+    alphabet = "catfishb.()x+"
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 15)))
+        assert matcher.search(text) == any(keyword in text for keyword in keywords), text
+        assert set(matcher.find_all(text)) == {keyword for keyword in keywords if keyword in text}, text
+
+
+def test_empty_inputs():
+    assert not dp.KeywordMatcher([]).search("anything")
+    assert dp.KeywordMatcher([]).find_all("anything") == []
+    assert not dp.KeywordMatcher(["cat"]).search("")
+    assert dp.KeywordMatcher(["cat", ""]).find_all("concatenate") == ["cat"]
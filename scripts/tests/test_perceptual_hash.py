@@ -0,0 +1,91 @@
+import random
+from io import BytesIO
+
+import pytest
+
+import data_pipeline as dp
+
+
+def brute_force(entries, query, radius):
+    return sorted(
+        (dp.hamming_distance(query, value), payload)
+        for value, payload in entries
+        if dp.hamming_distance(query, value) <= radius
+    )
+
+
+def test_hamming_distance():
+    assert dp.hamming_distance(0, 0) == 0
+    assert dp.hamming_distance(0b1011, 0b0010) == 2
+    assert dp.hamming_distance(0, 2**64 - 1) == 64
+
+
+@pytest.mark.parametrize("radius", [0, 1, 3, 6, 12, 32])
+def test_bk_tree_radius_queries_match_brute_force(radius):
+    rng = random.Random(radius)
+    base = [rng.getrandbits(64) for _ in range(50)]
+    # Clusters of near neighbours plus exact duplicates with their own payloads.
+    entries = []
+    for index in range(1500):
+        value = rng.choice(base)
+        for _ in range(rng.randint(0, 8)):
+            value ^= 1 << rng.randrange(64)
+        entries.append((value, f"item{index}"))
+    entries += [(entries[0][0], "duplicate"), (entries[1][0], "duplicate2")]
+    tree = dp.BKTree()
+    for value, payload in entries:
+        tree.add(value, payload)
+
+    assert len(tree) == len(entries)
+    for _ in range(100):
+        query = rng.choice(entries)[0] ^ rng.getrandbits(64) if rng.random() < 0.2 else rng.choice(entries)[0]
+        assert sorted(tree.search(query, radius)) == brute_force(entries, query, radius)
+
+
+def test_empty_tree():
+    assert dp.BKTree().search(123, 64) == []
+
+
+def test_results_are_ordered_by_distance():
+    tree = dp.BKTree()
+    for value in (0b0000, 0b0111, 0b0001, 0b0011):
+        tree.add(value, value)
+
+    assert [distance for distance, _ in tree.search(0, 3)] == [0, 1, 2, 3]
+
+
+def test_registry_flags_near_duplicates_of_other_owners_only():
+    registry = dp.ImageHashRegistry(max_distance=4)
+    registry.add("sha-fox", 0xF0F0, "vulpes_vulpes")
+
+    assert registry.claim_similar("sha-copy", 0xF0F1, "canis_lupus") == "vulpes_vulpes"
+    assert registry.claim_similar("sha-alt", 0xF0F1, "vulpes_vulpes") is None
+    assert registry.claim_similar("sha-far", 0x0F0F, "canis_lupus") is None
+    # In-flight claims count too, until released.
+    assert registry.claim_similar("sha-other", 0x0F0E, "ursus_arctos") == "canis_lupus"
+    registry.release("sha-far")
+    assert registry.claim_similar("sha-other", 0x0F0E, "ursus_arctos") is None
+
+
+def test_resized_copy_stays_within_the_duplicate_distance():
+    Image = pytest.importorskip("PIL.Image")
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(23)
+
+    def photo():
+        noise = (rng.random((30, 40, 3)) * 255).astype("uint8")
+        return Image.fromarray(noise).resize((400, 300), Image.BILINEAR)
+
+    def encode(image, size=None, quality=90):
+        buffer = BytesIO()
+        (image.resize(size) if size else image).save(buffer, "JPEG", quality=quality)
+        return buffer.getvalue()
+
+    original, other = photo(), photo()
+    reference = dp.perceptual_hash(encode(original))
+    copy = dp.perceptual_hash(encode(original, (200, 150), quality=60))
+    unrelated = dp.perceptual_hash(encode(other))
+
+    assert dp.hamming_distance(reference, copy) <= dp.PERCEPTUAL_DUPLICATE_DISTANCE
+    assert dp.hamming_distance(reference, unrelated) > dp.PERCEPTUAL_DUPLICATE_DISTANCE
+    assert dp.perceptual_hash(b"not an image") is None
@@ -0,0 +1,89 @@
+import types
+
+import pytest
+
+import data_pipeline as dp
+
+FOX = "https://www.britannica.com/animal/red-fox"
+WOLF = "https://www.britannica.com/animal/gray-wolf"
+IMAGE = "https://cdn.britannica.com/fox.jpg"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 500.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(dp, "time", types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+    return clock
+
+
+def test_burst_is_served_without_waiting(clock):
+    limiter = dp.HostRateLimiter(rate=2.0, burst=4)
+    for _ in range(4):
+        limiter.acquire(FOX)
+    assert clock.sleeps == []
+
+
+def test_requests_beyond_the_burst_follow_the_refill_rate(clock):
+    limiter = dp.HostRateLimiter(rate=2.0, burst=4)
+    for _ in range(4):
+        limiter.acquire(FOX)
+
+    started = clock.now
+    for _ in range(6):
+        limiter.acquire(WOLF)  # same host, same bucket
+
+    assert clock.now - started == pytest.approx(3.0)
+    assert all(sleep == pytest.approx(0.5) for sleep in clock.sleeps)
+
+
+def test_idle_time_refills_the_bucket_up_to_the_burst(clock):
+    limiter = dp.HostRateLimiter(rate=2.0, burst=4)
+    for _ in range(4):
+        limiter.acquire(FOX)
+    clock.now += 60.0
+
+    for _ in range(4):
+        limiter.acquire(FOX)
+    assert clock.sleeps == []
+    limiter.acquire(FOX)
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_hosts_have_independent_buckets(clock):
+    limiter = dp.HostRateLimiter(rate=1.0, burst=2)
+    for _ in range(2):
+        limiter.acquire(FOX)
+
+    for _ in range(2):
+        limiter.acquire(IMAGE)
+    assert clock.sleeps == []
+
+
+def test_deferral_blocks_only_its_host(clock):
+    limiter = dp.HostRateLimiter(rate=0)
+    limiter.defer(FOX, 5.0)
+
+    limiter.acquire(IMAGE)
+    assert clock.sleeps == []
+    limiter.acquire(WOLF)
+    assert sum(clock.sleeps) == pytest.approx(5.0)
+
+
+def test_zero_rate_disables_limiting(clock):
+    limiter = dp.HostRateLimiter(rate=0, burst=1)
+    for _ in range(50):
+        limiter.acquire(FOX)
+    assert clock.sleeps == []
@@ -0,0 +1,133 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import data_pipeline as dp
+
+ARTICLE_URL = "https://www.britannica.com/animal/red-fox"
+SEARCH_PAGE = (
+    '<ul><li class="m-search-results__item"><a href="/animal/red-fox">Red fox</a></li>'
+    '<li class="m-search-results__item"><a href="/topic/fox-news">Fox News</a></li></ul>'
+)
+ARTICLE = (
+    f'<html><body><article><section class="{dp.ARTICLE_BODY_CLASS}">'
+    "<p>The red fox is a small canid.</p></section></article></body></html>"
+)
+
+
+class SlowTransport:
+    # Holds every request until released, so concurrent callers pile up.
+    def __init__(self, body):
+        self.body = body
+        self.calls = []
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, method, url, **kwargs):
+        with self._lock:
+            self.calls.append(url)
+        assert self.release.wait(5)
+        return dp._build_response(url, 200, {"content-type": "text/html; charset=utf-8"}, self.body.encode())
+
+
+def make_client(transport, **kwargs):
+    client = dp.BritannicaClient(rate_limiter=dp.HostRateLimiter(rate=0), **kwargs)
+    client._send = transport
+    return client
+
+
+def test_concurrent_duplicate_article_fetches_share_one_request():
+    transport = SlowTransport(ARTICLE)
+    client = make_client(transport)
+    variants = [ARTICLE_URL, ARTICLE_URL + "?", "HTTPS://www.britannica.com:443/animal/red-fox"] * 3
+
+    with ThreadPoolExecutor(len(variants)) as executor:
+        futures = [executor.submit(client.fetch_article_page, url) for url in variants]
+        time.sleep(0.2)
+        transport.release.set()
+        pages = [future.result() for future in futures]
+
+    assert len(transport.calls) == 1
+    assert all(page is pages[0] for page in pages)
+
+
+def test_concurrent_duplicate_searches_share_one_request():
+    transport = SlowTransport(SEARCH_PAGE)
+    client = make_client(transport)
+    terms = ["Vulpes vulpes", "vulpes  VULPES", " Vulpes vulpes "] * 2
+
+    with ThreadPoolExecutor(len(terms)) as executor:
+        futures = [executor.submit(client.fetch_article_url, term) for term in terms]
+        time.sleep(0.2)
+        transport.release.set()
+        urls = {future.result() for future in futures}
+
+    assert len(transport.calls) == 1
+    assert urls == {ARTICLE_URL}
+
+
+def test_coalescer_keeps_only_the_most_recent_entries():
+    coalescer = dp.RequestCoalescer(max_entries=2)
+    calls = []
+
+    def compute(key):
+        return coalescer.run(key, lambda: calls.append(key) or key.upper())
+
+    assert [compute("a"), compute("b"), compute("a"), compute("c")] == ["A", "B", "A", "C"]
+    assert calls == ["a", "b", "c"]
+    assert len(coalescer._entries) == 2
+    # "b" was least recently used and got evicted; "a" survived.
+    compute("a")
+    compute("b")
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_coalescer_shares_failures_with_every_waiter():
+    coalescer = dp.RequestCoalescer()
+    attempts = []
+
+    def fail():
+        attempts.append(1)
+        raise RuntimeError("search failed")
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="search failed"):
+            coalescer.run("fox", fail)
+    assert len(attempts) == 1
+
+
+class CountingTransport:
+    def __init__(self, body):
+        self.body = body
+        self.calls = 0
+
+    def __call__(self, method, url, **kwargs):
+        self.calls += 1
+        return dp._build_response(url, 200, {"content-type": "text/html; charset=utf-8"}, self.body.encode())
+
+
+def test_strong_index_entries_skip_the_search():
+    index = dp.ResolutionIndex()
+    index.record("Vulpes vulpes", "https://www.britannica.com/animal/fox", 6)
+    transport = CountingTransport(SEARCH_PAGE)
+    client = make_client(transport, resolutions=index)
+
+    assert client.fetch_article_url("vulpes vulpes") == "https://www.britannica.com/animal/fox"
+    assert transport.calls == 0
+
+
+def test_weak_index_entries_are_searched_again(tmp_path):
+    path = tmp_path / "resolutions.json"
+    index = dp.ResolutionIndex(path)
+    index.record("Red fox", "https://www.britannica.com/science/fox", 0)
+    transport = CountingTransport(SEARCH_PAGE)
+    client = make_client(transport, resolutions=index)
+
+    assert client.fetch_article_url("Red fox") == ARTICLE_URL
+    assert transport.calls == 1
+    assert index.get("red fox") == (ARTICLE_URL, 6)
+
+    index.save()
+    assert dp.ResolutionIndex(path).get("Red fox") == (ARTICLE_URL, 6)
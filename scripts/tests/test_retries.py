@@ -0,0 +1,171 @@
+import time
+import types
+
+import pytest
+import requests
+
+import data_pipeline as dp
+
+URL = "https://www.britannica.com/animal/red-fox"
+HOST = "www.britannica.com"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    fake_time = types.SimpleNamespace(
+        monotonic=clock.monotonic,
+        sleep=clock.sleep,
+        perf_counter=time.perf_counter,
+        time=time.time,
+    )
+    monkeypatch.setattr(dp, "time", fake_time)
+    return clock
+
+
+class FakeTransport:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def __call__(self, method, url, **kwargs):
+        self.requests += 1
+        status, headers = self.responses.pop(0)
+        return dp._build_response(url, status, headers, b"body")
+
+
+def make_client(transport, **kwargs):
+    client = dp.BritannicaClient(rate_limiter=dp.HostRateLimiter(rate=0), **kwargs)
+    client._send = transport
+    return client
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_missing_resources_fail_fast_without_retrying(clock, status):
+    transport = FakeTransport((status, {}))
+    client = make_client(transport)
+
+    with pytest.raises(requests.HTTPError):
+        client._fetch("GET", URL)
+    # Remembered for the rest of the run: no second request either.
+    with pytest.raises(requests.HTTPError, match="cached"):
+        client._fetch("GET", URL + "?")
+
+    assert transport.requests == 1
+    assert clock.sleeps == []
+
+
+def test_retry_after_is_honoured_and_shared_with_the_host(clock):
+    transport = FakeTransport((503, {"Retry-After": "7"}), (200, {}))
+    client = make_client(transport)
+
+    assert client._fetch("GET", URL).status_code == 200
+    assert transport.requests == 2
+    assert clock.sleeps == [7.0]
+    assert client.rate_limiter._blocked_until[HOST] == pytest.approx(1000.0 + 7.0)
+
+
+def test_retry_after_is_capped(clock):
+    transport = FakeTransport((429, {"Retry-After": "86400"}), (200, {}))
+    client = make_client(transport, retry_policy=dp.RetryPolicy(retry_after_limit=30.0))
+
+    client._fetch("GET", URL)
+
+    assert clock.sleeps == [30.0]
+
+
+def test_backoff_stays_within_its_jitter_bounds():
+    policy = dp.RetryPolicy(base_delay=1.0, max_delay=8.0)
+    for attempt in range(1, 8):
+        ceiling = min(8.0, 2.0 ** (attempt - 1))
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(ceiling / 2 <= delay <= ceiling for delay in delays)
+        assert max(delays) - min(delays) > 0
+
+
+def test_transient_errors_are_retried_up_to_max_attempts(clock):
+    transport = FakeTransport((500, {}), (502, {}), (504, {}))
+    client = make_client(transport, retry_policy=dp.RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=8.0))
+
+    with pytest.raises(requests.HTTPError):
+        client._fetch("GET", URL)
+
+    assert transport.requests == 3
+    assert len(clock.sleeps) == 2
+    assert 0.5 <= clock.sleeps[0] <= 1.0
+    assert 1.0 <= clock.sleeps[1] <= 2.0
+
+
+def test_breaker_allows_one_half_open_trial_then_reopens(clock):
+    breaker = dp.CircuitBreaker(threshold=2, cooldown=10.0)
+    breaker.record_failure(HOST)
+    breaker.check(HOST)
+    breaker.record_failure(HOST)
+    with pytest.raises(dp.CircuitOpenError):
+        breaker.check(HOST)
+
+    clock.now += 10.0
+    breaker.check(HOST)  # the single trial
+    with pytest.raises(dp.CircuitOpenError):
+        breaker.check(HOST)
+
+    breaker.record_failure(HOST)
+    clock.now += 9.0
+    with pytest.raises(dp.CircuitOpenError):
+        breaker.check(HOST)
+    clock.now += 1.0
+    breaker.check(HOST)
+    with pytest.raises(dp.CircuitOpenError):
+        breaker.check(HOST)
+
+
+def test_breaker_closes_after_a_successful_trial(clock):
+    breaker = dp.CircuitBreaker(threshold=1, cooldown=10.0)
+    breaker.record_failure(HOST)
+    clock.now += 10.0
+    breaker.check(HOST)
+    breaker.record_success(HOST)
+
+    for _ in range(3):
+        breaker.check(HOST)
+    breaker.check("other.example.com")
+
+
+def test_breaker_trial_that_never_reports_expires(clock):
+    breaker = dp.CircuitBreaker(threshold=1, cooldown=10.0)
+    breaker.record_failure(HOST)
+    clock.now += 10.0
+    breaker.check(HOST)
+
+    clock.now += 5.0
+    with pytest.raises(dp.CircuitOpenError):
+        breaker.check(HOST)
+    clock.now += 5.0
+    breaker.check(HOST)
+
+
+def test_open_breaker_stops_requests_through_the_client(clock):
+    transport = FakeTransport(*[(503, {})] * 3)
+    client = make_client(
+        transport,
+        retry_policy=dp.RetryPolicy(max_attempts=5, base_delay=0.1, max_delay=0.1),
+        circuit_breaker=dp.CircuitBreaker(threshold=3, cooldown=60.0),
+    )
+
+    with pytest.raises(dp.CircuitOpenError):
+        client._fetch("GET", URL)
+
+    assert transport.requests == 3
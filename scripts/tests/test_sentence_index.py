@@ -0,0 +1,98 @@
+import data_pipeline as dp
+
+SIZE_PLAIN = "The body length of this fox varies a lot between regions."
+SIZE_RICH = "Adults reach a length of 90 cm and a weight of about 6 kg in the north."
+LIFE = "In the wild the typical life span of a red fox is only three to four years."
+HABITAT = "The red fox is native to Eurasia and is found in forests, grasslands and cities."
+FUN = "It is the largest of the true foxes and one of the most widespread carnivores."
+PLAIN = "Red foxes hunt rodents at dusk and cache surplus food for the leaner months."
+SHORT = "Length: 1 m."
+
+
+def make_seed(**fields):
+    values = {"size": "", "life_expectancy": "", "habitat": "", "fun_fact": ""}
+    values.update(fields)
+    return dp.AnimalSeed(
+        group="mammals",
+        common_name="Red fox",
+        scientific_name="Vulpes vulpes",
+        image_url="",
+        image_search_terms=[],
+        **values,
+    )
+
+
+def article(*sentences):
+    body = "".join(f"<p>{sentence}</p>" for sentence in sentences)
+    return dp.make_soup(f'<article><section class="{dp.ARTICLE_BODY_CLASS}">{body}</section></article>', "html.parser")
+
+
+def test_best_prefers_more_keywords_then_numbers_then_position():
+    index = dp.SentenceIndex([SIZE_PLAIN, SIZE_RICH, LIFE])
+    assert index.best("size", set()) == SIZE_RICH
+
+    tie_without_number = "Its overall size and length depend strongly on the local food supply."
+    tie_with_number = "Its overall size and length reach 140 cm where food is plentiful."
+    index = dp.SentenceIndex([tie_without_number, tie_with_number])
+    assert index.best("size", set()) == tie_with_number
+
+
+def test_best_skips_used_and_uninformative_sentences():
+    index = dp.SentenceIndex([SHORT, SIZE_RICH, SIZE_PLAIN])
+    used = {SIZE_RICH}
+
+    assert index.best("size", used) == SIZE_PLAIN
+    assert used == {SIZE_RICH, SIZE_PLAIN}
+    assert index.best("size", used) is None
+    assert SHORT not in index.sentences
+
+
+def test_best_finds_each_field_by_its_own_keywords():
+    index = dp.SentenceIndex([PLAIN, HABITAT, LIFE, SIZE_PLAIN])
+    used = set()
+    assert index.best("lifeExpectancy", used) == LIFE
+    assert index.best("habitat", used) == HABITAT
+    assert index.best("size", used) == SIZE_PLAIN
+    assert index.best("funFact", used) is None  # "only" was in LIFE, already used
+    assert index.fallback(used) == PLAIN
+    assert index.fallback(used) is None
+
+
+def test_fill_only_touches_missing_fields():
+    seed = make_seed(size="About 1 m long", fun_fact="Foxes use the Earth's magnetic field to hunt.")
+
+    fields = dp.fill_missing_fields(seed, article(SIZE_RICH, LIFE, HABITAT, FUN))
+
+    assert fields == {
+        "size": "About 1 m long",
+        "lifeExpectancy": LIFE,
+        "habitat": HABITAT,
+        "funFact": "Foxes use the Earth's magnetic field to hunt.",
+    }
+
+
+def test_fill_never_reuses_a_sentence_across_fields():
+    fields = dp.fill_missing_fields(make_seed(), article(LIFE, SIZE_RICH, PLAIN))
+
+    assert fields["lifeExpectancy"] == LIFE
+    assert fields["size"] == SIZE_RICH
+    assert fields["habitat"] == ""
+    assert fields["funFact"] == PLAIN  # fallback: the only sentence left
+
+
+def test_fill_with_nothing_missing_does_not_read_the_article():
+    seed = make_seed(size="s", life_expectancy="l", habitat="h", fun_fact="f")
+    assert dp.fill_missing_fields(seed, None) == {"size": "s", "lifeExpectancy": "l", "habitat": "h", "funFact": "f"}
+
+
+def test_summary_sentences_rank_after_the_article():
+    # Both sentences carry one habitat keyword and no number.
+    article_habitat = "The red fox is found in many regions across the northern continents."
+    summary_habitat = "Red foxes are found across the Northern Hemisphere, from the Arctic to deserts."
+    seed = make_seed(size="s", life_expectancy="l", fun_fact="f")
+
+    fields = dp.fill_missing_fields(seed, article(article_habitat), summary=summary_habitat)
+    assert fields["habitat"] == article_habitat
+
+    fields = dp.fill_missing_fields(seed, article(), summary=summary_habitat)
+    assert fields["habitat"] == summary_habitat
@@ -0,0 +1,164 @@
+import itertools
+import random
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional
+
+import pytest
+
+import data_pipeline as dp
+
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("numpy")
+
+SCIENTIFIC_NAME = "Vulpes vulpes"
+COMMON_NAME = "Red fox"
+ALT_TEXTS = ("", "Red fox hunting in snow", "a vulpes cub", "sunset over the hills", "cartoon logo of a fox")
+SOURCE_URLS = ("https://cdn.example.com/fox.jpg", "https://cdn.example.com/icons/logo-fox.png")
+SIZES = ((640, 480), (200, 480), (640, 120))
+CLIP_SCORES = (None, (0.8, 0.1), (0.4, 0.35), (0.2, 0.7), (0.02, 0.9))
+VISION_LABELS = (None, ["red fox", "kit fox"], ["web site", "comic book"])
+
+
+@dataclass(frozen=True)
+class Case:
+    alt_text: str
+    source_url: str
+    size: Optional[tuple[int, int]]  # None: undecodable bytes
+    variance_ok: bool
+    text_overlay: bool
+    clip: Optional[tuple[float, float]]  # None: CLIP unavailable
+    vision: Optional[list]  # None: ResNet unavailable
+
+
+class ScriptedBackend(dp.InferenceBackend):
+    name = "scripted"
+
+    def __init__(self, case):
+        super().__init__()
+        self.case = case
+
+    def load_clip(self):
+        return self.case.clip is not None
+
+    def clip_probabilities(self, pixel_values):
+        positive, negative = self.case.clip
+        row = [0.0] * len(dp.CLIP_PROMPTS)
+        row[min(dp.CLIP_POSITIVE_INDICES)] = positive
+        row[min(set(range(len(row))) - dp.CLIP_POSITIVE_INDICES)] = negative
+        return [row] * len(pixel_values)
+
+    def load_vision(self):
+        return self.case.vision is not None
+
+    def vision_top_labels(self, pixel_values, k=5):
+        return [(label, 0.5) for label in self.case.vision]
+
+
+class ScriptedValidator(dp.ImageValidator):
+    # Real stages and models plumbing; only the pixel heuristics are scripted.
+    def __init__(self, case, **kwargs):
+        super().__init__(backend=ScriptedBackend(case), **kwargs)
+        self.case = case
+
+    def _basic_variance_check(self, image, *, gray=None):
+        return self.case.variance_ok
+
+    def _detect_text_overlay(self, image, *, gray=None):
+        return self.case.text_overlay
+
+
+_ENCODED: dict = {}
+
+
+def image_bytes(size):
+    if size is None:
+        return b"definitely not an image"
+    if size not in _ENCODED:
+        buffer = BytesIO()
+        Image.new("RGB", size, "olive").save(buffer, "PNG")
+        _ENCODED[size] = buffer.getvalue()
+    return _ENCODED[size]
+
+
+def unstaged_verdict(validator, case):
+    # The single-pass decision ImageValidator.accepts made before it was split
+    # into stages, restated over the scripted signals.
+    alt_lower = case.alt_text.lower()
+    alt_support = validator._alt_text_supports(alt_lower, SCIENTIFIC_NAME, COMMON_NAME)
+    strong_alt = validator._alt_text_matches_names(alt_lower, SCIENTIFIC_NAME, COMMON_NAME)
+    if dp.NEGATIVE_URL_MATCHER.search(case.source_url.lower()) or dp.NEGATIVE_ALT_MATCHER.search(alt_lower):
+        return False
+    if case.size is None:
+        return strong_alt
+    width, height = case.size
+    if width < dp.MIN_IMAGE_WIDTH or height < dp.MIN_IMAGE_HEIGHT or case.text_overlay:
+        return False
+    vision = None if case.vision is None else any(validator._label_is_animal(label) for label in case.vision)
+    passed_clip = None
+    if case.clip is not None:
+        positive, negative = case.clip
+        passed_clip = positive >= dp.CLIP_POSITIVE_THRESHOLD and positive >= negative + dp.CLIP_MARGIN
+        if not passed_clip and positive < dp.CLIP_OVERRIDE_FLOOR and not strong_alt:
+            return False
+    if passed_clip is False:
+        if not (vision or strong_alt):
+            return False
+        passed_clip = None
+    if passed_clip is None and not case.variance_ok:
+        return False
+    if alt_lower and not alt_support:
+        return False
+    return vision is not False
+
+
+ALL_CASES = [
+    Case(*values)
+    for values in itertools.product(
+        ALT_TEXTS, SOURCE_URLS, (*SIZES, None), (True, False), (False, True), CLIP_SCORES, VISION_LABELS
+    )
+]
+
+
+def validate(case, **kwargs):
+    validator = ScriptedValidator(case, **kwargs)
+    accepted = validator.accepts(
+        image_bytes(case.size),
+        alt_text=case.alt_text,
+        scientific_name=SCIENTIFIC_NAME,
+        common_name=COMMON_NAME,
+        source_url=case.source_url,
+    )
+    return validator, accepted
+
+
+def test_cascade_matches_the_unstaged_decision():
+    mismatches = []
+    for case in ALL_CASES:
+        validator, accepted = validate(case)
+        if accepted != unstaged_verdict(validator, case):
+            mismatches.append(case)
+    assert not mismatches, mismatches[:5]
+
+
+def test_stage_order_does_not_change_the_verdict():
+    # Any order that respects the 'after' dependencies reaches the same verdict.
+    rng = random.Random(19)
+    for case in rng.sample(ALL_CASES, 300):
+        stages = [
+            dp.ValidationStage(stage.name, rng.random(), stage.check, stage.needs, stage.after)
+            for stage in dp.DEFAULT_VALIDATION_STAGES
+        ]
+        _, reordered = validate(case, stages=stages)
+        _, default = validate(case)
+        assert reordered == default, case
+
+
+def test_cheap_stages_reject_before_models_run():
+    case = Case("", "https://cdn.example.com/fox.jpg", (200, 480), True, False, (0.8, 0.1), ["red fox"])
+    validator, accepted = validate(case)
+
+    assert not accepted
+    assert validator.stage_stats["resolution"].rejections == 1
+    assert validator.stage_stats["clip"].runs == 0
+    assert validator.stage_stats["vision"].runs == 0
@@ -0,0 +1,133 @@
+from io import BytesIO
+
+import pytest
+
+import data_pipeline as dp
+
+SIGNALS = dp.ImageSignals(width=640, height=480, variance_ok=True, clip=(0.8, 0.1), vision_labels=["red fox"])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = dp.VerdictCache(tmp_path)
+    yield cache
+    cache.close()
+
+
+def age_all(cache, seconds):
+    with cache._lock:
+        cache._db.execute("UPDATE verdicts SET updated_at = updated_at - ?", (seconds,))
+        cache._db.commit()
+
+
+def test_hit_returns_signals_and_verdicts_per_context(cache):
+    cache.store("abc", "fp", SIGNALS, "ctx-1", True, "looks like a fox")
+    cache.store("abc", "fp", SIGNALS, "ctx-2", False, "alt text unsupported")
+
+    cached = cache.get("abc", "fp")
+
+    assert cached.signals == SIGNALS
+    assert cached.verdicts == {"ctx-1": (True, "looks like a fox"), "ctx-2": (False, "alt text unsupported")}
+
+
+def test_miss_for_unknown_content_or_fingerprint(cache):
+    cache.store("abc", "fp", SIGNALS, "ctx", True, "ok")
+
+    assert cache.get("def", "fp") is None
+    assert cache.get("abc", "other-fp") is None
+
+
+def test_prune_drops_only_entries_unused_for_max_age(cache):
+    cache.store("used", "fp", SIGNALS, "ctx", True, "ok")
+    cache.store("unused", "fp", SIGNALS, "ctx", True, "ok")
+    age_all(cache, 100)
+
+    assert cache.get("used", "fp") is not None
+    assert cache.prune(max_age=50) == 1
+    assert cache.get("used", "fp") is not None
+    assert cache.get("unused", "fp") is None
+
+
+def test_validator_version_change_invalidates_verdicts(monkeypatch):
+    before = dp.validator_fingerprint("torch")
+    monkeypatch.setattr(dp, "VALIDATOR_VERSION", dp.VALIDATOR_VERSION + 1)
+
+    assert dp.validator_fingerprint("torch") != before
+
+
+class CountingBackend(dp.InferenceBackend):
+    name = "counting"
+
+    def __init__(self):
+        super().__init__()
+        self.clip_calls = 0
+        self.vision_calls = 0
+
+    def load_clip(self):
+        return True
+
+    def clip_probabilities(self, pixel_values):
+        self.clip_calls += len(pixel_values)
+        row = [0.0] * len(dp.CLIP_PROMPTS)
+        row[min(dp.CLIP_POSITIVE_INDICES)] = 0.9
+        return [row] * len(pixel_values)
+
+    def load_vision(self):
+        return True
+
+    def vision_top_labels(self, pixel_values, k=5):
+        self.vision_calls += 1
+        return [("red fox", 0.9)]
+
+
+class PlainValidator(dp.ImageValidator):
+    # Only the models matter here; the pixel heuristics always pass.
+    def _basic_variance_check(self, image, *, gray=None):
+        return True
+
+    def _detect_text_overlay(self, image, *, gray=None):
+        return False
+
+
+def validate_twice(cache_dir, payload):
+    counts = []
+    for _ in range(2):
+        backend = CountingBackend()
+        cache = dp.VerdictCache(cache_dir)
+        validator = PlainValidator(backend=backend, verdict_cache=cache)
+        accepted = validator.accepts(
+            payload,
+            scientific_name="Vulpes vulpes",
+            common_name="Red fox",
+            content_hash="sha-of-payload",
+        )
+        cache.close()
+        assert accepted
+        counts.append(backend.clip_calls + backend.vision_calls)
+    return counts
+
+
+def fox_png():
+    Image = pytest.importorskip("PIL.Image")
+    pytest.importorskip("numpy")
+    buffer = BytesIO()
+    Image.new("RGB", (640, 480), "sienna").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_validator_reuses_cached_verdicts_across_runs(tmp_path):
+    first, second = validate_twice(tmp_path, fox_png())
+
+    assert first > 0
+    assert second == 0
+
+
+def test_validator_version_bump_reruns_the_models(tmp_path, monkeypatch):
+    payload = fox_png()
+    validate_twice(tmp_path, payload)
+    monkeypatch.setattr(dp, "VALIDATOR_VERSION", dp.VALIDATOR_VERSION + 1)
+
+    first, second = validate_twice(tmp_path, payload)
+
+    assert first > 0
+    assert second == 0